@@ -0,0 +1,98 @@
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from kubernetes.client import (
+    ApiClient, V1Pod, V1PodList, V1ObjectMeta, V1PodSpec, V1Container, V1ContainerPort, V1ResourceRequirements,
+    V1PodStatus, V1PodCondition, V1ContainerStatus, V1ContainerState, V1ContainerStateRunning, V1ListMeta
+)
+
+
+def _pod(i: int) -> V1Pod:
+    now = datetime.now(timezone.utc)
+    return V1Pod(
+        api_version="v1",
+        kind="Pod",
+        metadata=V1ObjectMeta(
+            name=f"stage-{i // 100}-{i:06d}",
+            namespace="default",
+            labels={"app": f"stage-{i // 100}", "pod-template-hash": "7d4b9c6f5"},
+            resource_version=str(100000 + i),
+            uid=f"00000000-0000-0000-0000-{i:012d}",
+            creation_timestamp=now,
+        ),
+        spec=V1PodSpec(
+            node_name=f"node-{i % 50}",
+            containers=[
+                V1Container(
+                    name="model-server",
+                    image="registry.example.com/ml/model-server:1.4.2",
+                    ports=[V1ContainerPort(container_port=8080)],
+                    resources=V1ResourceRequirements(
+                        requests={"cpu": "500m", "memory": "1Gi"}, limits={"cpu": "1", "memory": "2Gi"}
+                    ),
+                )
+            ],
+        ),
+        status=V1PodStatus(
+            phase="Running",
+            pod_ip=f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            conditions=[
+                V1PodCondition(type=t, status="True", last_transition_time=now)
+                for t in ("PodScheduled", "Initialized", "ContainersReady", "Ready")
+            ],
+            container_statuses=[
+                V1ContainerStatus(
+                    name="model-server",
+                    image="registry.example.com/ml/model-server:1.4.2",
+                    image_id="registry.example.com/ml/model-server@sha256:" + "0" * 64,
+                    ready=True,
+                    restart_count=0,
+                    started=True,
+                    state=V1ContainerState(running=V1ContainerStateRunning(started_at=now)),
+                )
+            ],
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON and gzipped JSON pod list transfer and decode cost")
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    api_client = ApiClient()
+    pod_list = V1PodList(
+        api_version="v1", kind="PodList", metadata=V1ListMeta(resource_version="1"),
+        items=[_pod(i) for i in range(args.pods)]
+    )
+    raw = json.dumps(api_client.sanitize_for_serialization(pod_list)).encode()
+    compressed = gzip.compress(raw, compresslevel=1)
+
+    def decode(payload: bytes, compressed_payload: bool):
+        if compressed_payload:
+            payload = gzip.decompress(payload)
+        start = time.perf_counter()
+        api_client.deserialize(SimpleNamespace(data=payload), "V1PodList")
+        return time.perf_counter() - start
+
+    for label, payload, is_compressed in (("json", raw, False), ("json+gzip", compressed, True)):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            model_time = decode(payload, is_compressed)
+            timings.append((time.perf_counter() - start, model_time))
+        total, model = min(timings)
+        per_10k = 10000 / args.pods
+        print(
+            f"{label:10s} bytes/10k pods: {len(payload) * per_10k / 1e6:8.2f} MB  "
+            f"decode/10k pods: {total * per_10k * 1e3:8.1f} ms (model deserialization {model * per_10k * 1e3:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
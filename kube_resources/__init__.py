@@ -1,23 +1,93 @@
 import os
 import json
+import threading
+import weakref
 from kubernetes import client, config
+from kubernetes.client import rest
 from kubernetes.client.api_client import ApiClient
 
 
-class VPAApiClient(ApiClient):
+class KubeApiClient(ApiClient):
+    compression = False
+
+    def call_api(self, resource_path, method, path_params=None, query_params=None, header_params=None, *args, **kwargs):
+        # Watches and other streamed responses are read without content decoding, so only compress buffered calls
+        streamed = not kwargs.get("_preload_content", True) or any(k == "watch" and v for k, v in query_params or [])
+        if self.compression and not streamed:
+            header_params = {**(header_params or {}), "Accept-Encoding": "gzip"}
+        return super().call_api(resource_path, method, path_params, query_params, header_params, *args, **kwargs)
+
+
+class VPAApiClient(KubeApiClient):
     def deserialize(self, response, response_type):
         if response_type == "json":
             return json.loads(response.data)
         return super().deserialize(response, response_type)
     
 
-if os.environ.get("K8S_IN_CLUSTER_CLIENT", "").lower() == "true":
+# K8S_CLIENT_BACKEND=fake serves every call from an in-memory cluster, for hermetic tests and load simulation
+fake_cluster = None
+if os.environ.get("K8S_CLIENT_BACKEND", "").lower() == "fake":
+    from kube_resources.fake import FakeCluster, fake_api
+    fake_cluster = FakeCluster()
+elif os.environ.get("K8S_IN_CLUSTER_CLIENT", "").lower() == "true":
     config.load_incluster_config()
 else:
     config.load_kube_config()
 
-core_api = client.CoreV1Api()
-apps_api = client.AppsV1Api()
-autoscaling_api = client.AutoscalingV1Api()
-vpa_api = client.AutoscalingV1Api(api_client=VPAApiClient())
-custom_api = client.CustomObjectsApi()
+# Every ApiClient created by this package, so their connection pools can be rebuilt after a fork or resized
+_api_clients = weakref.WeakSet()
+_local = threading.local()
+
+
+def track_api(api):
+    _api_clients.add(api.api_client)
+    return api
+
+
+def _reset_api_client(api_client: ApiClient):
+    api_client.rest_client = rest.RESTClientObject(api_client.configuration)
+    # The async_req thread pool does not survive a fork either, it is recreated lazily on first use
+    api_client._pool = None
+
+
+def _reset_api_clients():
+    for api_client in list(_api_clients):
+        _reset_api_client(api_client)
+
+
+def set_connection_pool_maxsize(maxsize: int):
+    for api_client in list(_api_clients):
+        api_client.configuration.connection_pool_maxsize = maxsize
+        _reset_api_client(api_client)
+
+
+def set_compression(enabled=True):
+    KubeApiClient.compression = enabled
+
+
+def new_api(api_class, api_client_class=KubeApiClient):
+    if fake_cluster is not None:
+        return track_api(fake_api(fake_cluster, api_class.__name__))
+    return track_api(api_class(api_client=api_client_class()))
+
+
+def thread_api(api_class, api_client_class=KubeApiClient):
+    apis = _local.__dict__.setdefault("apis", {})
+    key = (api_class, api_client_class)
+    if key not in apis:
+        apis[key] = new_api(api_class, api_client_class)
+    return apis[key]
+
+
+# Child processes inherit the parent's urllib3 sockets, give them fresh pools instead of sharing connections
+os.register_at_fork(after_in_child=_reset_api_clients)
+
+core_api = new_api(client.CoreV1Api)
+apps_api = new_api(client.AppsV1Api)
+autoscaling_api = new_api(client.AutoscalingV1Api)
+autoscaling_v2_api = new_api(client.AutoscalingV2Api)
+batch_api = new_api(client.BatchV1Api)
+vpa_api = new_api(client.AutoscalingV1Api, VPAApiClient)
+custom_api = new_api(client.CustomObjectsApi)
+events_api = new_api(client.EventsV1Api)
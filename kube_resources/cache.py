@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = 1.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, self._generation
+
+    def put(self, key: tuple, value, generation: int):
+        with self._lock:
+            # Skip results fetched before a concurrent write invalidated them
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, kind: str, namespace: str, name: str = None):
+        with self._lock:
+            self._generation += 1
+            if name is not None:
+                self._entries.pop((kind, namespace, name), None)
+                return
+            for key in [k for k in self._entries if k[0] == kind and k[1] == namespace]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "ttl": self.ttl,
+                "maxsize": self.maxsize,
+            }
+
+
+_cache = None  # type: ResponseCache
+
+
+def enable_cache(ttl: float = 1.0, maxsize: int = 1024) -> ResponseCache:
+    global _cache
+    _cache = ResponseCache(ttl=ttl, maxsize=maxsize)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def cache_stats():
+    return _cache.stats() if _cache is not None else None
+
+
+def cached(kind: str, namespace: str, name: str, fetch: Callable):
+    cache = _cache
+    if cache is None:
+        return fetch()
+    key = (kind, namespace, name)
+    hit, value = cache.get(key)
+    if hit:
+        return value
+    result = fetch()
+    cache.put(key, result, value)
+    return result
+
+
+def invalidate(kind: str, namespace: str, name: str = None):
+    if _cache is not None:
+        _cache.invalidate(kind, namespace, name)
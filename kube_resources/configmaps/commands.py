@@ -4,6 +4,7 @@ from kubernetes.client.models import V1ConfigMap
 
 from kube_resources import core_api as api
 from kube_resources.utils import construct_configmap
+from kube_resources.cache import cached, invalidate
 
 
 def _get_configmap_info(cm: V1ConfigMap) -> dict:
@@ -16,26 +17,34 @@ def _get_configmap_info(cm: V1ConfigMap) -> dict:
 
 
 def get_configmap(configmap_name, namespace="default") -> dict:
-    response = api.read_namespaced_config_map(configmap_name, namespace)
-    return _get_configmap_info(response)
+    return cached(
+        "ConfigMap",
+        namespace,
+        configmap_name,
+        lambda: _get_configmap_info(api.read_namespaced_config_map(configmap_name, namespace))
+    )
 
 
 def create_configmap(configmap_name: str, data: dict, namespace="default") -> dict:
     cm = construct_configmap(name=configmap_name, namespace=namespace, data=data)
     response = api.create_namespaced_config_map(namespace, cm)
+    invalidate("ConfigMap", namespace, configmap_name)
     return _get_configmap_info(response)
 
 
 def update_configmap(configmap_name: str, data: dict, namespace="default", partial=True) -> dict:
-    old_cm = get_configmap(configmap_name, namespace)
+    # Merge against the live object, never a cached copy
+    old_cm = _get_configmap_info(api.read_namespaced_config_map(configmap_name, namespace))
     if partial:
         data = {**old_cm["data"], **data}
 
     cm = construct_configmap(name=configmap_name, namespace=namespace, data=data)
     response = api.replace_namespaced_config_map(namespace=namespace, name=configmap_name, body=cm)
+    invalidate("ConfigMap", namespace, configmap_name)
     return _get_configmap_info(response)
 
 
 def delete_configmap(configmap_name: str, namespace="default"):
     response = api.delete_namespaced_config_map(name=configmap_name, namespace=namespace)
+    invalidate("ConfigMap", namespace, configmap_name)
     return {"status": response.status}
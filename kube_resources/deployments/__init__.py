@@ -3,5 +3,14 @@ from .commands import (
     get_deployments,
     get_deployment,
     update_deployment,
-    delete_deployment
+    delete_deployment,
+    delete_deployments,
+    scale_deployment,
+    scale_stateful_set,
+    scale_deployments,
+    rollback_deployment,
+    watch_rollout,
+    wait_for_rollout,
+    DeploymentView,
+    profile_rollout
 )
@@ -1,26 +1,54 @@
+import math
 import time
-from typing import List
-from kubernetes.client.models import V1Deployment
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Dict
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+from kubernetes.client.models import V1Deployment, V1Scale, V1Pod
 
-from kube_resources.utils import construct_deployment, ContainerInfo
-from kube_resources import apps_api as api
+from kube_resources.utils import construct_deployment, ContainerInfo, _delete_collection
+from kube_resources import apps_api as api, core_api
+from kube_resources.views import ResourceView
+from kube_resources.cache import cached, invalidate
+from kube_resources.pods.startup import profile_pods
 
 
-def _get_deployment_info(deployment: V1Deployment):
-    return {
-        "kind": "Deployment",
-        "namespace": deployment.metadata.namespace,
-        "name": deployment.metadata.name,
-        "replicas": deployment.spec.replicas,
-        "selector": {
-            "match_labels": deployment.spec.selector.match_labels,
-            "match_expressions": deployment.spec.selector.match_expressions
-        },
-        "rolling_update_strategy": {
-            "max_surge": deployment.spec.strategy.rolling_update.max_surge,
-            "max_unavailable": deployment.spec.strategy.rolling_update.max_unavailable,
-        },
-        "containers": list(map(
+class DeploymentView(ResourceView):
+    __slots__ = ()
+    _fields = ("kind", "namespace", "name", "replicas", "selector", "rolling_update_strategy", "containers", "status")
+    kind = "Deployment"
+
+    @property
+    def namespace(self):
+        return self._obj.metadata.namespace
+
+    @property
+    def name(self):
+        return self._obj.metadata.name
+
+    @property
+    def replicas(self):
+        return self._obj.spec.replicas
+
+    @property
+    def selector(self):
+        return {
+            "match_labels": self._obj.spec.selector.match_labels,
+            "match_expressions": self._obj.spec.selector.match_expressions
+        }
+
+    @property
+    def rolling_update_strategy(self):
+        strategy = self._obj.spec.strategy
+        return {
+            "max_surge": strategy.rolling_update.max_surge,
+            "max_unavailable": strategy.rolling_update.max_unavailable,
+        } if strategy and strategy.rolling_update else None
+
+    @property
+    def containers(self):
+        return list(map(
             lambda c: {
                 "name": c.name,
                 "image": c.image,
@@ -30,13 +58,132 @@ def _get_deployment_info(deployment: V1Deployment):
                     "requests": c.resources.requests
                 }
             },
-            deployment.spec.template.spec.containers
-        )),
+            self._obj.spec.template.spec.containers
+        ))
+
+    @property
+    def status(self):
+        status = self._obj.status
+        return {
+            "available_replicas": status.available_replicas,
+            "replicas": status.replicas,
+            "ready_replicas": status.ready_replicas,
+            "updated_replicas": status.updated_replicas,
+        }
+
+
+def _get_deployment_info(deployment: V1Deployment):
+    return DeploymentView(deployment).to_dict()
+
+
+REVISION_ANNOTATION = "deployment.kubernetes.io/revision"
+STALLED_REASONS = {
+    "CrashLoopBackOff", "ImagePullBackOff", "ErrImagePull", "InvalidImageName", "CreateContainerConfigError",
+    "CreateContainerError", "RunContainerError",
+}
+
+
+def _revision(obj) -> int:
+    return int((obj.metadata.annotations or {}).get(REVISION_ANNOTATION, 0))
+
+
+def _selector(deployment: V1Deployment) -> str:
+    return ",".join(f"{k}={v}" for k, v in (deployment.spec.selector.match_labels or {}).items())
+
+
+def _get_owned_replica_sets(deployment: V1Deployment):
+    response = api.list_namespaced_replica_set(deployment.metadata.namespace, label_selector=_selector(deployment))
+    return [
+        rs for rs in response.items
+        if any(o.uid == deployment.metadata.uid for o in rs.metadata.owner_references or [])
+    ]
+
+
+def _get_new_pod_template_hash(deployment: V1Deployment):
+    # Until the controller has observed the latest spec its revision annotation still points at the old ReplicaSet
+    if (deployment.status.observed_generation or 0) < deployment.metadata.generation:
+        return None
+    for rs in _get_owned_replica_sets(deployment):
+        if _revision(rs) == _revision(deployment):
+            return (rs.metadata.labels or {}).get("pod-template-hash")
+    return None
+
+
+def _get_stall_reason(pod: V1Pod, stall_timeout: float):
+    statuses = (pod.status.init_container_statuses or []) + (pod.status.container_statuses or [])
+    for c in statuses:
+        if c.state and c.state.waiting and c.state.waiting.reason in STALLED_REASONS:
+            return c.state.waiting.reason, c.state.waiting.message
+        if not c.ready and c.last_state and c.last_state.terminated and c.last_state.terminated.reason == "OOMKilled":
+            return "OOMKilled", c.last_state.terminated.message
+    now = datetime.now(timezone.utc)
+    for condition in pod.status.conditions or []:
+        if condition.type == "PodScheduled" and condition.status == "False" and condition.last_transition_time and \
+                (now - condition.last_transition_time).total_seconds() > stall_timeout:
+            return condition.reason or "Unschedulable", condition.message
+        if condition.type == "Ready" and condition.status == "True":
+            return None
+    if pod.metadata.creation_timestamp and (now - pod.metadata.creation_timestamp).total_seconds() > stall_timeout:
+        return "NotReady", f"pod is not ready after {stall_timeout}s"
+    return None
+
+
+def _get_rollout_progress(deployment: V1Deployment, pod_template_hash: str, pods: Dict[str, V1Pod], stall_timeout: float):
+    status = deployment.status
+    desired = deployment.spec.replicas
+    pod_hash = lambda p: (p.metadata.labels or {}).get("pod-template-hash")
+    live = [p for p in pods.values() if p.metadata.deletion_timestamp is None]
+    new_pods = [p for p in live if pod_template_hash and pod_hash(p) == pod_template_hash]
+    stalled = []
+    for pod in new_pods:
+        reason = _get_stall_reason(pod, stall_timeout)
+        if reason:
+            stalled.append({"pod": pod.metadata.name, "reason": reason[0], "message": reason[1]})
+    progressing = next((c for c in status.conditions or [] if c.type == "Progressing"), None)
+    observed = (status.observed_generation or 0) >= deployment.metadata.generation
+    complete = observed and all(
+        (count or 0) == desired for count in (status.updated_replicas, status.replicas, status.available_replicas)
+    )
+    if progressing is not None and progressing.reason == "ProgressDeadlineExceeded":
+        phase, reason, message = "failed", progressing.reason, progressing.message
+    elif complete:
+        phase, reason, message = "complete", None, None
+    elif stalled:
+        phase, reason, message = "stalled", stalled[0]["reason"], stalled[0]["message"]
+    else:
+        phase, reason, message = "progressing", None, None
+    return {
+        "kind": "Rollout",
+        "namespace": deployment.metadata.namespace,
+        "name": deployment.metadata.name,
+        "revision": _revision(deployment),
+        "pod_template_hash": pod_template_hash,
+        "phase": phase,
+        "reason": reason,
+        "message": message,
+        "desired": desired,
+        "updated": status.updated_replicas or 0,
+        "ready": status.ready_replicas or 0,
+        "available": status.available_replicas or 0,
+        "new_pods": len(new_pods),
+        "new_pods_ready": sum(
+            1 for p in new_pods
+            if any(c.type == "Ready" and c.status == "True" for c in p.status.conditions or [])
+        ),
+        "old_pods": sum(1 for p in live if pod_template_hash and pod_hash(p) != pod_template_hash),
+        "stalled_pods": stalled,
+    }
+
+
+def _get_scale_info(scale: V1Scale):
+    return {
+        "kind": "Scale",
+        "namespace": scale.metadata.namespace,
+        "name": scale.metadata.name,
+        "replicas": scale.spec.replicas,
         "status": {
-            "available_replicas": deployment.status.available_replicas,
-            "replicas": deployment.status.replicas,
-            "ready_replicas": deployment.status.ready_replicas,
-            "updated_replicas": deployment.status.updated_replicas,
+            "replicas": scale.status.replicas,
+            "selector": scale.status.selector,
         }
     }
 
@@ -66,25 +213,30 @@ def create_deployment(
         runtime_class_name=runtime_class_name,
     )
     response = api.create_namespaced_deployment(namespace=namespace, body=deployment)
+    invalidate("Deployment", namespace, response.metadata.name)
     return get_deployment(response.metadata.name, namespace)
 
 
-def get_deployments(namespace="default"):
+def get_deployments(namespace="default", lazy=False):
     if namespace == "all":
         response = api.list_deployment_for_all_namespaces(watch=False)
     else:
         response = api.list_namespaced_deployment(namespace, watch=False)
     return list(
         map(
-            lambda d: _get_deployment_info(d),
+            DeploymentView if lazy else _get_deployment_info,
             response.items
         )
     )
 
 
 def get_deployment(name, namespace="default"):
-    response = api.read_namespaced_deployment(name=name, namespace=namespace)
-    return _get_deployment_info(response)
+    return cached(
+        "Deployment",
+        namespace,
+        name,
+        lambda: _get_deployment_info(api.read_namespaced_deployment(name=name, namespace=namespace))
+    )
 
 
 def update_deployment(
@@ -111,9 +263,158 @@ def update_deployment(
         response = api.patch_namespaced_deployment(name=name, namespace=namespace, body=deployment)
     else:
         response = api.replace_namespaced_deployment(name=name, namespace=namespace, body=deployment)
+    invalidate("Deployment", namespace, name)
     return get_deployment(response.metadata.name, namespace)
 
 
 def delete_deployment(deployment_name, namespace="default"):
     response = api.delete_namespaced_deployment(name=deployment_name, namespace=namespace)
+    invalidate("Deployment", namespace, deployment_name)
     return {"status": response.status}
+
+
+def delete_deployments(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    result = _delete_collection(
+        api.delete_collection_namespaced_deployment,
+        api.list_namespaced_deployment,
+        namespace,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+    # Only after the delete, a concurrent read would otherwise cache the objects again
+    invalidate("Deployment", namespace)
+    return result
+
+
+def scale_deployment(name: str, replicas: int, namespace="default"):
+    response = api.patch_namespaced_deployment_scale(
+        name=name, namespace=namespace, body={"spec": {"replicas": replicas}}
+    )
+    invalidate("Deployment", namespace, name)
+    return _get_scale_info(response)
+
+
+def scale_stateful_set(name: str, replicas: int, namespace="default"):
+    response = api.patch_namespaced_stateful_set_scale(
+        name=name, namespace=namespace, body={"spec": {"replicas": replicas}}
+    )
+    return _get_scale_info(response)
+
+
+def scale_deployments(replicas: Dict[str, int], namespace="default", kind="Deployment", max_workers: int = None):
+    scale = {"Deployment": scale_deployment, "StatefulSet": scale_stateful_set}[kind]
+    if not replicas:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, len(replicas))) as executor:
+        futures = {name: executor.submit(scale, name, count, namespace) for name, count in replicas.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def rollback_deployment(name: str, namespace="default", revision: int = None):
+    deployment = api.read_namespaced_deployment(name=name, namespace=namespace)
+    current = _revision(deployment)
+    candidates = sorted(_get_owned_replica_sets(deployment), key=_revision, reverse=True)
+    if revision is None:
+        target = next((rs for rs in candidates if _revision(rs) < current), None)
+    else:
+        target = next((rs for rs in candidates if _revision(rs) == revision), None)
+    if target is None:
+        raise ValueError(f"Deployment {namespace}/{name} has no revision {revision or 'before ' + str(current)}")
+    template = api.api_client.sanitize_for_serialization(target.spec.template)
+    template.get("metadata", {}).get("labels", {}).pop("pod-template-hash", None)
+    api.patch_namespaced_deployment(
+        name=name, namespace=namespace, body=[{"op": "replace", "path": "/spec/template", "value": template}]
+    )
+    invalidate("Deployment", namespace, name)
+    return {"kind": "Deployment", "namespace": namespace, "name": name, "revision": _revision(target)}
+
+
+def watch_rollout(
+        name: str,
+        namespace="default",
+        timeout: float = 600,
+        stall_timeout: float = 120,
+        rollback=False,
+        poll_seconds: int = 5,
+):
+    deadline = time.monotonic() + timeout
+    deployment = api.read_namespaced_deployment(name=name, namespace=namespace)
+    selector = _selector(deployment)
+    response = core_api.list_namespaced_pod(namespace, label_selector=selector)
+    pods = {p.metadata.name: p for p in response.items}
+    resource_version = response.metadata.resource_version
+    pod_template_hash = None
+    last = None
+    w = watch.Watch()
+    while True:
+        if pod_template_hash is None:
+            pod_template_hash = _get_new_pod_template_hash(deployment)
+        progress = _get_rollout_progress(deployment, pod_template_hash, pods, stall_timeout)
+        if progress["phase"] == "progressing" and time.monotonic() >= deadline:
+            progress.update(phase="timeout", reason="Timeout", message=f"rollout did not finish within {timeout}s")
+        if progress["phase"] in ("failed", "stalled", "timeout") and rollback:
+            progress["rolled_back_to"] = rollback_deployment(name, namespace)["revision"]
+        if progress != last:
+            yield progress
+            last = progress
+        if progress["phase"] != "progressing":
+            return
+        try:
+            # Re-evaluate after every pod event, or at least every poll_seconds to pick up deployment conditions
+            for event in w.stream(
+                    core_api.list_namespaced_pod,
+                    namespace,
+                    label_selector=selector,
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, min(poll_seconds, math.ceil(deadline - time.monotonic()))),
+            ):
+                pod = event["object"]
+                resource_version = pod.metadata.resource_version
+                if event["type"] == "DELETED":
+                    pods.pop(pod.metadata.name, None)
+                else:
+                    pods[pod.metadata.name] = pod
+                w.stop()
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            response = core_api.list_namespaced_pod(namespace, label_selector=selector)
+            pods = {p.metadata.name: p for p in response.items}
+            resource_version = response.metadata.resource_version
+        deployment = api.read_namespaced_deployment(name=name, namespace=namespace)
+
+
+def wait_for_rollout(
+        name: str,
+        namespace="default",
+        timeout: float = 600,
+        stall_timeout: float = 120,
+        rollback=False,
+        poll_seconds: int = 5,
+):
+    progress = None
+    for progress in watch_rollout(name, namespace, timeout, stall_timeout, rollback, poll_seconds):
+        pass
+    return progress
+
+
+def profile_rollout(name: str, namespace="default", wait=True, timeout: float = 600, events=True):
+    progress = wait_for_rollout(name, namespace, timeout) if wait else None
+    deployment = api.read_namespaced_deployment(name=name, namespace=namespace)
+    pod_template_hash = _get_new_pod_template_hash(deployment)
+    if pod_template_hash is None:
+        raise ValueError(f"Deployment {namespace}/{name} has no ReplicaSet for its current revision yet")
+    profile = profile_pods(
+        namespace, label_selector=f"{_selector(deployment)},pod-template-hash={pod_template_hash}", events=events
+    )
+    return {"revision": _revision(deployment), "rollout": progress, **profile}
@@ -0,0 +1 @@
+from .commands import get_events, EventStream
@@ -0,0 +1,233 @@
+import threading
+from collections import deque, OrderedDict
+from typing import List, Tuple
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+from kubernetes.client.models import CoreV1Event, EventsV1Event
+
+from kube_resources import core_api, events_api
+
+
+def _get_event_info(e):
+    if isinstance(e, EventsV1Event):
+        obj = e.regarding
+        first_seen = e.event_time or e.deprecated_first_timestamp or e.metadata.creation_timestamp
+        if e.series:
+            count, last_seen = e.series.count, e.series.last_observed_time
+        else:
+            count, last_seen = e.deprecated_count or 1, e.deprecated_last_timestamp or first_seen
+        message, source = e.note, e.reporting_controller
+    else:  # type: CoreV1Event
+        obj = e.involved_object
+        first_seen = e.first_timestamp or e.event_time or e.metadata.creation_timestamp
+        count, last_seen = e.count or 1, e.last_timestamp or first_seen
+        message, source = e.message, e.source.component if e.source else None
+    return {
+        "kind": "Event",
+        "namespace": e.metadata.namespace,
+        "name": e.metadata.name,
+        "uid": e.metadata.uid,
+        "type": e.type,
+        "reason": e.reason,
+        "message": message,
+        "count": count,
+        "first_seen": first_seen,
+        "last_seen": last_seen,
+        "source": source,
+        "object": {
+            "kind": obj.kind,
+            "namespace": obj.namespace,
+            "name": obj.name,
+            "uid": obj.uid,
+        } if obj else None,
+    }
+
+
+def _event_list_func(namespace: str, api_group: str):
+    if api_group == "events.k8s.io":
+        if namespace == "all":
+            return events_api.list_event_for_all_namespaces, ()
+        return events_api.list_namespaced_event, (namespace,)
+    if namespace == "all":
+        return core_api.list_event_for_all_namespaces, ()
+    return core_api.list_namespaced_event, (namespace,)
+
+
+def _object_field_selector(kind: str = None, name: str = None, api_group="core"):
+    prefix = "regarding" if api_group == "events.k8s.io" else "involvedObject"
+    selectors = []
+    if kind:
+        selectors.append(f"{prefix}.kind={kind}")
+    if name:
+        selectors.append(f"{prefix}.name={name}")
+    return ",".join(selectors) or None
+
+
+def get_events(
+        namespace="default",
+        involved_object_kind: str = None,
+        involved_object_name: str = None,
+        api_group="core",
+):
+    list_func, args = _event_list_func(namespace, api_group)
+    response = list_func(
+        *args,
+        field_selector=_object_field_selector(involved_object_kind, involved_object_name, api_group),
+        watch=False
+    )
+    return sorted(map(_get_event_info, response.items), key=lambda e: e["last_seen"] or e["first_seen"])
+
+
+class EventStream:
+    def __init__(
+            self,
+            namespace="default",
+            objects: List[Tuple[str, str]] = None,  # (kind, name) pairs to keep, everything when None
+            api_group="core",
+            max_events=10000,
+            poll_seconds=5,  # server side watch timeout, bounds how long stop() waits on a quiet namespace
+    ):
+        self.namespace = namespace
+        self.api_group = api_group
+        self._objects = set(objects) if objects else None
+        self._events = deque(maxlen=max_events)
+        self._aggregates = OrderedDict()
+        self._counts = OrderedDict()
+        self._max_events = max_events
+        self._poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._watch = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=f"event-stream-{self.namespace}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._raise_error()
+
+    def _raise_error(self):
+        # The watch runs in a daemon thread, hand its failure to the consumer instead of losing it
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        try:
+            self._stream()
+        except Exception as e:
+            self._error = e
+
+    def _stream(self):
+        list_func, args = _event_list_func(self.namespace, self.api_group)
+        field_selector = None
+        if self._objects and len(self._objects) == 1:
+            field_selector = _object_field_selector(*next(iter(self._objects)), api_group=self.api_group)
+        resource_version = None
+        while not self._stopped.is_set():
+            if resource_version is None:
+                response = list_func(*args, field_selector=field_selector, watch=False)
+                for e in response.items:
+                    self._record(_get_event_info(e))
+                resource_version = response.metadata.resource_version
+            self._watch = watch.Watch()
+            try:
+                for event in self._watch.stream(
+                        list_func, *args, field_selector=field_selector, resource_version=resource_version,
+                        timeout_seconds=self._poll_seconds
+                ):
+                    resource_version = event["object"].metadata.resource_version
+                    if event["type"] in ("ADDED", "MODIFIED"):
+                        self._record(_get_event_info(event["object"]))
+                    if self._stopped.is_set():
+                        break
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                resource_version = None
+
+    def _record(self, info: dict):
+        obj = info["object"] or {}
+        if self._objects is not None and (obj.get("kind"), obj.get("name")) not in self._objects:
+            return
+        with self._lock:
+            # Events are updated in place with a growing count, only account for the difference
+            delta = info["count"] - self._counts.pop(info["uid"], 0)
+            self._counts[info["uid"]] = info["count"]
+            if len(self._counts) > self._max_events:
+                self._counts.popitem(last=False)
+            if delta <= 0:
+                return
+            self._events.append(info)
+            key = (info["reason"], obj.get("kind"), obj.get("namespace"), obj.get("name"))
+            aggregate = self._aggregates.pop(key, None)
+            if aggregate is None:
+                aggregate = {
+                    "reason": info["reason"],
+                    "type": info["type"],
+                    "object": obj,
+                    "count": 0,
+                    "first_seen": info["first_seen"],
+                    "last_seen": info["last_seen"],
+                    "message": info["message"],
+                }
+            aggregate["count"] += delta
+            if info["first_seen"] and (aggregate["first_seen"] is None or info["first_seen"] < aggregate["first_seen"]):
+                aggregate["first_seen"] = info["first_seen"]
+            if info["last_seen"] and (aggregate["last_seen"] is None or info["last_seen"] >= aggregate["last_seen"]):
+                aggregate["last_seen"] = info["last_seen"]
+                aggregate["message"] = info["message"]
+            self._aggregates[key] = aggregate
+            if len(self._aggregates) > self._max_events:
+                self._aggregates.popitem(last=False)
+
+    @staticmethod
+    def _matches(item: dict, reason, kind, name, event_type, since) -> bool:
+        obj = item["object"] or {}
+        return (
+            (reason is None or item["reason"] == reason)
+            and (kind is None or obj.get("kind") == kind)
+            and (name is None or obj.get("name") == name)
+            and (event_type is None or item["type"] == event_type)
+            and (since is None or (item["last_seen"] is not None and item["last_seen"] >= since))
+        )
+
+    def events(self, reason: str = None, kind: str = None, name: str = None, event_type: str = None, since=None):
+        self._raise_error()
+        with self._lock:
+            return [e for e in self._events if self._matches(e, reason, kind, name, event_type, since)]
+
+    def aggregates(self, reason: str = None, kind: str = None, name: str = None, event_type: str = None, since=None):
+        self._raise_error()
+        with self._lock:
+            items = [dict(a) for a in self._aggregates.values() if self._matches(a, reason, kind, name, event_type, since)]
+        return sorted(items, key=lambda a: a["count"], reverse=True)
+
+    def reasons(self, kind: str, name: str) -> dict:
+        counts = {}
+        for a in self.aggregates(kind=kind, name=name):
+            counts[a["reason"]] = counts.get(a["reason"], 0) + a["count"]
+        return counts
+
+    def warnings(self, since=None):
+        return self.aggregates(event_type="Warning", since=since)
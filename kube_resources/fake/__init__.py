@@ -0,0 +1,2 @@
+from .cluster import FakeCluster
+from .apis import FakeApi, FakeApiClient, FakeCustomObjectsApi, FakeKServeClient, fake_api
@@ -0,0 +1,337 @@
+import copy
+import json
+import re
+from types import SimpleNamespace
+from typing import NamedTuple
+
+from kubernetes.client.api_client import ApiClient
+
+from .cluster import (
+    FakeCluster, _api_error, POD, SERVICE, ENDPOINTS, EVENT, NODE, DEPLOYMENT, REPLICA_SET, STATEFUL_SET, DAEMON_SET, JOB
+)
+
+
+class _Resource(NamedTuple):
+    store: str
+    kind: str
+    model: str
+    namespaced: bool = True
+
+
+_RESOURCES = {
+    "CoreV1Api": {
+        "pod": _Resource(POD, "Pod", "V1Pod"),
+        "service": _Resource(SERVICE, "Service", "V1Service"),
+        "endpoints": _Resource(ENDPOINTS, "Endpoints", "V1Endpoints"),
+        "config_map": _Resource("v1/configmaps", "ConfigMap", "V1ConfigMap"),
+        "secret": _Resource("v1/secrets", "Secret", "V1Secret"),
+        "event": _Resource(EVENT, "Event", "CoreV1Event"),
+        "persistent_volume_claim": _Resource("v1/persistentvolumeclaims", "PersistentVolumeClaim", "V1PersistentVolumeClaim"),
+        "node": _Resource(NODE, "Node", "V1Node", namespaced=False),
+    },
+    "AppsV1Api": {
+        "deployment": _Resource(DEPLOYMENT, "Deployment", "V1Deployment"),
+        "replica_set": _Resource(REPLICA_SET, "ReplicaSet", "V1ReplicaSet"),
+        "stateful_set": _Resource(STATEFUL_SET, "StatefulSet", "V1StatefulSet"),
+        "daemon_set": _Resource(DAEMON_SET, "DaemonSet", "V1DaemonSet"),
+    },
+    "AutoscalingV1Api": {
+        "horizontal_pod_autoscaler": _Resource(
+            "autoscaling/v1/horizontalpodautoscalers", "HorizontalPodAutoscaler", "V1HorizontalPodAutoscaler"
+        ),
+    },
+    "AutoscalingV2Api": {
+        "horizontal_pod_autoscaler": _Resource(
+            "autoscaling/v2/horizontalpodautoscalers", "HorizontalPodAutoscaler", "V2HorizontalPodAutoscaler"
+        ),
+    },
+    "BatchV1Api": {
+        "job": _Resource(JOB, "Job", "V1Job"),
+    },
+    "EventsV1Api": {
+        "event": _Resource("events.k8s.io/v1/events", "Event", "EventsV1Event"),
+    },
+}
+
+_METHOD = re.compile(
+    r"^(create|read|list|patch|replace|delete_collection|delete)_(namespaced_)?(\w+?)"
+    r"(_for_all_namespaces|_scale|_status|_resize)?$"
+)
+_ARGUMENTS = {
+    "create": ["namespace", "body"],
+    "read": ["name", "namespace"],
+    "list": ["namespace"],
+    "patch": ["name", "namespace", "body"],
+    "replace": ["name", "namespace", "body"],
+    "delete": ["name", "namespace"],
+    "delete_collection": ["namespace"],
+}
+_CUSTOM_PATH = re.compile(
+    r"^/apis/(?P<group>[^/]+)/(?P<version>[^/]+)/(?:namespaces/(?P<namespace>[^/]+)/)?(?P<plural>[^/]+)(?:/(?P<name>[^/]+))?$"
+)
+
+
+def _status(name: str = None, kind: str = None) -> dict:
+    return {"apiVersion": "v1", "kind": "Status", "status": "Success", "details": {"name": name, "kind": kind}}
+
+
+def _propagation_policy(params: dict):
+    body = params.get("body")
+    if isinstance(body, dict):
+        return body.get("propagationPolicy") or params.get("propagation_policy")
+    return getattr(body, "propagation_policy", None) or params.get("propagation_policy")
+
+
+class FakeApiClient(ApiClient):
+    def __init__(self, cluster: FakeCluster):
+        super().__init__()
+        self.cluster = cluster
+        self._custom = FakeCustomObjectsApi(cluster, api_client=self)
+
+    def to_model(self, data, model: str):
+        return self.deserialize(SimpleNamespace(data=json.dumps(data)), model)
+
+    def call_api(
+            self, resource_path, method, path_params=None, query_params=None, header_params=None, body=None,
+            response_type=None, _return_http_data_only=None, **kwargs
+    ):
+        # Hand-built custom object requests, e.g. the VerticalPodAutoscaler commands
+        path = resource_path.format(**(path_params or {}))
+        match = _CUSTOM_PATH.match(path)
+        if not match:
+            raise _api_error(404, "NotFound", f"the fake cluster does not serve {path}")
+        route = match.groupdict()
+        query = dict(query_params or [])
+        selectors = dict(label_selector=query.get("labelSelector"), field_selector=query.get("fieldSelector"))
+        args = (route["group"], route["version"], route["namespace"], route["plural"])
+        custom = self._custom
+        if method == "GET" and route["name"]:
+            data = custom.get_namespaced_custom_object(*args, route["name"])
+        elif method == "GET":
+            data = custom.list_namespaced_custom_object(*args, **selectors)
+        elif method == "POST":
+            data = custom.create_namespaced_custom_object(*args, body)
+        elif method == "PATCH":
+            data = custom.patch_namespaced_custom_object(*args, route["name"], body)
+        elif method == "PUT":
+            data = custom.replace_namespaced_custom_object(*args, route["name"], body)
+        elif method == "DELETE" and route["name"]:
+            data = custom.delete_namespaced_custom_object(*args, route["name"], body=body)
+        elif method == "DELETE":
+            data = custom.delete_collection_namespaced_custom_object(*args, body=body, **selectors)
+        else:
+            raise _api_error(405, "MethodNotAllowed", f"{method} {path}")
+        return data if _return_http_data_only else (data, 200, {})
+
+
+class FakeApi:
+    def __init__(self, cluster: FakeCluster, resources: dict, api_client: FakeApiClient = None):
+        self._cluster = cluster
+        self._resources = resources
+        self.api_client = api_client or FakeApiClient(cluster)
+
+    def __getattr__(self, attr):
+        match = _METHOD.match(attr)
+        if not match or match.group(3) not in self.__dict__.get("_resources", {}):
+            raise AttributeError(attr)
+        verb, namespaced, snake, suffix = match.groups()
+        resource = self._resources[snake]
+        all_namespaces = suffix == "_for_all_namespaces"
+        if resource.namespaced != bool(namespaced or all_namespaces) or (all_namespaces and verb != "list"):
+            raise AttributeError(attr)
+        method = self._method(verb, resource, suffix)
+        method.__name__ = attr
+        setattr(self, attr, method)
+        return method
+
+    def _method(self, verb: str, resource: _Resource, suffix: str):
+        cluster, api_client = self._cluster, self.api_client
+        names = [n for n in _ARGUMENTS[verb] if resource.namespaced or n != "namespace"]
+        if suffix == "_for_all_namespaces":
+            names = []
+
+        def method(*args, **kwargs):
+            params = dict(zip(names, args), **kwargs)
+            namespace, name = params.get("namespace"), params.get("name")
+            body = api_client.sanitize_for_serialization(params.get("body"))
+            cluster._before(verb, resource.kind, name)
+            if suffix == "_scale":
+                replicas = ((body or {}).get("spec") or {}).get("replicas") if verb != "read" else None
+                return api_client.to_model(cluster.scale(resource.store, namespace, name, replicas), "V1Scale")
+            if suffix == "_resize":
+                return api_client.to_model(cluster.resize(namespace, name, body), resource.model)
+            subresource = "status" if suffix == "_status" else None
+            if verb == "create":
+                obj = cluster.create(resource.store, namespace, body, dry_run=params.get("dry_run") == "All")
+            elif verb == "read":
+                obj = cluster.get(resource.store, namespace, name)
+            elif verb == "patch":
+                obj = cluster.patch(
+                    resource.store, namespace, name, body, subresource=subresource, dry_run=params.get("dry_run") == "All"
+                )
+            elif verb == "replace":
+                obj = cluster.replace(resource.store, namespace, name, body, subresource=subresource)
+            elif verb == "delete":
+                cluster.delete(resource.store, namespace, name, propagation_policy=_propagation_policy(params))
+                return api_client.to_model(_status(name, resource.kind), "V1Status")
+            elif verb == "delete_collection":
+                cluster.delete_collection(
+                    resource.store, namespace, params.get("label_selector"), params.get("field_selector"),
+                    propagation_policy=_propagation_policy(params)
+                )
+                return api_client.to_model(_status(kind=resource.kind), "V1Status")
+            elif params.get("watch"):
+                return cluster.watch(
+                    resource.store, namespace, params.get("label_selector"), params.get("field_selector"),
+                    params.get("resource_version"), params.get("timeout_seconds")
+                )
+            else:
+                items, resource_version = cluster.list(
+                    resource.store, namespace, params.get("label_selector"), params.get("field_selector")
+                )
+                obj = {
+                    "apiVersion": resource.store.rsplit("/", 1)[0],
+                    "kind": f"{resource.kind}List",
+                    "metadata": {"resourceVersion": resource_version},
+                    "items": items,
+                }
+                return api_client.to_model(obj, f"{resource.model}List")
+            return api_client.to_model(obj, resource.model)
+
+        # kubernetes.watch.Watch reads the model to deserialize events into from the docstring
+        method.__doc__ = f":return: {resource.model}List" if verb == "list" else f":return: {resource.model}"
+        return method
+
+
+class FakeCustomObjectsApi:
+    def __init__(self, cluster: FakeCluster, api_client: FakeApiClient = None):
+        self._cluster = cluster
+        self.api_client = api_client or FakeApiClient(cluster)
+
+    @staticmethod
+    def _store(group: str, version: str, plural: str) -> str:
+        return f"{group}/{version}/{plural}"
+
+    def _body(self, body) -> dict:
+        return self.api_client.sanitize_for_serialization(body)
+
+    def create_namespaced_custom_object(self, group, version, namespace, plural, body, **kwargs):
+        """:return: object"""
+        body = self._body(body)
+        self._cluster._before("create", plural, (body.get("metadata") or {}).get("name"))
+        obj = self._cluster.create(
+            self._store(group, version, plural), namespace, body, dry_run=kwargs.get("dry_run") == "All"
+        )
+        return copy.deepcopy(obj)
+
+    def get_namespaced_custom_object(self, group, version, namespace, plural, name, **kwargs):
+        """:return: object"""
+        self._cluster._before("read", plural, name)
+        return copy.deepcopy(self._cluster.get(self._store(group, version, plural), namespace, name))
+
+    def list_namespaced_custom_object(self, group, version, namespace, plural, **kwargs):
+        """:return: object"""
+        self._cluster._before("list", plural)
+        store = self._store(group, version, plural)
+        if kwargs.get("watch"):
+            return self._cluster.watch(
+                store, namespace, kwargs.get("label_selector"), kwargs.get("field_selector"),
+                kwargs.get("resource_version"), kwargs.get("timeout_seconds")
+            )
+        items, resource_version = self._cluster.list(
+            store, namespace, kwargs.get("label_selector"), kwargs.get("field_selector")
+        )
+        return {
+            "apiVersion": f"{group}/{version}",
+            "kind": "List",
+            "metadata": {"resourceVersion": resource_version},
+            "items": copy.deepcopy(items),
+        }
+
+    def list_cluster_custom_object(self, group, version, plural, **kwargs):
+        """:return: object"""
+        return self.list_namespaced_custom_object(group, version, None, plural, **kwargs)
+
+    def patch_namespaced_custom_object(self, group, version, namespace, plural, name, body, **kwargs):
+        """:return: object"""
+        self._cluster._before("patch", plural, name)
+        obj = self._cluster.patch(
+            self._store(group, version, plural), namespace, name, self._body(body), strategic=False,
+            dry_run=kwargs.get("dry_run") == "All"
+        )
+        return copy.deepcopy(obj)
+
+    def patch_namespaced_custom_object_status(self, group, version, namespace, plural, name, body, **kwargs):
+        """:return: object"""
+        self._cluster._before("patch", plural, name)
+        obj = self._cluster.patch(
+            self._store(group, version, plural), namespace, name, self._body(body), strategic=False,
+            subresource="status"
+        )
+        return copy.deepcopy(obj)
+
+    def replace_namespaced_custom_object(self, group, version, namespace, plural, name, body, **kwargs):
+        """:return: object"""
+        self._cluster._before("replace", plural, name)
+        return copy.deepcopy(self._cluster.replace(self._store(group, version, plural), namespace, name, self._body(body)))
+
+    def delete_namespaced_custom_object(self, group, version, namespace, plural, name, **kwargs):
+        """:return: object"""
+        self._cluster._before("delete", plural, name)
+        obj = self._cluster.delete(
+            self._store(group, version, plural), namespace, name, propagation_policy=_propagation_policy(kwargs)
+        )
+        return copy.deepcopy(obj)
+
+    def delete_collection_namespaced_custom_object(self, group, version, namespace, plural, **kwargs):
+        """:return: object"""
+        self._cluster._before("delete_collection", plural)
+        items = self._cluster.delete_collection(
+            self._store(group, version, plural), namespace, kwargs.get("label_selector"),
+            kwargs.get("field_selector"), propagation_policy=_propagation_policy(kwargs)
+        )
+        return {"apiVersion": f"{group}/{version}", "kind": "List", "items": copy.deepcopy(items)}
+
+
+class FakeKServeClient:
+    group, version, plural = "serving.kserve.io", "v1beta1", "inferenceservices"
+
+    def __init__(self, cluster: FakeCluster):
+        self.api_instance = FakeCustomObjectsApi(cluster)
+
+    def _namespace(self, body: dict, namespace: str) -> str:
+        return namespace or (body.get("metadata") or {}).get("namespace") or "default"
+
+    def get(self, name, namespace=None, **kwargs):
+        return self.api_instance.get_namespaced_custom_object(
+            self.group, self.version, namespace or "default", self.plural, name
+        )
+
+    def create(self, inferenceservice, namespace=None, **kwargs):
+        body = self.api_instance.api_client.sanitize_for_serialization(inferenceservice)
+        return self.api_instance.create_namespaced_custom_object(
+            self.group, self.version, self._namespace(body, namespace), self.plural, body
+        )
+
+    def patch(self, name, inferenceservice, namespace=None, **kwargs):
+        body = self.api_instance.api_client.sanitize_for_serialization(inferenceservice)
+        return self.api_instance.patch_namespaced_custom_object(
+            self.group, self.version, self._namespace(body, namespace), self.plural, name, body
+        )
+
+    def replace(self, name, inferenceservice, namespace=None, **kwargs):
+        body = self.api_instance.api_client.sanitize_for_serialization(inferenceservice)
+        return self.api_instance.replace_namespaced_custom_object(
+            self.group, self.version, self._namespace(body, namespace), self.plural, name, body
+        )
+
+    def delete(self, name, namespace=None, **kwargs):
+        return self.api_instance.delete_namespaced_custom_object(
+            self.group, self.version, namespace or "default", self.plural, name
+        )
+
+
+def fake_api(cluster: FakeCluster, api_class_name: str):
+    if api_class_name == "CustomObjectsApi":
+        return FakeCustomObjectsApi(cluster)
+    return FakeApi(cluster, _RESOURCES[api_class_name])
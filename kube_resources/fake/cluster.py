@@ -0,0 +1,1193 @@
+import copy
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Callable, List, Union
+
+from kubernetes.client.rest import ApiException
+
+from .selectors import (
+    parse_label_selector, match_labels, parse_field_selector, match_fields,
+    selector_string
+)
+
+POD = "v1/pods"
+SERVICE = "v1/services"
+ENDPOINTS = "v1/endpoints"
+EVENT = "v1/events"
+NODE = "v1/nodes"
+DEPLOYMENT = "apps/v1/deployments"
+REPLICA_SET = "apps/v1/replicasets"
+STATEFUL_SET = "apps/v1/statefulsets"
+DAEMON_SET = "apps/v1/daemonsets"
+INFERENCE_SERVICE = "serving.kserve.io/v1beta1/inferenceservices"
+JOB = "batch/v1/jobs"
+
+REVISION_ANNOTATION = "deployment.kubernetes.io/revision"
+INFERENCE_SERVICE_LABEL = "serving.kserve.io/inferenceservice"
+JOB_NAME_LABEL = "batch.kubernetes.io/job-name"
+JOB_INDEX_ANNOTATION = "batch.kubernetes.io/job-completion-index"
+_SCALABLE = (DEPLOYMENT, REPLICA_SET, STATEFUL_SET)
+_NAME_KEYED_LISTS = {"containers", "initContainers", "volumes", "env", "volumeMounts", "ephemeralContainers"}
+_SUFFIX_ALPHABET = "bcdfghjklmnpqrstvwxz2456789"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _api_error(status: int, reason: str, message: str) -> ApiException:
+    e = ApiException(status=status, reason=reason)
+    e.body = json.dumps(
+        {"kind": "Status", "apiVersion": "v1", "status": "Failure", "message": message, "reason": reason, "code": status}
+    )
+    return e
+
+
+def _template_hash(template: dict) -> str:
+    return hashlib.sha1(json.dumps(template, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def _owner_reference(owner: dict) -> dict:
+    return {
+        "apiVersion": owner["apiVersion"],
+        "kind": owner["kind"],
+        "name": owner["metadata"]["name"],
+        "uid": owner["metadata"]["uid"],
+        "controller": True,
+        "blockOwnerDeletion": True,
+    }
+
+
+def _compact(status: dict) -> dict:
+    # The API server omits empty integer fields, keep the fake's output shaped the same way
+    return {k: v for k, v in status.items() if v not in (0, None)}
+
+
+def _default_pod_spec(spec: dict):
+    spec.setdefault("restartPolicy", "Always")
+    spec.setdefault("schedulerName", "default-scheduler")
+    for container in (spec.get("containers") or []) + (spec.get("initContainers") or []):
+        container.setdefault("resources", {})
+        container.setdefault("imagePullPolicy", "IfNotPresent")
+        container.setdefault("terminationMessagePath", "/dev/termination-log")
+
+
+def _compress_indexes(indexes) -> str:
+    ranges = []
+    for index in sorted(indexes):
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def _apply_defaults(store: str, obj: dict):
+    spec = obj.get("spec")
+    if not isinstance(spec, dict):
+        return
+    if store == POD:
+        _default_pod_spec(spec)
+    elif isinstance(spec.get("template"), dict) and isinstance(spec["template"].get("spec"), dict):
+        _default_pod_spec(spec["template"]["spec"])
+
+
+def _is_ready(pod: dict) -> bool:
+    if pod["metadata"].get("deletionTimestamp"):
+        return False
+    for condition in (pod.get("status") or {}).get("conditions") or []:
+        if condition["type"] == "Ready":
+            return condition["status"] == "True"
+    return False
+
+
+def _merge(target, patch, strategic: bool):
+    if not isinstance(patch, dict) or not isinstance(target, dict):
+        return copy.deepcopy(patch)
+    result = dict(target)
+    for key, value in patch.items():
+        current = result.get(key)
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(current, dict):
+            result[key] = _merge(current, value, strategic)
+        elif (
+                strategic and key in _NAME_KEYED_LISTS and isinstance(value, list) and isinstance(current, list)
+                and all(isinstance(i, dict) and "name" in i for i in value + current)
+        ):
+            merged = {i["name"]: i for i in current}
+            for item in value:
+                merged[item["name"]] = _merge(merged.get(item["name"], {}), item, strategic)
+            result[key] = list(merged.values())
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+
+def _json_patch(target: dict, operations: List[dict]) -> dict:
+    result = copy.deepcopy(target)
+    for operation in operations:
+        *parents, leaf = [p.replace("~1", "/").replace("~0", "~") for p in operation["path"].split("/")[1:]]
+        node = result
+        for part in parents:
+            node = node[int(part)] if isinstance(node, list) else node.setdefault(part, {})
+        op = operation["op"]
+        if isinstance(node, list):
+            index = len(node) if leaf == "-" else int(leaf)
+            if op == "add":
+                node.insert(index, copy.deepcopy(operation["value"]))
+            elif op == "replace":
+                node[index] = copy.deepcopy(operation["value"])
+            elif op == "remove":
+                del node[index]
+        elif op in ("add", "replace"):
+            node[leaf] = copy.deepcopy(operation["value"])
+        elif op == "remove":
+            node.pop(leaf, None)
+        elif op == "test" and node.get(leaf) != operation["value"]:
+            raise _api_error(422, "Invalid", f"test operation failed for {operation['path']}")
+    return result
+
+
+class _WatchResponse:
+    # Quacks like the urllib3 response kubernetes.watch.Watch reads events from
+    def __init__(self, events):
+        self._events = events
+        self.closed = False
+
+    def stream(self, amt=None, decode_content=None):
+        for event in self._events:
+            if self.closed:
+                return
+            yield (json.dumps(event) + "\n").encode()
+
+    def close(self):
+        self.closed = True
+        self._events.close()
+
+    def release_conn(self):
+        pass
+
+
+class FakeCluster:
+    def __init__(
+            self,
+            nodes: int = 3,
+            latency: Union[float, Callable[[], float]] = 0.0,
+            error_rate: float = 0.0,
+            auto_ready=True,
+            emit_events=True,
+            max_events=10000,
+            watch_history=10000,
+            seed: int = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.auto_ready = auto_ready
+        self.emit_events = emit_events
+        self.max_events = max_events
+        self.watch_history = watch_history
+        self.resize_result = None  # None applies resizes, "Infeasible" or "Deferred" leaves them pending
+        self.calls = Counter()
+        self._nodes = nodes
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._faults = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stores = {}
+            self._children = {}
+            self._log = []
+            self._resource_version = 0
+            self._ip_counter = 0
+            self._node_counter = 0
+            self._event_keys = deque()
+            self._reconciling = set()
+            self._faults.clear()
+            self.calls.clear()
+            for i in range(self._nodes):
+                self.add_node(f"fake-node-{i}")
+
+    # Fault and latency injection
+
+    def inject_error(
+            self, verb: str = None, kind: str = None, name: str = None, status=500, reason="InternalError", times=1
+    ):
+        with self._lock:
+            self._faults.append(
+                {"verb": verb, "kind": kind, "name": name, "status": status, "reason": reason, "times": times}
+            )
+
+    def _before(self, verb: str, kind: str, name: str = None):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+        with self._lock:
+            self.calls[(verb, kind)] += 1
+            for fault in self._faults:
+                if (
+                        (fault["verb"] is None or fault["verb"] == verb)
+                        and (fault["kind"] is None or fault["kind"] == kind)
+                        and (fault["name"] is None or fault["name"] == name)
+                ):
+                    fault["times"] -= 1
+                    if fault["times"] <= 0:
+                        self._faults.remove(fault)
+                    raise _api_error(fault["status"], fault["reason"], f"injected {verb} {kind} failure")
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise _api_error(500, "InternalError", f"injected {verb} {kind} failure")
+
+    # Storage primitives, objects in the store are never mutated, writers always put a new dict
+
+    def _store(self, store: str) -> dict:
+        return self._stores.setdefault(store, {})
+
+    def _get(self, store: str, namespace: str, name: str):
+        return self._store(store).get((namespace, name))
+
+    def _put(self, store: str, obj: dict, event_type: str):
+        self._resource_version += 1
+        # Copy the top level so a stored object sharing metadata with this one keeps its resourceVersion
+        obj = {**obj, "metadata": {**obj["metadata"], "resourceVersion": str(self._resource_version)}}
+        metadata = obj["metadata"]
+        key = (metadata.get("namespace"), metadata["name"])
+        previous = self._store(store).get(key)
+        self._store(store)[key] = obj
+        self._index_owners(store, previous, discard=True)
+        self._index_owners(store, obj)
+        self._log_event(store, event_type, obj)
+        return obj
+
+    def _remove(self, store: str, obj: dict):
+        metadata = obj["metadata"]
+        self._store(store).pop((metadata.get("namespace"), metadata["name"]), None)
+        self._index_owners(store, obj, discard=True)
+        self._resource_version += 1
+        obj = {**obj, "metadata": {**metadata, "resourceVersion": str(self._resource_version)}}
+        self._log_event(store, "DELETED", obj)
+        return obj
+
+    def _index_owners(self, store: str, obj: dict, discard=False):
+        if obj is None:
+            return
+        key = (store, obj["metadata"].get("namespace"), obj["metadata"]["name"])
+        for reference in obj["metadata"].get("ownerReferences") or []:
+            children = self._children.setdefault(reference["uid"], set())
+            if discard:
+                children.discard(key)
+            else:
+                children.add(key)
+
+    def _log_event(self, store: str, event_type: str, obj: dict):
+        self._log.append((self._resource_version, store, event_type, obj))
+        if len(self._log) > 2 * self.watch_history:
+            del self._log[:len(self._log) - self.watch_history]
+        self._changed.notify_all()
+
+    def _owned(self, owner: dict, store: str) -> List[dict]:
+        children = []
+        for child_store, namespace, name in list(self._children.get(owner["metadata"]["uid"], ())):
+            if child_store == store:
+                child = self._get(store, namespace, name)
+                if child is not None:
+                    children.append(child)
+        return children
+
+    def _not_found(self, store: str, name: str):
+        return _api_error(404, "NotFound", f'{store.rsplit("/", 1)[-1]} "{name}" not found')
+
+    # Generic verbs used by the API facades
+
+    def create(self, store: str, namespace: str, body: dict, dry_run=False) -> dict:
+        with self._lock:
+            obj = copy.deepcopy(body)
+            metadata = obj.setdefault("metadata", {})
+            if namespace is not None:
+                metadata["namespace"] = namespace
+            if not metadata.get("name") and metadata.get("generateName"):
+                metadata["name"] = metadata["generateName"] + self._suffix()
+            if not metadata.get("name"):
+                raise _api_error(422, "Invalid", "metadata.name: Required value")
+            if self._get(store, namespace, metadata["name"]) is not None:
+                raise _api_error(409, "AlreadyExists", f'{store.rsplit("/", 1)[-1]} "{metadata["name"]}" already exists')
+            if dry_run:
+                return obj
+            return self._create_object(store, obj)
+
+    def _create_object(self, store: str, obj: dict) -> dict:
+        metadata = obj["metadata"]
+        metadata.update(uid=str(uuid.UUID(int=self._random.getrandbits(128))), creationTimestamp=_now(), generation=1)
+        if store in _SCALABLE and obj.get("spec", {}).get("replicas") is None:
+            obj["spec"]["replicas"] = 1
+        _apply_defaults(store, obj)
+        if store == DEPLOYMENT:
+            obj["spec"].setdefault("strategy", {"type": "RollingUpdate", "rollingUpdate": {"maxSurge": "25%", "maxUnavailable": "25%"}})
+            obj["spec"].setdefault("progressDeadlineSeconds", 600)
+            obj["spec"].setdefault("revisionHistoryLimit", 10)
+        if store == JOB:
+            self._default_job(obj)
+        if store == POD:
+            self._start_pod(obj)
+        self._put(store, obj, "ADDED")
+        self._after_write(store, obj)
+        return self._get(store, metadata.get("namespace"), metadata["name"])
+
+    def get(self, store: str, namespace: str, name: str) -> dict:
+        with self._lock:
+            obj = self._get(store, namespace, name)
+            if obj is None:
+                raise self._not_found(store, name)
+            return obj
+
+    def list(self, store: str, namespace: str = None, label_selector: str = None, field_selector: str = None):
+        labels = parse_label_selector(label_selector)
+        fields = parse_field_selector(field_selector)
+        with self._lock:
+            items = [
+                obj for (ns, _), obj in self._store(store).items()
+                if (namespace is None or ns == namespace)
+                and match_labels(obj["metadata"].get("labels"), labels) and match_fields(obj, fields)
+            ]
+            return sorted(items, key=lambda o: (o["metadata"].get("namespace") or "", o["metadata"]["name"])), \
+                str(self._resource_version)
+
+    def patch(
+            self, store: str, namespace: str, name: str, body, strategic=True, subresource: str = None, dry_run=False
+    ) -> dict:
+        with self._lock:
+            current = self.get(store, namespace, name)
+            if isinstance(body, list):
+                updated = _json_patch(current, body)
+            else:
+                expected = (body.get("metadata") or {}).get("resourceVersion")
+                if expected and expected != current["metadata"]["resourceVersion"]:
+                    raise _api_error(409, "Conflict", f'the object "{name}" has been modified; please retry')
+                if subresource == "status":
+                    body = {"status": body.get("status")}
+                updated = _merge(current, body, strategic)
+            if dry_run:
+                return updated
+            return self._update(store, current, updated, subresource)
+
+    def replace(self, store: str, namespace: str, name: str, body: dict, subresource: str = None) -> dict:
+        with self._lock:
+            current = self.get(store, namespace, name)
+            expected = (body.get("metadata") or {}).get("resourceVersion")
+            if expected and expected != current["metadata"]["resourceVersion"]:
+                raise _api_error(409, "Conflict", f'the object "{name}" has been modified; please retry')
+            if subresource == "status":
+                updated = {**current, "status": copy.deepcopy(body.get("status"))}
+            else:
+                updated = {**copy.deepcopy(body), "status": current.get("status")}
+            return self._update(store, current, updated, subresource)
+
+    def _update(self, store: str, current: dict, updated: dict, subresource: str = None) -> dict:
+        metadata = updated["metadata"] = {**updated.get("metadata", {})}
+        for key in ("name", "namespace", "uid", "creationTimestamp", "generation"):
+            if key in current["metadata"]:
+                metadata[key] = current["metadata"][key]
+        if subresource != "status":
+            updated["spec"] = copy.deepcopy(updated.get("spec"))
+            _apply_defaults(store, updated)
+        if subresource != "status" and updated.get("spec") != current.get("spec"):
+            metadata["generation"] = current["metadata"].get("generation", 1) + 1
+        self._put(store, updated, "MODIFIED")
+        if subresource != "status":
+            self._after_write(store, updated)
+        return self._get(store, metadata.get("namespace"), metadata["name"])
+
+    def delete(self, store: str, namespace: str, name: str, propagation_policy: str = None) -> dict:
+        with self._lock:
+            current = self.get(store, namespace, name)
+            return self._delete_object(store, current, propagation_policy)
+
+    def delete_collection(
+            self, store: str, namespace: str, label_selector: str = None, field_selector: str = None,
+            propagation_policy: str = None
+    ) -> List[dict]:
+        with self._lock:
+            items, _ = self.list(store, namespace, label_selector, field_selector)
+            return [self._delete_object(store, obj, propagation_policy) for obj in items]
+
+    def _delete_object(self, store: str, obj: dict, propagation_policy: str = None, reconcile_owner=True) -> dict:
+        if self._get(store, obj["metadata"].get("namespace"), obj["metadata"]["name"]) is None:
+            return obj
+        deleted = self._remove(store, obj)
+        if propagation_policy != "Orphan":
+            for child_store, namespace, name in list(self._children.get(obj["metadata"]["uid"], ())):
+                child = self._get(child_store, namespace, name)
+                if child is not None:
+                    self._delete_object(child_store, child, propagation_policy, reconcile_owner=False)
+        self._children.pop(obj["metadata"]["uid"], None)
+        self._after_delete(store, obj, reconcile_owner)
+        return deleted
+
+    def scale(self, store: str, namespace: str, name: str, replicas: int = None) -> dict:
+        with self._lock:
+            obj = self.get(store, namespace, name)
+            if replicas is not None and replicas != obj["spec"].get("replicas"):
+                obj = self.patch(store, namespace, name, {"spec": {"replicas": replicas}})
+            return {
+                "apiVersion": "autoscaling/v1",
+                "kind": "Scale",
+                "metadata": {
+                    "name": name,
+                    "namespace": namespace,
+                    "uid": obj["metadata"]["uid"],
+                    "resourceVersion": obj["metadata"]["resourceVersion"],
+                },
+                "spec": {"replicas": obj["spec"].get("replicas")},
+                "status": {
+                    "replicas": (obj.get("status") or {}).get("replicas", 0),
+                    "selector": selector_string(obj["spec"].get("selector", {}).get("matchLabels")),
+                },
+            }
+
+    def resize(self, namespace: str, name: str, body: dict) -> dict:
+        with self._lock:
+            current = self.get(POD, namespace, name)
+            containers = [
+                {"name": c["name"], "resources": c["resources"]}
+                for c in (body.get("spec") or {}).get("containers") or [] if "resources" in c
+            ]
+            pod = _merge(current, {"spec": {"containers": containers}}, strategic=True)
+            status = pod["status"] = copy.deepcopy(current.get("status") or {})
+            conditions = [c for c in status.get("conditions") or [] if c["type"] != "PodResizePending"]
+            if self.resize_result:
+                status["resize"] = self.resize_result
+                conditions.append({
+                    "type": "PodResizePending",
+                    "status": "True",
+                    "reason": self.resize_result,
+                    "message": f"fake cluster marked the resize {self.resize_result}",
+                    "lastTransitionTime": _now(),
+                })
+            else:
+                status.pop("resize", None)
+                resources = {c["name"]: c.get("resources") or {} for c in pod["spec"]["containers"]}
+                for container_status in status.get("containerStatuses") or []:
+                    container_resources = resources.get(container_status["name"], {})
+                    container_status["resources"] = copy.deepcopy(container_resources)
+                    container_status["allocatedResources"] = copy.deepcopy(container_resources.get("requests") or {})
+            status["conditions"] = conditions
+            self._put(POD, pod, "MODIFIED")
+            return pod
+
+    # Watches
+
+    def watch(
+            self,
+            store: str,
+            namespace: str = None,
+            label_selector: str = None,
+            field_selector: str = None,
+            resource_version: str = None,
+            timeout_seconds: int = None,
+    ) -> _WatchResponse:
+        return _WatchResponse(
+            self._watch_events(store, namespace, label_selector, field_selector, resource_version, timeout_seconds)
+        )
+
+    def _watch_events(self, store, namespace, label_selector, field_selector, resource_version, timeout_seconds):
+        labels = parse_label_selector(label_selector)
+        fields = parse_field_selector(field_selector)
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+
+        def matches(event_store, obj):
+            return (
+                event_store == store
+                and (namespace is None or obj["metadata"].get("namespace") == namespace)
+                and match_labels(obj["metadata"].get("labels"), labels) and match_fields(obj, fields)
+            )
+
+        with self._lock:
+            if resource_version in (None, "", "0"):
+                position = self._resource_version
+                initial = [
+                    {"type": "ADDED", "object": obj}
+                    for (ns, _), obj in self._store(store).items() if matches(store, obj)
+                ]
+            else:
+                position = int(resource_version)
+                oldest = self._log[0][0] if self._log else self._resource_version + 1
+                if position < oldest - 1:
+                    initial = [{
+                        "type": "ERROR",
+                        "object": {
+                            "kind": "Status", "apiVersion": "v1", "status": "Failure", "reason": "Expired",
+                            "message": f"too old resource version: {position} ({oldest - 1})", "code": 410,
+                        }
+                    }]
+                    position = None
+                else:
+                    initial = []
+        yield from initial
+        while position is not None:
+            with self._lock:
+                pending = []
+                for rv, event_store, event_type, obj in reversed(self._log):
+                    if rv <= position:
+                        break
+                    if matches(event_store, obj):
+                        pending.append({"type": event_type, "object": obj})
+                if self._log and self._log[-1][0] > position:
+                    position = self._log[-1][0]
+                if not pending:
+                    wait = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+                    if wait <= 0:
+                        return
+                    self._changed.wait(wait)
+                    continue
+            yield from reversed(pending)
+
+    # Simulated kubelet, controllers and endpoints
+
+    def add_node(self, name: str, labels: dict = None):
+        with self._lock:
+            node = {
+                "apiVersion": "v1",
+                "kind": "Node",
+                "metadata": {"name": name, "labels": {"kubernetes.io/hostname": name, **(labels or {})}},
+                "status": {
+                    "allocatable": {"cpu": "32", "memory": "128Gi", "pods": "110"},
+                    "capacity": {"cpu": "32", "memory": "128Gi", "pods": "110"},
+                    "conditions": [{"type": "Ready", "status": "True", "lastTransitionTime": _now()}],
+                    "images": [],
+                },
+            }
+            node["metadata"].update(uid=str(uuid.UUID(int=self._random.getrandbits(128))), creationTimestamp=_now())
+            return self._put(NODE, node, "ADDED")
+
+    def set_pod_status(
+            self, namespace: str, name: str, phase: str = None, ready: bool = None, exit_code: int = None,
+            reason: str = None, message: str = None
+    ) -> dict:
+        with self._lock:
+            pod = copy.deepcopy(self.get(POD, namespace, name))
+            status = pod.setdefault("status", {})
+            now = _now()
+            if ready is not None:
+                for condition in status.get("conditions") or []:
+                    if condition["type"] in ("Ready", "ContainersReady"):
+                        condition.update(status="True" if ready else "False", lastTransitionTime=now)
+                for container_status in status.get("containerStatuses") or []:
+                    container_status["ready"] = ready
+            if phase is not None:
+                status["phase"] = phase
+            if phase in ("Succeeded", "Failed"):
+                code = exit_code if exit_code is not None else (0 if phase == "Succeeded" else 1)
+                for container_status in status.get("containerStatuses") or []:
+                    started = ((container_status.get("state") or {}).get("running") or {}).get("startedAt", now)
+                    container_status.update(ready=False, started=False, state={"terminated": {
+                        "exitCode": code, "reason": reason or ("Completed" if code == 0 else "Error"),
+                        "message": message, "startedAt": started, "finishedAt": now,
+                    }})
+                for condition in status.get("conditions") or []:
+                    if condition["type"] in ("Ready", "ContainersReady"):
+                        condition.update(status="False", reason="PodCompleted", lastTransitionTime=now)
+            elif reason is not None:
+                for container_status in status.get("containerStatuses") or []:
+                    container_status.update(ready=False, state={"waiting": {"reason": reason, "message": message}})
+            self._put(POD, pod, "MODIFIED")
+            self._pod_changed(pod, pod)
+            return pod
+
+    def _suffix(self, length=5) -> str:
+        return "".join(self._random.choice(_SUFFIX_ALPHABET) for _ in range(length))
+
+    def _record_event(self, involved: dict, reason: str, message: str, event_type="Normal", component="kubelet"):
+        if not self.emit_events:
+            return
+        now = _now()
+        metadata = involved["metadata"]
+        event = {
+            "apiVersion": "v1",
+            "kind": "Event",
+            "metadata": {
+                "name": f"{metadata['name']}.{uuid.UUID(int=self._random.getrandbits(128)).hex[:16]}",
+                "namespace": metadata.get("namespace") or "default",
+                "uid": str(uuid.UUID(int=self._random.getrandbits(128))),
+                "creationTimestamp": now,
+            },
+            "involvedObject": {
+                "apiVersion": involved.get("apiVersion"),
+                "kind": involved.get("kind"),
+                "name": metadata["name"],
+                "namespace": metadata.get("namespace"),
+                "uid": metadata.get("uid"),
+            },
+            "reason": reason,
+            "message": message,
+            "type": event_type,
+            "count": 1,
+            "firstTimestamp": now,
+            "lastTimestamp": now,
+            "source": {"component": component},
+        }
+        self._put(EVENT, event, "ADDED")
+        self._event_keys.append((event["metadata"]["namespace"], event["metadata"]["name"]))
+        while len(self._event_keys) > self.max_events:
+            namespace, name = self._event_keys.popleft()
+            expired = self._get(EVENT, namespace, name)
+            if expired is not None:
+                self._remove(EVENT, expired)
+
+    def _start_pod(self, pod: dict):
+        spec, now = pod.setdefault("spec", {}), _now()
+        nodes = sorted(self._store(NODE))
+        if not spec.get("nodeName") and nodes:
+            spec["nodeName"] = nodes[self._node_counter % len(nodes)][1]
+            self._node_counter += 1
+        status = pod["status"] = {
+            "phase": "Pending",
+            "qosClass": "Burstable",
+            "conditions": [{"type": "PodScheduled", "status": "True", "lastTransitionTime": now}],
+        }
+        if spec.get("nodeName"):
+            self._record_event(pod, "Scheduled", f"Successfully assigned {pod['metadata']['name']} to {spec['nodeName']}",
+                               component="default-scheduler")
+        if not self.auto_ready:
+            return
+        self._ip_counter += 1
+        status.update(
+            phase="Running",
+            podIP=f"10.{(self._ip_counter >> 16) & 255}.{(self._ip_counter >> 8) & 255}.{self._ip_counter & 255}",
+            hostIP="192.168.0.1",
+            startTime=now,
+        )
+        status["conditions"] += [
+            {"type": t, "status": "True", "lastTransitionTime": now} for t in ("Initialized", "ContainersReady", "Ready")
+        ]
+        # Init containers run to completion right away, which pulls their images like regular containers
+        if spec.get("initContainers"):
+            status["initContainerStatuses"] = []
+        for container in spec.get("initContainers") or []:
+            status["initContainerStatuses"].append({
+                "name": container["name"],
+                "image": container.get("image"),
+                "imageID": f"{container.get('image')}@sha256:{hashlib.sha256(str(container.get('image')).encode()).hexdigest()}",
+                "ready": True,
+                "restartCount": 0,
+                "state": {"terminated": {"exitCode": 0, "reason": "Completed", "startedAt": now, "finishedAt": now}},
+                "lastState": {},
+            })
+            self._record_event(pod, "Pulled", f'Container image "{container.get("image")}" already present on machine')
+            self._cache_image(spec.get("nodeName"), container.get("image"))
+        status["containerStatuses"] = []
+        for container in spec.get("containers") or []:
+            resources = container.get("resources") or {}
+            status["containerStatuses"].append({
+                "name": container["name"],
+                "image": container.get("image"),
+                "imageID": f"{container.get('image')}@sha256:{hashlib.sha256(str(container.get('image')).encode()).hexdigest()}",
+                "ready": True,
+                "started": True,
+                "restartCount": 0,
+                "state": {"running": {"startedAt": now}},
+                "lastState": {},
+                "resources": copy.deepcopy(resources),
+                "allocatedResources": copy.deepcopy(resources.get("requests") or {}),
+            })
+            self._record_event(pod, "Pulled", f'Container image "{container.get("image")}" already present on machine')
+            self._record_event(pod, "Created", f"Created container {container['name']}")
+            self._record_event(pod, "Started", f"Started container {container['name']}")
+            self._cache_image(spec.get("nodeName"), container.get("image"))
+
+    def _cache_image(self, node_name: str, image: str):
+        node = self._get(NODE, None, node_name) if node_name else None
+        if node is None or any(image in i.get("names", []) for i in node["status"]["images"]):
+            return
+        node = copy.deepcopy(node)
+        node["status"]["images"].append({"names": [image], "sizeBytes": 0})
+        self._put(NODE, node, "MODIFIED")
+
+    def _create_pod(self, owner: dict, template: dict, name: str, node_name: str = None):
+        pod = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                **copy.deepcopy(template.get("metadata") or {}),
+                "name": name,
+                "namespace": owner["metadata"]["namespace"],
+                "ownerReferences": [_owner_reference(owner)],
+            },
+            "spec": copy.deepcopy(template.get("spec") or {}),
+        }
+        if node_name:
+            pod["spec"]["nodeName"] = node_name
+        return self._create_object(POD, pod)
+
+    def _after_write(self, store: str, obj: dict):
+        if store == DEPLOYMENT:
+            self._reconcile_deployment(obj)
+        elif store == REPLICA_SET:
+            self._reconcile_replica_set(obj)
+        elif store == STATEFUL_SET:
+            self._reconcile_stateful_set(obj)
+        elif store == DAEMON_SET:
+            self._reconcile_daemon_set(obj)
+        elif store == POD:
+            self._pod_changed(None, obj)
+        elif store == SERVICE:
+            self._sync_endpoints(obj["metadata"]["namespace"])
+        elif store == INFERENCE_SERVICE:
+            self._reconcile_inference_service(obj)
+        elif store.endswith("/horizontalpodautoscalers"):
+            self._reconcile_horizontal_pod_autoscaler(store, obj)
+        elif store == JOB:
+            self._reconcile_job(obj)
+
+    def _after_delete(self, store: str, obj: dict, reconcile_owner: bool):
+        if store == POD:
+            self._pod_changed(obj, None, reconcile_owner)
+        elif store == SERVICE:
+            endpoints = self._get(ENDPOINTS, obj["metadata"]["namespace"], obj["metadata"]["name"])
+            if endpoints is not None:
+                self._remove(ENDPOINTS, endpoints)
+        elif store == REPLICA_SET:
+            self._update_owner_status(obj)
+
+    def _owner(self, obj: dict, kind: str, store: str):
+        for reference in obj["metadata"].get("ownerReferences") or []:
+            if reference["kind"] == kind:
+                return self._get(store, obj["metadata"]["namespace"], reference["name"])
+        return None
+
+    def _pod_changed(self, old: dict, new: dict, reconcile_owner=False):
+        pod = new or old
+        namespace = pod["metadata"]["namespace"]
+        owners = {"ReplicaSet": REPLICA_SET, "StatefulSet": STATEFUL_SET, "DaemonSet": DAEMON_SET, "Job": JOB}
+        for reference in pod["metadata"].get("ownerReferences") or []:
+            store = owners.get(reference["kind"])
+            owner = self._get(store, namespace, reference["name"]) if store else None
+            if owner is None:
+                continue
+            if store == JOB:
+                # Jobs react to every pod phase change, not only to deletions
+                self._reconcile_job(owner)
+            elif reconcile_owner:
+                self._after_write(store, owner)
+            else:
+                self._update_workload_status(store, owner)
+        labels = [p["metadata"].get("labels") or {} for p in (old, new) if p is not None]
+        self._sync_endpoints(namespace, labels)
+
+    def _replica_counts(self, pods: List[dict]) -> dict:
+        ready = sum(1 for p in pods if _is_ready(p))
+        return {"replicas": len(pods), "readyReplicas": ready, "availableReplicas": ready}
+
+    def _update_workload_status(self, store: str, obj: dict):
+        obj = self._get(store, obj["metadata"]["namespace"], obj["metadata"]["name"])
+        if obj is None:
+            return
+        pods = [p for p in self._owned(obj, POD) if not p["metadata"].get("deletionTimestamp")]
+        counts = self._replica_counts(pods)
+        if store == REPLICA_SET:
+            status = {**counts, "fullyLabeledReplicas": counts["replicas"]}
+        elif store == STATEFUL_SET:
+            status = {**counts, "currentReplicas": counts["replicas"], "updatedReplicas": counts["replicas"]}
+        else:
+            status = {
+                "desiredNumberScheduled": len(self._daemon_set_nodes(obj)),
+                "currentNumberScheduled": counts["replicas"],
+                "updatedNumberScheduled": counts["replicas"],
+                "numberReady": counts["readyReplicas"],
+                "numberAvailable": counts["availableReplicas"],
+            }
+        status = {**_compact(status), "observedGeneration": obj["metadata"].get("generation", 1)}
+        if store != DAEMON_SET:
+            # replicas is required (not omitempty) on ReplicaSet and StatefulSet status
+            status["replicas"] = counts["replicas"]
+        else:
+            required = ("currentNumberScheduled", "desiredNumberScheduled", "numberMisscheduled", "numberReady")
+            status.update({key: status.get(key, 0) for key in required})
+        if status != obj.get("status"):
+            self._put(store, {**obj, "status": status}, "MODIFIED")
+        if store == REPLICA_SET:
+            self._update_owner_status(obj)
+
+    def _update_owner_status(self, replica_set: dict):
+        deployment = self._owner(replica_set, "Deployment", DEPLOYMENT)
+        if deployment is not None:
+            self._update_deployment_status(deployment)
+
+    def _reconcile_deployment(self, deployment: dict):
+        namespace, name = deployment["metadata"]["namespace"], deployment["metadata"]["name"]
+        spec = deployment["spec"]
+        template = spec.get("template") or {}
+        template_hash = _template_hash(template)
+        owned = self._owned(deployment, REPLICA_SET)
+        revision = lambda rs: int((rs["metadata"].get("annotations") or {}).get(REVISION_ANNOTATION, "0"))
+        max_revision = max(map(revision, owned), default=0)
+        new_rs = next(
+            (rs for rs in owned if (rs["metadata"].get("labels") or {}).get("pod-template-hash") == template_hash), None
+        )
+        if new_rs is None:
+            rs_template = copy.deepcopy(template)
+            rs_template.setdefault("metadata", {}).setdefault("labels", {})["pod-template-hash"] = template_hash
+            selector = copy.deepcopy(spec.get("selector") or {})
+            selector.setdefault("matchLabels", {})["pod-template-hash"] = template_hash
+            new_rs = self._create_object(REPLICA_SET, {
+                "apiVersion": "apps/v1",
+                "kind": "ReplicaSet",
+                "metadata": {
+                    "name": f"{name}-{template_hash}",
+                    "namespace": namespace,
+                    "labels": dict(rs_template["metadata"]["labels"]),
+                    "annotations": {REVISION_ANNOTATION: str(max_revision + 1)},
+                    "ownerReferences": [_owner_reference(deployment)],
+                },
+                "spec": {"replicas": spec.get("replicas"), "selector": selector, "template": rs_template},
+            })
+        else:
+            updated = copy.deepcopy(new_rs)
+            updated["spec"]["replicas"] = spec.get("replicas")
+            if revision(new_rs) < max_revision:
+                updated["metadata"].setdefault("annotations", {})[REVISION_ANNOTATION] = str(max_revision + 1)
+            if updated != new_rs:
+                self._update(REPLICA_SET, new_rs, updated)
+                new_rs = self._get(REPLICA_SET, namespace, new_rs["metadata"]["name"])
+        for rs in owned:
+            if rs["metadata"]["name"] != new_rs["metadata"]["name"] and rs["spec"].get("replicas"):
+                updated = copy.deepcopy(rs)
+                updated["spec"]["replicas"] = 0
+                self._update(REPLICA_SET, rs, updated)
+        deployment = self._get(DEPLOYMENT, namespace, name)
+        annotations = deployment["metadata"].get("annotations") or {}
+        if annotations.get(REVISION_ANNOTATION) != str(revision(new_rs)):
+            deployment = copy.deepcopy(deployment)
+            deployment["metadata"]["annotations"] = {**annotations, REVISION_ANNOTATION: str(revision(new_rs))}
+            self._put(DEPLOYMENT, deployment, "MODIFIED")
+        self._update_deployment_status(deployment)
+
+    def _update_deployment_status(self, deployment: dict):
+        deployment = self._get(DEPLOYMENT, deployment["metadata"]["namespace"], deployment["metadata"]["name"])
+        if deployment is None:
+            return
+        template_hash = _template_hash(deployment["spec"].get("template") or {})
+        replica_sets = self._owned(deployment, REPLICA_SET)
+        status = lambda rs: rs.get("status") or {}
+        desired = deployment["spec"].get("replicas", 1)
+        replicas = sum(status(rs).get("replicas", 0) for rs in replica_sets)
+        available = sum(status(rs).get("availableReplicas", 0) for rs in replica_sets)
+        updated = sum(
+            status(rs).get("replicas", 0) for rs in replica_sets
+            if (rs["metadata"].get("labels") or {}).get("pod-template-hash") == template_hash
+        )
+        complete = updated == desired and replicas == desired and available >= desired
+        previous = {c["type"]: c for c in (deployment.get("status") or {}).get("conditions") or []}
+
+        def condition(condition_type, value, reason, message):
+            old = previous.get(condition_type)
+            same = old is not None and old["status"] == value and old.get("reason") == reason
+            now = _now()
+            return {
+                "type": condition_type,
+                "status": value,
+                "reason": reason,
+                "message": message,
+                "lastUpdateTime": old["lastUpdateTime"] if same else now,
+                "lastTransitionTime": old["lastTransitionTime"] if same else now,
+            }
+
+        new_status = {
+            **_compact({
+                "replicas": replicas,
+                "updatedReplicas": updated,
+                "readyReplicas": sum(status(rs).get("readyReplicas", 0) for rs in replica_sets),
+                "availableReplicas": available,
+                "unavailableReplicas": max(desired - available, 0),
+            }),
+            "observedGeneration": deployment["metadata"].get("generation", 1),
+            "conditions": [
+                condition(
+                    "Available", "True" if available >= desired else "False",
+                    "MinimumReplicasAvailable" if available >= desired else "MinimumReplicasUnavailable",
+                    "Deployment has minimum availability." if available >= desired
+                    else "Deployment does not have minimum availability.",
+                ),
+                condition(
+                    "Progressing", "True", "NewReplicaSetAvailable" if complete else "ReplicaSetUpdated",
+                    f'ReplicaSet "{deployment["metadata"]["name"]}-{template_hash}" '
+                    + ("has successfully progressed." if complete else "is progressing."),
+                ),
+            ],
+        }
+        if new_status != deployment.get("status"):
+            self._put(DEPLOYMENT, {**deployment, "status": new_status}, "MODIFIED")
+
+    def _reconcile_replica_set(self, replica_set: dict):
+        pods = [p for p in self._owned(replica_set, POD) if not p["metadata"].get("deletionTimestamp")]
+        difference = (replica_set["spec"].get("replicas") or 0) - len(pods)
+        for _ in range(difference):
+            self._create_pod(
+                replica_set, replica_set["spec"].get("template") or {}, f"{replica_set['metadata']['name']}-{self._suffix()}"
+            )
+        if difference < 0:
+            newest_first = sorted(pods, key=lambda p: p["metadata"]["creationTimestamp"], reverse=True)
+            for pod in newest_first[:-difference]:
+                self._delete_object(POD, pod, reconcile_owner=False)
+        self._update_workload_status(REPLICA_SET, replica_set)
+
+    def _reconcile_stateful_set(self, stateful_set: dict):
+        name = stateful_set["metadata"]["name"]
+        template = stateful_set["spec"].get("template") or {}
+        revision = f"{name}-{_template_hash(template)}"
+        replicas = stateful_set["spec"].get("replicas") or 0
+        pods = {p["metadata"]["name"]: p for p in self._owned(stateful_set, POD)}
+        for pod_name, pod in pods.items():
+            index = int(pod_name.rsplit("-", 1)[-1])
+            if index >= replicas or (pod["metadata"].get("labels") or {}).get("controller-revision-hash") != revision:
+                self._delete_object(POD, pod, reconcile_owner=False)
+        for index in range(replicas):
+            if self._get(POD, stateful_set["metadata"]["namespace"], f"{name}-{index}") is None:
+                pod_template = copy.deepcopy(template)
+                pod_template.setdefault("metadata", {}).setdefault("labels", {})["controller-revision-hash"] = revision
+                self._create_pod(stateful_set, pod_template, f"{name}-{index}")
+        self._update_workload_status(STATEFUL_SET, stateful_set)
+
+    def _daemon_set_nodes(self, daemon_set: dict) -> List[str]:
+        pod_spec = (daemon_set["spec"].get("template") or {}).get("spec") or {}
+        node_selector = pod_spec.get("nodeSelector") or {}
+        # Only required node affinity on metadata.name is simulated, the way DaemonSets pin exact nodes
+        terms = ((((pod_spec.get("affinity") or {}).get("nodeAffinity") or {})
+                  .get("requiredDuringSchedulingIgnoredDuringExecution") or {}).get("nodeSelectorTerms") or [])
+        pinned = None
+        for term in terms:
+            for requirement in term.get("matchFields") or []:
+                if requirement["key"] == "metadata.name" and requirement["operator"] == "In":
+                    pinned = (pinned or set()) | set(requirement.get("values") or [])
+        return [
+            name for (_, name), node in sorted(self._store(NODE).items())
+            if all(node["metadata"].get("labels", {}).get(k) == v for k, v in node_selector.items())
+            and (pinned is None or name in pinned)
+        ]
+
+    def _reconcile_daemon_set(self, daemon_set: dict):
+        template = daemon_set["spec"].get("template") or {}
+        template_hash = _template_hash(template)
+        nodes = set(self._daemon_set_nodes(daemon_set))
+        covered = set()
+        for pod in self._owned(daemon_set, POD):
+            node = pod["spec"].get("nodeName")
+            if node not in nodes or node in covered or (pod["metadata"].get("labels") or {}).get("pod-template-generation") != template_hash:
+                self._delete_object(POD, pod, reconcile_owner=False)
+            else:
+                covered.add(node)
+        for node in sorted(nodes - covered):
+            pod_template = copy.deepcopy(template)
+            pod_template.setdefault("metadata", {}).setdefault("labels", {})["pod-template-generation"] = template_hash
+            self._create_pod(daemon_set, pod_template, f"{daemon_set['metadata']['name']}-{self._suffix()}", node)
+        self._update_workload_status(DAEMON_SET, daemon_set)
+
+    def _reconcile_inference_service(self, inference_service: dict):
+        namespace, name = inference_service["metadata"]["namespace"], inference_service["metadata"]["name"]
+        for component in ("predictor", "transformer"):
+            spec = (inference_service.get("spec") or {}).get(component)
+            deployment_name = f"{name}-{component}"
+            current = self._get(DEPLOYMENT, namespace, deployment_name)
+            if not spec:
+                if current is not None:
+                    self._delete_object(DEPLOYMENT, current)
+                continue
+            labels = {INFERENCE_SERVICE_LABEL: name, "component": component, "app": f"isvc.{deployment_name}"}
+            pod_spec = {k: v for k, v in spec.items() if k not in ("minReplicas", "maxReplicas", "batcher")}
+            min_replicas = spec.get("minReplicas")
+            deployment_spec = {
+                "replicas": 1 if min_replicas is None else min_replicas,
+                "selector": {"matchLabels": labels},
+                "template": {"metadata": {"labels": labels}, "spec": pod_spec},
+            }
+            if current is None:
+                self._create_object(DEPLOYMENT, {
+                    "apiVersion": "apps/v1",
+                    "kind": "Deployment",
+                    "metadata": {
+                        "name": deployment_name,
+                        "namespace": namespace,
+                        "labels": labels,
+                        "ownerReferences": [_owner_reference(inference_service)],
+                    },
+                    "spec": deployment_spec,
+                })
+            elif current["spec"] != {**current["spec"], **deployment_spec}:
+                self._update(DEPLOYMENT, current, {**current, "spec": {**current["spec"], **deployment_spec}})
+        inference_service = self._get(INFERENCE_SERVICE, namespace, name)
+        status = {
+            "url": f"http://{name}.{namespace}.example.com",
+            "conditions": [{"type": "Ready", "status": "True", "lastTransitionTime": _now()}],
+            "observedGeneration": inference_service["metadata"].get("generation", 1),
+        }
+        if (inference_service.get("status") or {}).get("observedGeneration") != status["observedGeneration"]:
+            self._put(INFERENCE_SERVICE, {**inference_service, "status": status}, "MODIFIED")
+
+    def _default_job(self, job: dict):
+        spec, metadata = job["spec"], job["metadata"]
+        if spec.get("completions") is None and spec.get("parallelism") is None:
+            spec["completions"] = 1
+        spec.setdefault("parallelism", 1)
+        spec.setdefault("completionMode", "NonIndexed")
+        spec.setdefault("backoffLimit", 2147483647 if spec.get("backoffLimitPerIndex") is not None else 6)
+        labels = {
+            JOB_NAME_LABEL: metadata["name"], "job-name": metadata["name"],
+            "batch.kubernetes.io/controller-uid": metadata["uid"], "controller-uid": metadata["uid"],
+        }
+        template = spec.setdefault("template", {})
+        template.setdefault("metadata", {})["labels"] = {**(template["metadata"].get("labels") or {}), **labels}
+        spec.setdefault("selector", {"matchLabels": {"batch.kubernetes.io/controller-uid": metadata["uid"]}})
+        job["status"] = {"startTime": _now()}
+
+    def _reconcile_job(self, job: dict):
+        # Pods created here come back through _pod_changed, which must not start the same indexes again
+        uid = job["metadata"]["uid"]
+        if uid in self._reconciling:
+            return
+        self._reconciling.add(uid)
+        try:
+            self._sync_job(job)
+        finally:
+            self._reconciling.discard(uid)
+
+    def _sync_job(self, job: dict):
+        job = self._get(JOB, job["metadata"]["namespace"], job["metadata"]["name"])
+        if job is None:
+            return
+        spec, name = job["spec"], job["metadata"]["name"]
+        status = dict(job.get("status") or {})
+        if any(c["type"] in ("Complete", "Failed") for c in status.get("conditions") or []):
+            return
+        phase = lambda p: (p.get("status") or {}).get("phase")
+        pods = [p for p in self._owned(job, POD) if not p["metadata"].get("deletionTimestamp")]
+        active = [p for p in pods if phase(p) in ("Pending", "Running")]
+        succeeded_pods = [p for p in pods if phase(p) == "Succeeded"]
+        failed_pods = [p for p in pods if phase(p) == "Failed"]
+        parallelism, completions = spec["parallelism"], spec.get("completions")
+        started = 0
+        if spec["completionMode"] == "Indexed":
+            index_of = lambda p: int(p["metadata"]["annotations"][JOB_INDEX_ANNOTATION])
+            completed = {index_of(p) for p in succeeded_pods}
+            failures = Counter(index_of(p) for p in failed_pods)
+            limit = spec.get("backoffLimitPerIndex")
+            failed_indexes = {
+                i for i, count in failures.items() if limit is not None and count > limit and i not in completed
+            }
+            running = {index_of(p) for p in active}
+            pending = [i for i in range(completions) if i not in completed | failed_indexes | running]
+            for index in pending[:max(parallelism - len(active), 0)]:
+                template = copy.deepcopy(spec["template"])
+                template["metadata"].setdefault("annotations", {})[JOB_INDEX_ANNOTATION] = str(index)
+                template["metadata"]["labels"][JOB_INDEX_ANNOTATION] = str(index)
+                for container in (template.get("spec") or {}).get("containers") or []:
+                    container["env"] = (container.get("env") or []) + [
+                        {"name": "JOB_COMPLETION_INDEX", "value": str(index)}
+                    ]
+                self._create_pod(job, template, f"{name}-{index}-{self._suffix()}")
+                started += 1
+            status["completedIndexes"] = _compress_indexes(completed)
+            if limit is not None:
+                status["failedIndexes"] = _compress_indexes(failed_indexes)
+            succeeded = len(completed)
+            complete = succeeded == completions
+            max_failed = spec.get("maxFailedIndexes")
+            if len(failed_pods) > spec["backoffLimit"]:
+                failed = "BackoffLimitExceeded"
+            elif max_failed is not None and len(failed_indexes) > max_failed:
+                failed = "MaxFailedIndexesExceeded"
+            elif failed_indexes and succeeded + len(failed_indexes) == completions:
+                failed = "FailedIndexes"
+            else:
+                failed = None
+        else:
+            target = completions if completions is not None else 1
+            succeeded = len(succeeded_pods)
+            for _ in range(max(min(parallelism, target - succeeded) - len(active), 0)):
+                self._create_pod(job, spec["template"], f"{name}-{self._suffix()}")
+                started += 1
+            complete = succeeded >= target
+            failed = "BackoffLimitExceeded" if len(failed_pods) > spec["backoffLimit"] else None
+        status.update(
+            active=len(active) + started, succeeded=succeeded, failed=len(failed_pods),
+            ready=sum(1 for p in active if _is_ready(p)),
+        )
+        if complete or failed:
+            now = _now()
+            reason = failed or "Completed"
+            status["conditions"] = [{
+                "type": "Complete" if reason == "Completed" else "Failed", "status": "True", "reason": reason,
+                "lastProbeTime": now, "lastTransitionTime": now,
+            }]
+            if reason == "Completed":
+                status["completionTime"] = now
+            for pod in active:
+                self._delete_object(POD, pod, reconcile_owner=False)
+            status["active"] = 0
+        status = _compact(status)
+        if status != job.get("status"):
+            self._put(JOB, {**job, "status": status}, "MODIFIED")
+        if (complete or failed) and spec.get("ttlSecondsAfterFinished") == 0:
+            # Longer TTLs are not simulated, finished jobs stay until deleted
+            self._delete_object(JOB, self._get(JOB, job["metadata"]["namespace"], name), reconcile_owner=False)
+
+    def _reconcile_horizontal_pod_autoscaler(self, store: str, hpa: dict):
+        # No metrics in the fake, the autoscaler only reports the target's replicas clamped to its bounds
+        spec = hpa["spec"]
+        reference = spec.get("scaleTargetRef") or {}
+        target_store = {"Deployment": DEPLOYMENT, "StatefulSet": STATEFUL_SET, "ReplicaSet": REPLICA_SET}.get(
+            reference.get("kind")
+        )
+        target = self._get(target_store, hpa["metadata"]["namespace"], reference.get("name")) if target_store else None
+        current = (target.get("status") or {}).get("replicas", 0) if target else 0
+        desired = min(max(current, spec.get("minReplicas") or 1), spec.get("maxReplicas") or current)
+        status = {"currentReplicas": current, "desiredReplicas": desired}
+        if status != hpa.get("status"):
+            self._put(store, {**hpa, "status": status}, "MODIFIED")
+
+    def _sync_endpoints(self, namespace: str, changed_labels: List[dict] = None):
+        pods = None
+        for (ns, name), service in list(self._store(SERVICE).items()):
+            selector = (service.get("spec") or {}).get("selector")
+            if ns != namespace or not selector:
+                continue
+            if changed_labels is not None and not any(
+                    all(labels.get(k) == v for k, v in selector.items()) for labels in changed_labels
+            ):
+                continue
+            if pods is None:
+                pods = [p for (pod_ns, _), p in self._store(POD).items() if pod_ns == namespace]
+            members = [p for p in pods if all((p["metadata"].get("labels") or {}).get(k) == v for k, v in selector.items())]
+            address = lambda p: {
+                "ip": p["status"].get("podIP"),
+                "nodeName": p["spec"].get("nodeName"),
+                "targetRef": {"kind": "Pod", "name": p["metadata"]["name"], "namespace": ns, "uid": p["metadata"]["uid"]},
+            }
+            ready = [address(p) for p in members if _is_ready(p) and p["status"].get("podIP")]
+            not_ready = [address(p) for p in members if not _is_ready(p) and (p.get("status") or {}).get("podIP")]
+            ports = [
+                {
+                    "name": port.get("name"),
+                    "port": port["targetPort"] if isinstance(port.get("targetPort"), int) else port.get("port"),
+                    "protocol": port.get("protocol", "TCP"),
+                }
+                for port in service["spec"].get("ports") or []
+            ]
+            subset = {k: v for k, v in {"addresses": ready, "notReadyAddresses": not_ready, "ports": ports}.items() if v}
+            endpoints = {
+                "apiVersion": "v1",
+                "kind": "Endpoints",
+                "metadata": {"name": name, "namespace": ns, "labels": service["metadata"].get("labels")},
+                "subsets": [subset] if ready or not_ready else None,
+            }
+            current = self._get(ENDPOINTS, ns, name)
+            if current is None:
+                self._create_object(ENDPOINTS, endpoints)
+            elif current.get("subsets") != endpoints["subsets"]:
+                self._put(ENDPOINTS, {**current, "subsets": endpoints["subsets"]}, "MODIFIED")
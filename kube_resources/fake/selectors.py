@@ -0,0 +1,112 @@
+import re
+from typing import List, Tuple
+
+_REQUIREMENT = re.compile(
+    r"^\s*(!)?\s*([\w./-]+)\s*(?:(==|=|!=)\s*([\w.-]*)|\s+(in|notin)\s*\(([^)]*)\))?\s*$"
+)
+
+
+def _split(selector: str) -> List[str]:
+    parts, depth, current = [], 0, ""
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return [p for p in parts if p.strip()]
+
+
+def parse_label_selector(selector: str) -> List[Tuple[str, str, object]]:
+    requirements = []
+    for part in _split(selector or ""):
+        match = _REQUIREMENT.match(part)
+        if not match:
+            raise ValueError(f"Invalid label selector {selector!r}")
+        negate, key, op, value, set_op, values = match.groups()
+        if negate:
+            requirements.append((key, "!", None))
+        elif op:
+            requirements.append((key, "!=" if op == "!=" else "=", value))
+        elif set_op:
+            requirements.append((key, set_op, {v.strip() for v in values.split(",") if v.strip()}))
+        else:
+            requirements.append((key, "exists", None))
+    return requirements
+
+
+def match_labels(labels: dict, requirements) -> bool:
+    labels = labels or {}
+    for key, op, value in requirements:
+        if op == "=" and labels.get(key) != value:
+            return False
+        if op == "!=" and labels.get(key) == value:
+            return False
+        if op == "in" and labels.get(key) not in value:
+            return False
+        if op == "notin" and labels.get(key) in value:
+            return False
+        if op == "exists" and key not in labels:
+            return False
+        if op == "!" and key in labels:
+            return False
+    return True
+
+
+def match_label_selector_object(selector: dict, labels: dict) -> bool:
+    # metav1.LabelSelector in its JSON form, as used by Deployments, ReplicaSets and friends
+    if not selector:
+        return False
+    labels = labels or {}
+    for key, value in (selector.get("matchLabels") or {}).items():
+        if labels.get(key) != value:
+            return False
+    for expression in selector.get("matchExpressions") or []:
+        key, operator, values = expression["key"], expression["operator"], expression.get("values") or []
+        if operator == "In" and labels.get(key) not in values:
+            return False
+        if operator == "NotIn" and key in labels and labels[key] in values:
+            return False
+        if operator == "Exists" and key not in labels:
+            return False
+        if operator == "DoesNotExist" and key in labels:
+            return False
+    return True
+
+
+def parse_field_selector(selector: str) -> List[Tuple[str, str, str]]:
+    requirements = []
+    for part in _split(selector or ""):
+        if "!=" in part:
+            path, value = part.split("!=", 1)
+            requirements.append((path.strip(), "!=", value.strip()))
+        else:
+            path, value = part.replace("==", "=").split("=", 1)
+            requirements.append((path.strip(), "=", value.strip()))
+    return requirements
+
+
+def _get_path(obj: dict, path: str):
+    for key in path.split("."):
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def match_fields(obj: dict, requirements) -> bool:
+    for path, op, value in requirements:
+        current = _get_path(obj, path)
+        current = "" if current is None else str(current)
+        if (current == value) != (op == "="):
+            return False
+    return True
+
+
+def selector_string(match_labels_dict: dict) -> str:
+    return ",".join(f"{k}={v}" for k, v in (match_labels_dict or {}).items())
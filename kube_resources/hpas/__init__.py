@@ -3,5 +3,11 @@ from .commands import (
     get_hpa,
     create_hpa,
     update_hpa,
-    delete_hpa
+    delete_hpa,
+    delete_hpas,
+    create_hpa_v2,
+    get_hpa_v2,
+    get_hpas_v2,
+    update_hpa_v2,
+    HpaView
 )
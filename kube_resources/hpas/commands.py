@@ -1,30 +1,60 @@
 import time
+from typing import List
 
-from kubernetes.client.models import V1HorizontalPodAutoscaler
+from kubernetes.client.models import V1HorizontalPodAutoscaler, V2HorizontalPodAutoscaler
 
-from kube_resources.utils import construct_hpa
-from kube_resources import autoscaling_api as api
+from kube_resources.utils import construct_hpa, construct_hpa_v2, MetricInfo, ScalingRulesInfo, _delete_collection
+from kube_resources import autoscaling_api as api, autoscaling_v2_api as v2_api
+from kube_resources.views import ResourceView
 
 
-def _get_hpa_info(hpa: V1HorizontalPodAutoscaler):
-    return {
-        "kind": "HorizontalPodAutoscaler",
-        "namespace": hpa.metadata.namespace,
-        "name": hpa.metadata.name,
-        "max_replicas": hpa.spec.max_replicas,
-        "min_replicas": hpa.spec.min_replicas,
-        "target": {
-            "api_version": hpa.spec.scale_target_ref.api_version,
-            "kind": hpa.spec.scale_target_ref.kind,
-            "name": hpa.spec.scale_target_ref.name,
-        },
-        "target_cpu_utilization_percentage": hpa.spec.target_cpu_utilization_percentage,
-        "status": {
-            "current_cpu_utilization": hpa.status.current_cpu_utilization_percentage,
-            "current_replicas": hpa.status.current_replicas,
-            "desired_replicas": hpa.status.desired_replicas,
+class HpaView(ResourceView):
+    __slots__ = ()
+    _fields = (
+        "kind", "namespace", "name", "max_replicas", "min_replicas", "target", "target_cpu_utilization_percentage",
+        "status",
+    )
+    kind = "HorizontalPodAutoscaler"
+
+    @property
+    def namespace(self):
+        return self._obj.metadata.namespace
+
+    @property
+    def name(self):
+        return self._obj.metadata.name
+
+    @property
+    def max_replicas(self):
+        return self._obj.spec.max_replicas
+
+    @property
+    def min_replicas(self):
+        return self._obj.spec.min_replicas
+
+    @property
+    def target(self):
+        return {
+            "api_version": self._obj.spec.scale_target_ref.api_version,
+            "kind": self._obj.spec.scale_target_ref.kind,
+            "name": self._obj.spec.scale_target_ref.name,
         }
-    }
+
+    @property
+    def target_cpu_utilization_percentage(self):
+        return self._obj.spec.target_cpu_utilization_percentage
+
+    @property
+    def status(self):
+        return {
+            "current_cpu_utilization": self._obj.status.current_cpu_utilization_percentage,
+            "current_replicas": self._obj.status.current_replicas,
+            "desired_replicas": self._obj.status.desired_replicas,
+        }
+
+
+def _get_hpa_info(hpa: V1HorizontalPodAutoscaler):
+    return HpaView(hpa).to_dict()
 
 
 def create_hpa(
@@ -35,7 +65,8 @@ def create_hpa(
         target_api_version: str,
         target_kind: str,
         target_name: str,
-        namespace="default"
+        namespace="default",
+        labels: dict = None,
 ):
     hpa = construct_hpa(
         name=name,
@@ -45,20 +76,21 @@ def create_hpa(
         min_replicas=min_replicas,
         target_api_version=target_api_version,
         target_kind=target_kind,
-        target_name=target_name
+        target_name=target_name,
+        labels=labels,
     )
     response = api.create_namespaced_horizontal_pod_autoscaler(namespace=namespace, body=hpa)
     return get_hpa(response.metadata.name, namespace)
 
 
-def get_hpas(namespace="default"):
+def get_hpas(namespace="default", lazy=False):
     if namespace == "all":
         response = api.list_horizontal_pod_autoscaler_for_all_namespaces(watch=False)
     else:
         response = api.list_namespaced_horizontal_pod_autoscaler(namespace, watch=False)
     return list(
         map(
-            lambda hpa: _get_hpa_info(hpa),
+            HpaView if lazy else _get_hpa_info,
             response.items
         )
     )
@@ -90,7 +122,8 @@ def update_hpa(
         min_replicas=min_replicas or hpa.spec.min_replicas,
         target_api_version=target_api_version or hpa.spec.scale_target_ref.api_version,
         target_kind=target_kind or hpa.spec.scale_target_ref.kind,
-        target_name=target_name or hpa.spec.scale_target_ref.name
+        target_name=target_name or hpa.spec.scale_target_ref.name,
+        labels=hpa.metadata.labels,
     )
     if partial:
         response = api.patch_namespaced_horizontal_pod_autoscaler(
@@ -106,3 +139,194 @@ def update_hpa(
 def delete_hpa(name, namespace="default"):
     response = api.delete_namespaced_horizontal_pod_autoscaler(name=name, namespace=namespace)
     return {"status": response.status}
+
+
+def delete_hpas(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    return _delete_collection(
+        api.delete_collection_namespaced_horizontal_pod_autoscaler,
+        api.list_namespaced_horizontal_pod_autoscaler,
+        namespace,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+
+
+def _get_metric_source(metric):
+    # MetricSpec and MetricStatus share their layout, only the target/current field differs
+    source = getattr(metric, {
+        "Resource": "resource", "ContainerResource": "container_resource", "Pods": "pods", "Object": "object",
+        "External": "external",
+    }[metric.type])
+    if metric.type in ("Resource", "ContainerResource"):
+        name, selector = source.name, None
+    else:
+        name = source.metric.name
+        selector = source.metric.selector.match_labels if source.metric.selector else None
+    info = {"type": metric.type, "name": name, "selector": selector}
+    if metric.type == "ContainerResource":
+        info["container"] = source.container
+    if metric.type == "Object":
+        info["described_object"] = {
+            "api_version": source.described_object.api_version,
+            "kind": source.described_object.kind,
+            "name": source.described_object.name,
+        }
+    return source, info
+
+
+def _get_metric_info(metric):
+    source, info = _get_metric_source(metric)
+    target = source.target
+    info["target_type"] = target.type
+    info["target_value"] = {
+        "Utilization": target.average_utilization, "AverageValue": target.average_value, "Value": target.value
+    }.get(target.type)
+    return info
+
+
+def _get_metric_status_info(metric):
+    source, info = _get_metric_source(metric)
+    info["current"] = {
+        "average_utilization": source.current.average_utilization,
+        "average_value": source.current.average_value,
+        "value": source.current.value,
+    }
+    return info
+
+
+def _get_scaling_rules_info(rules):
+    if rules is None:
+        return None
+    return {
+        "stabilization_window_seconds": rules.stabilization_window_seconds,
+        "select_policy": rules.select_policy,
+        "policies": [
+            {"type": p.type, "value": p.value, "period_seconds": p.period_seconds} for p in rules.policies or []
+        ],
+    }
+
+
+def _get_hpa_v2_info(hpa: V2HorizontalPodAutoscaler):
+    behavior = hpa.spec.behavior
+    status = hpa.status
+    return {
+        "kind": "HorizontalPodAutoscaler",
+        "api_version": "autoscaling/v2",
+        "namespace": hpa.metadata.namespace,
+        "name": hpa.metadata.name,
+        "max_replicas": hpa.spec.max_replicas,
+        "min_replicas": hpa.spec.min_replicas,
+        "target": {
+            "api_version": hpa.spec.scale_target_ref.api_version,
+            "kind": hpa.spec.scale_target_ref.kind,
+            "name": hpa.spec.scale_target_ref.name,
+        },
+        "metrics": list(map(_get_metric_info, hpa.spec.metrics or [])),
+        "behavior": {
+            "scale_up": _get_scaling_rules_info(behavior.scale_up),
+            "scale_down": _get_scaling_rules_info(behavior.scale_down),
+        } if behavior else None,
+        "status": {
+            "current_replicas": status.current_replicas,
+            "desired_replicas": status.desired_replicas,
+            "last_scale_time": status.last_scale_time,
+            "current_metrics": list(map(_get_metric_status_info, status.current_metrics or [])),
+            "conditions": [
+                {"type": c.type, "status": c.status, "reason": c.reason, "message": c.message}
+                for c in status.conditions or []
+            ],
+        } if status else None
+    }
+
+
+def create_hpa_v2(
+        name: str,
+        metrics: List[MetricInfo],
+        min_replicas: int,
+        max_replicas: int,
+        target_api_version: str,
+        target_kind: str,
+        target_name: str,
+        scale_up: ScalingRulesInfo = None,
+        scale_down: ScalingRulesInfo = None,
+        namespace="default",
+        labels: dict = None,
+):
+    hpa = construct_hpa_v2(
+        name=name,
+        namespace=namespace,
+        metrics=metrics,
+        min_replicas=min_replicas,
+        max_replicas=max_replicas,
+        target_api_version=target_api_version,
+        target_kind=target_kind,
+        target_name=target_name,
+        scale_up=scale_up,
+        scale_down=scale_down,
+        labels=labels,
+    )
+    response = v2_api.create_namespaced_horizontal_pod_autoscaler(namespace=namespace, body=hpa)
+    return get_hpa_v2(response.metadata.name, namespace)
+
+
+def get_hpas_v2(namespace="default", label_selector: str = None):
+    if namespace == "all":
+        response = v2_api.list_horizontal_pod_autoscaler_for_all_namespaces(watch=False, label_selector=label_selector)
+    else:
+        response = v2_api.list_namespaced_horizontal_pod_autoscaler(
+            namespace, watch=False, label_selector=label_selector
+        )
+    return list(map(_get_hpa_v2_info, response.items))
+
+
+def get_hpa_v2(autoscaler_name, namespace="default"):
+    response = v2_api.read_namespaced_horizontal_pod_autoscaler(name=autoscaler_name, namespace=namespace)
+    return _get_hpa_v2_info(response)
+
+
+def update_hpa_v2(
+        name,
+        metrics: List[MetricInfo] = None,
+        min_replicas: int = None,
+        max_replicas: int = None,
+        target_api_version: str = None,
+        target_kind: str = None,
+        target_name: str = None,
+        scale_up: ScalingRulesInfo = None,
+        scale_down: ScalingRulesInfo = None,
+        partial=True,
+        namespace="default"
+):
+    current = v2_api.read_namespaced_horizontal_pod_autoscaler(name=name, namespace=namespace)
+    current_info = _get_hpa_v2_info(current)
+    current_behavior = current_info["behavior"] or {}
+
+    hpa = construct_hpa_v2(
+        name=name,
+        namespace=current.metadata.namespace,
+        metrics=metrics or current_info["metrics"],
+        min_replicas=min_replicas or current.spec.min_replicas,
+        max_replicas=max_replicas or current.spec.max_replicas,
+        target_api_version=target_api_version or current.spec.scale_target_ref.api_version,
+        target_kind=target_kind or current.spec.scale_target_ref.kind,
+        target_name=target_name or current.spec.scale_target_ref.name,
+        scale_up=scale_up or current_behavior.get("scale_up"),
+        scale_down=scale_down or current_behavior.get("scale_down"),
+        labels=current.metadata.labels,
+    )
+    if partial:
+        response = v2_api.patch_namespaced_horizontal_pod_autoscaler(name=name, namespace=namespace, body=hpa)
+    else:
+        hpa.metadata.resource_version = current.metadata.resource_version
+        response = v2_api.replace_namespaced_horizontal_pod_autoscaler(name=name, namespace=namespace, body=hpa)
+    return get_hpa_v2(response.metadata.name, namespace)
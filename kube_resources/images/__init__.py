@@ -0,0 +1,5 @@
+from .commands import (
+    get_image_nodes,
+    prepull_images,
+    delete_prepull
+)
@@ -0,0 +1,265 @@
+import math
+import time
+from typing import List, Union
+
+from kubernetes import watch
+from kubernetes.client.models import V1Node, V1Pod
+from kubernetes.client.rest import ApiException
+
+from kube_resources import apps_api, core_api
+from kube_resources.utils import construct_daemon_set, ContainerInfo, _wait_for_deletion
+
+PAUSE_IMAGE = "registry.k8s.io/pause:3.10"
+PULL_FAILURES = ("ErrImagePull", "ImagePullBackOff", "InvalidImageName", "ErrImageNeverPull", "RegistryUnavailable")
+# An init container that cannot run its no-op command has still pulled its image, but blocks the ones after it
+COMMAND_FAILURES = ("CrashLoopBackOff", "RunContainerError", "CreateContainerError")
+
+
+def _normalize_image(image: str) -> str:
+    # Nodes report fully qualified names, e.g. docker.io/library/nginx:latest for nginx
+    name, _, digest = image.partition("@")
+    first, _, rest = name.partition("/")
+    if not rest:
+        name = f"docker.io/library/{name}"
+    elif "." not in first and ":" not in first and first != "localhost":
+        name = f"docker.io/{name}"
+    if not digest and ":" not in name.rsplit("/", 1)[-1]:
+        name += ":latest"
+    return f"{name}@{digest}" if digest else name
+
+
+def _images(images: List[Union[str, ContainerInfo]]) -> List[str]:
+    result = []
+    for image in images:
+        image = image if isinstance(image, str) else image["image"]
+        if image not in result:
+            result.append(image)
+    return result
+
+
+def _node_images(node: V1Node) -> set:
+    # Only the nodeStatusMaxImages (50 by default) largest images are reported, smaller ones may look missing
+    return {_normalize_image(name) for image in node.status.images or [] for name in image.names or []}
+
+
+def _list_nodes(node_selector: dict = None, node_names: List[str] = None) -> List[V1Node]:
+    label_selector = ",".join(f"{k}={v}" for k, v in (node_selector or {}).items()) or None
+    nodes = core_api.list_node(label_selector=label_selector).items
+    if node_names is not None:
+        node_names = set(node_names)
+        nodes = [n for n in nodes if n.metadata.name in node_names]
+    return sorted(nodes, key=lambda n: n.metadata.name)
+
+
+def get_image_nodes(
+        images: List[Union[str, ContainerInfo]], node_selector: dict = None, node_names: List[str] = None
+) -> dict:
+    nodes = _list_nodes(node_selector, node_names)
+    cached = {node.metadata.name: _node_images(node) for node in nodes}
+    return {
+        image: [name for name, node_images in cached.items() if _normalize_image(image) in node_images]
+        for image in _images(images)
+    }
+
+
+def _pull_container_name(index: int) -> str:
+    return f"pull-{index}"
+
+
+def _update_node_progress(progress: dict, pod: V1Pod, images: List[str]):
+    node = pod.spec.node_name
+    if node not in progress:
+        return
+    statuses = {s.name: s for s in pod.status.init_container_statuses or []}
+    blocked = None
+    # Init containers run in order, an image already on the node still blocks the ones after it when its command fails
+    for i, image in enumerate(images):
+        entry = progress[node][image]
+        present = entry["status"] == "present"
+        status = statuses.get(_pull_container_name(i))
+        state = status.state if status else None
+        waiting = state.waiting if state else None
+        if blocked is not None:
+            if not present:
+                entry.update(status="blocked", message=blocked)
+        elif state is not None and (state.running or state.terminated):
+            if not present:
+                entry.update(status="pulled", message=None)
+            if state.terminated and state.terminated.exit_code != 0:
+                blocked = f"{_pull_container_name(i)} exited with {state.terminated.exit_code}, set command"
+        elif waiting is not None and waiting.reason in COMMAND_FAILURES:
+            if not present:
+                entry.update(status="pulled", message=None)
+            blocked = f"{_pull_container_name(i)} cannot run its command ({waiting.reason}), set command"
+        elif waiting is not None and waiting.reason in PULL_FAILURES:
+            if not present:
+                entry.update(status="failed", message=waiting.message or waiting.reason)
+            blocked = f"{_pull_container_name(i)} cannot pull {image}"
+        elif waiting is not None and waiting.reason != "PodInitializing" and not present:
+            entry.update(status="pulling", message=None)
+
+
+def _get_prepull_info(name: str, namespace: str, progress: dict, start: float, phase: str):
+    images = {}
+    for node, entries in progress.items():
+        for image, entry in entries.items():
+            images.setdefault(image, {}).setdefault(entry["status"], []).append(node)
+    return {
+        "kind": "DaemonSet",
+        "namespace": namespace,
+        "name": name,
+        "phase": phase,
+        "seconds": time.monotonic() - start,
+        "images": images,
+        "nodes": progress,
+    }
+
+
+def _done(progress: dict):
+    return all(
+        entry["status"] in ("present", "pulled", "failed", "blocked")
+        for entries in progress.values() for entry in entries.values()
+    )
+
+
+def _owned_by(pod: V1Pod, uid: str) -> bool:
+    return any(o.uid == uid for o in pod.metadata.owner_references or [])
+
+
+def _watch_prepull(name: str, namespace: str, uid: str, progress: dict, images: List[str], deadline: float):
+    # Pods of an earlier DaemonSet with the same name may still be terminating after a Background delete, their init
+    # container statuses belong to another image list, so only the pods of this run count
+    selector = f"app={name}"
+    w = watch.Watch()
+    resource_version = None
+    while not _done(progress) and time.monotonic() < deadline:
+        if resource_version is None:
+            response = core_api.list_namespaced_pod(namespace, label_selector=selector)
+            for pod in response.items:
+                if _owned_by(pod, uid):
+                    _update_node_progress(progress, pod, images)
+            resource_version = response.metadata.resource_version
+            continue
+        try:
+            for event in w.stream(
+                    core_api.list_namespaced_pod,
+                    namespace,
+                    label_selector=selector,
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, math.ceil(deadline - time.monotonic())),
+            ):
+                pod = event["object"]
+                resource_version = pod.metadata.resource_version
+                if event["type"] != "DELETED" and _owned_by(pod, uid):
+                    _update_node_progress(progress, pod, images)
+                if _done(progress):
+                    w.stop()
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            resource_version = None
+
+
+def delete_prepull(name="image-prepull", namespace="default"):
+    response = apps_api.delete_namespaced_daemon_set(name=name, namespace=namespace, propagation_policy="Background")
+    return {"status": response.status}
+
+
+def _recreate_prepull(daemon_set, namespace: str, timeout: float):
+    # A DaemonSet left by a run with wait=False or cleanup=False, or an interrupted one. Foreground deletion only
+    # finishes once its pods are gone, so none of their stale statuses end up in the new progress
+    name = daemon_set.metadata.name
+    try:
+        current = apps_api.read_namespaced_daemon_set(name=name, namespace=namespace)
+        apps_api.delete_namespaced_daemon_set(name=name, namespace=namespace, propagation_policy="Foreground")
+    except ApiException as e:
+        if e.status != 404:
+            raise
+    else:
+        remaining = _wait_for_deletion(
+            apps_api.list_namespaced_daemon_set,
+            namespace,
+            names=[name],
+            resource_version=current.metadata.resource_version,
+            timeout=timeout,
+            field_selector=f"metadata.name={name}",
+        )
+        if remaining:
+            raise RuntimeError(f"DaemonSet {namespace}/{name} of a previous pre-pull is still terminating")
+    return apps_api.create_namespaced_daemon_set(namespace=namespace, body=daemon_set)
+
+
+def prepull_images(
+        images: List[Union[str, ContainerInfo]],
+        name="image-prepull",
+        namespace="default",
+        node_selector: dict = None,
+        node_names: List[str] = None,
+        tolerations: List[dict] = ({"operator": "Exists"},),
+        command: str = "sh",
+        args: List[str] = ("-c", "true"),
+        pause_image: str = PAUSE_IMAGE,
+        skip_present=True,
+        wait=True,
+        timeout: float = 900,
+        cleanup=True,
+):
+    # images are image names or the ContainerInfo specs of a planned rollout. Every image becomes a no-op init
+    # container of a short-lived DaemonSet on the nodes that miss it; images without a shell need another command.
+    # Tolerating every taint by default also warms GPU nodes
+    start = time.monotonic()
+    images = _images(images)
+    nodes = _list_nodes(node_selector, node_names)
+    progress = {}
+    for node in nodes:
+        cached = _node_images(node) if skip_present else set()
+        progress[node.metadata.name] = {
+            image: {"status": "present" if _normalize_image(image) in cached else "pending", "message": None}
+            for image in images
+        }
+    targets = [node for node, entries in progress.items() if any(e["status"] == "pending" for e in entries.values())]
+    if not targets:
+        return _get_prepull_info(name, namespace, progress, start, "complete")
+    pulls = [image for image in images if any(progress[node][image]["status"] == "pending" for node in targets)]
+    # Tiny requests so the pods fit on full nodes, init containers count towards the pod request as well
+    resources = {"request_cpu": "10m", "request_mem": "16Mi", "limit_cpu": "100m", "limit_mem": "64Mi"}
+    daemon_set = construct_daemon_set(
+        name,
+        namespace,
+        [{"name": "pause", "image": pause_image, "image_pull_policy": "IfNotPresent", **resources}],
+        init_containers=[
+            {
+                "name": _pull_container_name(i),
+                "image": image,
+                "image_pull_policy": "IfNotPresent",
+                "command": command,
+                "args": list(args),
+                **resources,
+            }
+            for i, image in enumerate(pulls)
+        ],
+        node_selector=node_selector,
+        node_names=targets,
+        tolerations=list(tolerations) if tolerations else None,
+        termination_grace_period_seconds=0,
+    )
+    try:
+        created = apps_api.create_namespaced_daemon_set(namespace=namespace, body=daemon_set)
+    except ApiException as e:
+        if e.status != 409:
+            raise
+        created = _recreate_prepull(daemon_set, namespace, timeout)
+    if not wait:
+        return _get_prepull_info(name, namespace, progress, start, "started")
+    try:
+        _watch_prepull(name, namespace, created.metadata.uid, progress, pulls, time.monotonic() + timeout)
+    finally:
+        if cleanup:
+            delete_prepull(name, namespace)
+    if not _done(progress):
+        phase = "timeout"
+    elif any(e["status"] in ("failed", "blocked") for entries in progress.values() for e in entries.values()):
+        phase = "failed"
+    else:
+        phase = "complete"
+    return _get_prepull_info(name, namespace, progress, start, phase)
@@ -0,0 +1,9 @@
+from .commands import (
+    create_job,
+    get_jobs,
+    get_job,
+    delete_job,
+    delete_jobs,
+    watch_job,
+    wait_for_job
+)
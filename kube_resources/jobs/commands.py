@@ -0,0 +1,305 @@
+import math
+import time
+from datetime import datetime, timezone
+from typing import List, Dict
+
+from kubernetes import watch
+from kubernetes.client.models import V1Job, V1Pod
+from kubernetes.client.rest import ApiException
+
+from kube_resources import batch_api as api, core_api
+from kube_resources.utils import construct_job, ContainerInfo, _delete_collection
+
+JOB_NAME_LABEL = "batch.kubernetes.io/job-name"
+INDEX_ANNOTATION = "batch.kubernetes.io/job-completion-index"
+
+
+def _parse_indexes(indexes: str) -> set:
+    # Completed and failed indexes come compressed as "0-3,7,9-10"
+    result = set()
+    for part in (indexes or "").split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            result.update(range(int(first), int(last) + 1))
+        elif part:
+            result.add(int(part))
+    return result
+
+
+def _get_job_info(job: V1Job):
+    status = job.status
+    return {
+        "kind": "Job",
+        "namespace": job.metadata.namespace,
+        "name": job.metadata.name,
+        "labels": job.metadata.labels,
+        "completions": job.spec.completions,
+        "parallelism": job.spec.parallelism,
+        "completion_mode": job.spec.completion_mode,
+        "backoff_limit": job.spec.backoff_limit,
+        "backoff_limit_per_index": job.spec.backoff_limit_per_index,
+        "ttl_seconds_after_finished": job.spec.ttl_seconds_after_finished,
+        "status": {
+            "active": status.active or 0,
+            "ready": status.ready or 0,
+            "succeeded": status.succeeded or 0,
+            "failed": status.failed or 0,
+            "completed_indexes": sorted(_parse_indexes(status.completed_indexes)),
+            "failed_indexes": sorted(_parse_indexes(status.failed_indexes)),
+            "start_time": status.start_time,
+            "completion_time": status.completion_time,
+            "conditions": [
+                {"type": c.type, "status": c.status, "reason": c.reason, "message": c.message}
+                for c in status.conditions or []
+            ],
+        } if status else None
+    }
+
+
+def create_job(
+        name: str,
+        containers: List[ContainerInfo],
+        completions: int = None,
+        parallelism: int = None,
+        completion_mode: str = None,
+        backoff_limit: int = None,
+        backoff_limit_per_index: int = None,
+        max_failed_indexes: int = None,
+        ttl_seconds_after_finished: int = None,
+        active_deadline_seconds: int = None,
+        namespace="default",
+        labels: dict = None,
+        annotations: dict = None,
+        volumes: List[dict] = None,
+        restart_policy: str = "Never",
+        scheduler_name: str = None,
+        runtime_class_name: str = None,
+):
+    job = construct_job(
+        name,
+        namespace,
+        containers,
+        completions=completions,
+        parallelism=parallelism,
+        completion_mode=completion_mode,
+        backoff_limit=backoff_limit,
+        backoff_limit_per_index=backoff_limit_per_index,
+        max_failed_indexes=max_failed_indexes,
+        ttl_seconds_after_finished=ttl_seconds_after_finished,
+        active_deadline_seconds=active_deadline_seconds,
+        labels=labels,
+        annotations=annotations,
+        volumes=volumes,
+        restart_policy=restart_policy,
+        scheduler_name=scheduler_name,
+        runtime_class_name=runtime_class_name,
+    )
+    response = api.create_namespaced_job(namespace=namespace, body=job)
+    return _get_job_info(response)
+
+
+def get_jobs(namespace="default", label_selector: str = None):
+    if namespace == "all":
+        response = api.list_job_for_all_namespaces(label_selector=label_selector)
+    else:
+        response = api.list_namespaced_job(namespace, label_selector=label_selector)
+    return list(map(_get_job_info, response.items))
+
+
+def get_job(name: str, namespace="default"):
+    response = api.read_namespaced_job(name=name, namespace=namespace)
+    return _get_job_info(response)
+
+
+def delete_job(name: str, namespace="default", propagation_policy="Background"):
+    # The API orphans the pods of a deleted job unless told otherwise
+    response = api.delete_namespaced_job(name=name, namespace=namespace, propagation_policy=propagation_policy)
+    return {"status": response.status}
+
+
+def delete_jobs(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = "Background",
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    return _delete_collection(
+        api.delete_collection_namespaced_job,
+        api.list_namespaced_job,
+        namespace,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+
+
+def _pod_seconds(pod: V1Pod):
+    terminated = [
+        c.state.terminated for c in pod.status.container_statuses or [] if c.state and c.state.terminated
+    ]
+    if not terminated or pod.status.start_time is None:
+        return None
+    return (max(t.finished_at for t in terminated) - pod.status.start_time).total_seconds()
+
+
+def _get_index_progress(job: V1Job, pods: Dict[str, V1Pod]):
+    completed = _parse_indexes(job.status.completed_indexes)
+    failed = _parse_indexes(job.status.failed_indexes)
+    indexes = {i: {"status": "pending", "attempts": 0, "pod": None, "seconds": None} for i in range(job.spec.completions)}
+    for pod in sorted(pods.values(), key=lambda p: p.metadata.creation_timestamp):
+        index = (pod.metadata.annotations or {}).get(INDEX_ANNOTATION)
+        if index is None or int(index) not in indexes:
+            continue
+        entry = indexes[int(index)]
+        entry["attempts"] += 1
+        if entry["status"] == "succeeded":
+            continue
+        entry["pod"] = pod.metadata.name
+        phase = pod.status.phase
+        if phase == "Succeeded":
+            entry.update(status="succeeded", seconds=_pod_seconds(pod))
+        elif phase == "Failed":
+            entry["status"] = "failed" if int(index) in failed else "retrying"
+        else:
+            entry["status"] = "running" if phase == "Running" else "pending"
+    # Pods of finished indexes may already be gone, the job status still has them
+    for index in completed:
+        if index in indexes:
+            indexes[index]["status"] = "succeeded"
+    for index in failed:
+        if index in indexes:
+            indexes[index]["status"] = "failed"
+    return indexes
+
+
+def _get_job_progress(job: V1Job, pods: Dict[str, V1Pod]):
+    status = job.status
+    conditions = {c.type: c for c in status.conditions or [] if c.status == "True"}
+    if "Complete" in conditions:
+        phase, reason, message = "complete", None, None
+    elif "Failed" in conditions:
+        phase, reason, message = "failed", conditions["Failed"].reason, conditions["Failed"].message
+    else:
+        phase, reason, message = "running", None, None
+    live = [p for p in pods.values() if p.metadata.deletion_timestamp is None]
+    indexes = _get_index_progress(job, pods) if job.spec.completion_mode == "Indexed" else None
+    if indexes is not None:
+        succeeded = sum(1 for entry in indexes.values() if entry["status"] == "succeeded")
+        failed_indexes = sorted(i for i, entry in indexes.items() if entry["status"] == "failed")
+    else:
+        succeeded = max(status.succeeded or 0, sum(1 for p in live if p.status.phase == "Succeeded"))
+        failed_indexes = None
+    elapsed = (datetime.now(timezone.utc) - status.start_time).total_seconds() if status.start_time else 0.0
+    throughput = succeeded / elapsed if elapsed > 0 else None
+    remaining = (job.spec.completions - succeeded) if job.spec.completions is not None else None
+    return {
+        "kind": "Job",
+        "namespace": job.metadata.namespace,
+        "name": job.metadata.name,
+        "phase": phase,
+        "reason": reason,
+        "message": message,
+        "completions": job.spec.completions,
+        "succeeded": succeeded,
+        "active": sum(1 for p in live if p.status.phase in ("Pending", "Running")),
+        "failed_pods": sum(1 for p in pods.values() if p.status.phase == "Failed"),
+        "failed_indexes": failed_indexes,
+        "indexes": indexes,
+        "elapsed": elapsed,
+        "throughput": throughput,
+        "eta": remaining / throughput if throughput and remaining is not None else None,
+    }
+
+
+def _get_deleted_job_progress(job: V1Job, pods: Dict[str, V1Pod]):
+    # The job is gone, e.g. removed by ttlSecondsAfterFinished right after finishing, judge by what was seen last
+    progress = _get_job_progress(job, pods)
+    if progress["phase"] != "running":
+        return progress
+    completions = progress["completions"]
+    if progress["succeeded"] and (completions is None or progress["succeeded"] >= completions) and not progress["active"]:
+        progress["phase"] = "complete"
+    elif progress["failed_pods"]:
+        progress.update(phase="failed", reason="Deleted", message="job was deleted after pods failed")
+    else:
+        progress.update(phase="deleted", reason="Deleted", message="job was deleted before it finished")
+    return progress
+
+
+def watch_job(name: str, namespace="default", timeout: float = None, poll_seconds: int = 10):
+    # One pod watch for the whole job; the job itself is re-read only when its pods suggest it may have finished
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    selector = f"{JOB_NAME_LABEL}={name}"
+    job = api.read_namespaced_job(name=name, namespace=namespace)
+    pods, resource_version = {}, None
+    last = None
+    w = watch.Watch()
+    volatile = ("elapsed", "throughput", "eta")
+
+    def changed(progress):
+        nonlocal last
+        current = {k: v for k, v in progress.items() if k not in volatile}
+        if current == last:
+            return False
+        last = current
+        return True
+
+    while True:
+        if resource_version is None:
+            response = core_api.list_namespaced_pod(namespace, label_selector=selector)
+            pods = {p.metadata.name: p for p in response.items}
+            resource_version = response.metadata.resource_version
+        progress = _get_job_progress(job, pods)
+        if progress["phase"] == "running" and deadline is not None and time.monotonic() >= deadline:
+            progress.update(phase="timeout", reason="Timeout", message=f"job did not finish within {timeout}s")
+        if changed(progress) or progress["phase"] != "running":
+            yield progress
+        if progress["phase"] != "running":
+            return
+        watch_timeout = poll_seconds
+        if deadline is not None:
+            watch_timeout = max(1, min(poll_seconds, math.ceil(deadline - time.monotonic())))
+        try:
+            for event in w.stream(
+                    core_api.list_namespaced_pod,
+                    namespace,
+                    label_selector=selector,
+                    resource_version=resource_version,
+                    timeout_seconds=watch_timeout,
+            ):
+                pod = event["object"]
+                resource_version = pod.metadata.resource_version
+                if event["type"] == "DELETED":
+                    pods.pop(pod.metadata.name, None)
+                else:
+                    pods[pod.metadata.name] = pod
+                progress = _get_job_progress(job, pods)
+                finishing = pod.status.phase == "Failed" or (
+                    job.spec.completions is not None and progress["succeeded"] >= job.spec.completions
+                )
+                if finishing:
+                    w.stop()
+                elif changed(progress):
+                    yield progress
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            resource_version = None
+        try:
+            job = api.read_namespaced_job(name=name, namespace=namespace)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            yield _get_deleted_job_progress(job, pods)
+            return
+
+
+def wait_for_job(name: str, namespace="default", timeout: float = None, poll_seconds: int = 10):
+    progress = None
+    for progress in watch_job(name, namespace, timeout, poll_seconds):
+        pass
+    return progress
@@ -1 +1,7 @@
-from .commands import get_inference_service, create_inference_service, delete_inference_service
+from .commands import (
+    get_inference_service,
+    create_inference_service,
+    delete_inference_service,
+    delete_inference_services,
+    scale_inference_service
+)
@@ -1,10 +1,22 @@
 import time
 from typing import List
 from kserve import KServeClient
+from kserve.constants import constants
 
-from kube_resources.utils import construct_inference_service, ContainerInfo
+from kube_resources import apps_api, autoscaling_v2_api, core_api, custom_api, track_api, fake_cluster
+from kube_resources.utils import construct_inference_service, ContainerInfo, _delete_collection
 
-client = KServeClient()
+if fake_cluster is not None:
+    from kube_resources.fake import FakeKServeClient
+    client = FakeKServeClient(fake_cluster)
+else:
+    client = KServeClient()
+    # KServeClient builds plain ApiClients, share the package ones so set_compression() and pool resizing reach it
+    client.core_api, client.app_api = core_api, apps_api
+    client.api_instance, client.hpa_v2_api = custom_api, autoscaling_v2_api
+for _api in vars(client).values():
+    if hasattr(_api, "api_client"):
+        track_api(_api)
 
 
 def _get_inference_service_info(s: dict):
@@ -109,6 +121,47 @@ def patch_inference_service(
     return get_inference_service(response["metadata"]["name"], namespace)
 
 
+def scale_inference_service(inference_service_name: str, replicas: int, namespace="default", component="predictor"):
+    response = custom_api.patch_namespaced_custom_object(
+        constants.KSERVE_GROUP,
+        constants.KSERVE_V1BETA1_VERSION,
+        namespace,
+        constants.KSERVE_PLURAL_INFERENCESERVICE,
+        inference_service_name,
+        {"spec": {component: {"minReplicas": replicas, "maxReplicas": replicas}}},
+    )
+    spec = response["spec"][component]
+    return {
+        "kind": "InferenceService",
+        "namespace": response["metadata"]["namespace"],
+        "name": response["metadata"]["name"],
+        component: {"min_replicas": spec.get("minReplicas"), "max_replicas": spec.get("maxReplicas")}
+    }
+
+
 def delete_inference_service(inference_service_name: str, namespace="default"):
     response = client.delete(inference_service_name, namespace=namespace)
     return response["metadata"]["name"]
+
+
+def delete_inference_services(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    return _delete_collection(
+        custom_api.delete_collection_namespaced_custom_object,
+        custom_api.list_namespaced_custom_object,
+        constants.KSERVE_GROUP,
+        constants.KSERVE_V1BETA1_VERSION,
+        namespace,
+        constants.KSERVE_PLURAL_INFERENCESERVICE,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
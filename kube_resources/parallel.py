@@ -0,0 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List
+
+from kubernetes.client.api_client import ApiClient
+
+_serializer = None
+
+
+def _construct_and_serialize(task):
+    global _serializer
+    construct, kwargs = task
+    if _serializer is None:
+        _serializer = ApiClient()
+    return _serializer.sanitize_for_serialization(construct(**kwargs))
+
+
+def thread_map(func: Callable, items: Iterable, max_workers: int = None) -> List:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
+
+
+def process_map(func: Callable, items: Iterable, max_workers: int = None, chunksize=1, mp_context=None) -> List:
+    # func must be picklable, i.e. a module level function. Forked workers get fresh API connection pools
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def construct_many(
+        construct: Callable,
+        kwargs_list: List[dict],
+        max_workers: int = None,
+        chunksize=64,
+        mp_context=None,
+) -> List[dict]:
+    return process_map(
+        _construct_and_serialize,
+        [(construct, kwargs) for kwargs in kwargs_list],
+        max_workers=max_workers,
+        chunksize=chunksize,
+        mp_context=mp_context,
+    )
@@ -3,5 +3,12 @@ from .commands import (
     get_pod,
     create_pod,
     update_pod,
-    delete_pod
+    delete_pod,
+    delete_pods,
+    resize_pod,
+    resize_pods,
+    PodView
 )
+from .pool import WarmPool
+from .transfer import copy_to_pod, copy_from_pod, copy_to_pods
+from .startup import profile_pods
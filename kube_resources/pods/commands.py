@@ -1,69 +1,110 @@
+import math
 import time
-from typing import List, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
 from kubernetes.client.models import V1Pod, V1ContainerStatus
+from kubernetes.utils import parse_quantity
 from kube_resources import core_api as api
-from kube_resources.utils import construct_pod, ContainerInfo
+from kube_resources.views import ResourceView
+from kube_resources.utils import construct_pod, ContainerInfo, _delete_collection, _list_names
 
 
-def _get_pod_info(p: V1Pod):
-    container_statuses: Callable[[V1Pod], List[V1ContainerStatus]] = lambda pod: pod.status.container_statuses or []
-    
+def _get_state_info(state):
     return {
-        "kind": "Pod",
-        "pod_ip": p.status.pod_ip,
-        "namespace": p.metadata.namespace,
-        "name": p.metadata.name,
-        "node": p.spec.node_name,
-        "containers": [
-            container.to_dict()
-            for container in p.spec.containers
-        ],
-        "labels": p.metadata.labels,
-        "phase": p.status.phase,
-        "annotations": p.metadata.annotations,
-        "conditions": list(map(
-            lambda x: {"reason": x.reason, "type": x.type, "message": x.message}, p.status.conditions
-        )) if p.status.conditions else [],
-        "terminating": p.metadata.deletion_timestamp is not None,
-        "restart_policy": p.spec.restart_policy,
-        "container_statuses": list(map(
+        "running": {
+            "started_at": state.running.started_at.isoformat()
+        } if state.running else None,
+        "terminated": {
+            "finished_at": state.terminated.finished_at.isoformat(),
+            "exit_code": state.terminated.exit_code,
+            "message": state.terminated.message,
+            "reason": state.terminated.reason,
+        } if state.terminated else None,
+        "waiting": {
+            "message": state.waiting.message,
+            "reason": state.waiting.reason
+        } if state.waiting else None,
+    }
+
+
+class PodView(ResourceView):
+    __slots__ = ()
+    _fields = (
+        "kind", "pod_ip", "namespace", "name", "node", "containers", "labels", "phase", "annotations", "conditions",
+        "terminating", "restart_policy", "container_statuses",
+    )
+    kind = "Pod"
+
+    @property
+    def pod_ip(self):
+        return self._obj.status.pod_ip
+
+    @property
+    def namespace(self):
+        return self._obj.metadata.namespace
+
+    @property
+    def name(self):
+        return self._obj.metadata.name
+
+    @property
+    def node(self):
+        return self._obj.spec.node_name
+
+    @property
+    def containers(self):
+        return [container.to_dict() for container in self._obj.spec.containers]
+
+    @property
+    def labels(self):
+        return self._obj.metadata.labels
+
+    @property
+    def phase(self):
+        return self._obj.status.phase
+
+    @property
+    def annotations(self):
+        return self._obj.metadata.annotations
+
+    @property
+    def conditions(self):
+        return list(map(
+            lambda x: {
+                "reason": x.reason,
+                "type": x.type,
+                "message": x.message,
+                "status": x.status,
+                "last_transition_time": x.last_transition_time.isoformat() if x.last_transition_time else None,
+            }, self._obj.status.conditions
+        )) if self._obj.status.conditions else []
+
+    @property
+    def terminating(self):
+        return self._obj.metadata.deletion_timestamp is not None
+
+    @property
+    def restart_policy(self):
+        return self._obj.spec.restart_policy
+
+    @property
+    def container_statuses(self):
+        container_statuses: List[V1ContainerStatus] = self._obj.status.container_statuses or []
+        return list(map(
             lambda c: {
                 "container_name": c.name,
                 "image": c.image,
                 "started": c.started,
-                "state": {
-                    "running": {
-                        "started_at": c.state.running.started_at.isoformat()
-                    } if c.state.running else None,
-                    "terminated": {
-                        "finished_at": c.state.terminated.finished_at.isoformat(),
-                        "exit_code": c.state.terminated.exit_code,
-                        "message": c.state.terminated.message,
-                        "reason": c.state.terminated.reason,
-                    } if c.state.terminated else None,
-                    "waiting": {
-                        "message": c.state.waiting.message,
-                        "reason": c.state.waiting.reason
-                    } if c.state.waiting else None,
-                },
-                "last_state": {
-                    "running": {
-                        "started_at": c.last_state.running.started_at.isoformat()
-                    } if c.last_state.running else None,
-                    "terminated": {
-                        "finished_at": c.last_state.terminated.finished_at.isoformat(),
-                        "exit_code": c.last_state.terminated.exit_code,
-                        "message": c.last_state.terminated.message,
-                        "reason": c.last_state.terminated.reason,
-                    } if c.last_state.terminated else None,
-                    "waiting": {
-                        "message": c.last_state.waiting.message,
-                        "reason": c.last_state.waiting.reason
-                    } if c.last_state.waiting else None,
-                }
-            }, container_statuses(p)
-        )),
-    }
+                "state": _get_state_info(c.state),
+                "last_state": _get_state_info(c.last_state),
+            }, container_statuses
+        ))
+
+
+def _get_pod_info(p: V1Pod):
+    return PodView(p).to_dict()
 
 
 def create_pod(
@@ -94,14 +135,14 @@ def create_pod(
     return get_pod(response.metadata.name, namespace)
 
 
-def get_pods(namespace="default"):
+def get_pods(namespace="default", lazy=False):
     if namespace == "all":
         pods = api.list_pod_for_all_namespaces(watch=False)
     else:
         pods = api.list_namespaced_pod(namespace, watch=False)
     return {
         "kind": pods.kind,
-        "pods": list(map(lambda p: _get_pod_info(p), pods.items))
+        "pods": list(map(PodView if lazy else _get_pod_info, pods.items))
     }
 
 
@@ -144,3 +185,161 @@ def update_pod(
 def delete_pod(pod_name, namespace="default"):
     response = api.delete_namespaced_pod(name=pod_name, namespace=namespace)
     return {"status": response.status}
+
+
+def delete_pods(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    return _delete_collection(
+        api.delete_collection_namespaced_pod,
+        api.list_namespaced_pod,
+        namespace,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+
+
+_RESIZE_RESOURCES = {
+    "request_cpu": ("requests", "cpu"),
+    "request_mem": ("requests", "memory"),
+    "limit_cpu": ("limits", "cpu"),
+    "limit_mem": ("limits", "memory"),
+}
+_RESIZE_DONE = ("resized", "infeasible", "deferred", "error")
+
+
+def _construct_resize_patch(resources: Dict[str, dict]) -> dict:
+    containers = []
+    for container_name, container_resources in resources.items():
+        requirements = {}
+        for key, value in container_resources.items():
+            if key not in _RESIZE_RESOURCES:
+                raise ValueError(f"Cannot resize {key}, expected one of {', '.join(_RESIZE_RESOURCES)}")
+            group, resource = _RESIZE_RESOURCES[key]
+            requirements.setdefault(group, {})[resource] = value
+        containers.append({"name": container_name, "resources": requirements})
+    return {"spec": {"containers": containers}}
+
+
+def _get_resize_state(pod: V1Pod, patch: dict):
+    status = pod.status
+    conditions = {c.type: c for c in status.conditions or [] if c.status == "True"}
+    if "PodResizePending" in conditions:
+        pending = conditions["PodResizePending"]
+        return (pending.reason or "").lower() if pending.reason in ("Infeasible", "Deferred") else "pending", \
+            pending.message
+    # Clusters before 1.33 only report the deprecated status.resize field
+    if status.resize in ("Infeasible", "Deferred"):
+        return status.resize.lower(), None
+    if "PodResizeInProgress" in conditions:
+        in_progress = conditions["PodResizeInProgress"]
+        return "error" if in_progress.reason == "Error" else "in_progress", in_progress.message
+    actual = {c.name: c.resources for c in status.container_statuses or []}
+    for container in patch["spec"]["containers"]:
+        current = actual.get(container["name"])
+        if current is None:
+            return "in_progress", None
+        for group, values in container["resources"].items():
+            current_values = getattr(current, group) or {}
+            for resource, value in values.items():
+                if resource not in current_values or \
+                        parse_quantity(current_values[resource]) != parse_quantity(value):
+                    return "in_progress", None
+    return "resized", None
+
+
+def _get_resize_info(name: str, namespace: str, state: str, message: str = None):
+    return {"kind": "Pod", "namespace": namespace, "name": name, "status": state, "message": message}
+
+
+def resize_pods(
+        resources: Dict[str, dict],
+        names: List[str] = None,
+        label_selector: str = None,
+        namespace="default",
+        wait=True,
+        timeout: float = 60,
+        max_workers: int = None,
+):
+    assert names or label_selector, "names or label_selector is required"
+    if names is None:
+        names, _ = _list_names(api.list_namespaced_pod, namespace, label_selector=label_selector)
+    names = sorted(names)
+    patch = _construct_resize_patch(resources)
+    results = {}
+
+    def resize(name):
+        try:
+            return api.patch_namespaced_pod_resize(name=name, namespace=namespace, body=patch)
+        except ApiException as e:
+            results[name] = _get_resize_info(name, namespace, "error", e.reason)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pods = [pod for pod in executor.map(resize, names) if pod is not None]
+    for pod in pods:
+        state, message = _get_resize_state(pod, patch)
+        if not wait or state in _RESIZE_DONE:
+            results[pod.metadata.name] = _get_resize_info(pod.metadata.name, namespace, state, message)
+    if len(results) < len(names):
+        _wait_for_resize(results, names, patch, namespace, label_selector, timeout)
+    return [results[name] for name in names]
+
+
+def _wait_for_resize(results: dict, names: List[str], patch: dict, namespace: str, label_selector: str, timeout: float):
+    pending = set(names) - set(results)
+    selectors = {"label_selector": label_selector}
+    if label_selector is None and len(pending) == 1:
+        selectors = {"field_selector": f"metadata.name={next(iter(pending))}"}
+    deadline = time.monotonic() + timeout
+    w = watch.Watch()
+
+    def observe(pod: V1Pod):
+        if pod.metadata.name in pending:
+            state, message = _get_resize_state(pod, patch)
+            if state in _RESIZE_DONE:
+                pending.discard(pod.metadata.name)
+                results[pod.metadata.name] = _get_resize_info(pod.metadata.name, namespace, state, message)
+
+    resource_version = None
+    while pending and time.monotonic() < deadline:
+        if resource_version is None:
+            response = api.list_namespaced_pod(namespace, **selectors)
+            resource_version = response.metadata.resource_version
+            for pod in response.items:
+                observe(pod)
+            continue
+        try:
+            for event in w.stream(
+                    api.list_namespaced_pod,
+                    namespace,
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, math.ceil(deadline - time.monotonic())),
+                    **selectors,
+            ):
+                pod = event["object"]
+                resource_version = pod.metadata.resource_version
+                if event["type"] == "DELETED" and pod.metadata.name in pending:
+                    pending.discard(pod.metadata.name)
+                    results[pod.metadata.name] = _get_resize_info(pod.metadata.name, namespace, "error", "pod deleted")
+                else:
+                    observe(pod)
+                if not pending:
+                    w.stop()
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            resource_version = None
+    for name in pending:
+        results[name] = _get_resize_info(name, namespace, "timeout", f"resize did not finish within {timeout}s")
+
+
+def resize_pod(name: str, resources: Dict[str, dict], namespace="default", wait=True, timeout: float = 60):
+    return resize_pods(resources, names=[name], namespace=namespace, wait=wait, timeout=timeout)[0]
@@ -0,0 +1,285 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+from kubernetes import watch
+from kubernetes.client.models import V1Pod
+from kubernetes.client.rest import ApiException
+
+from kube_resources import core_api as api
+from kube_resources.utils import construct_pod, ContainerInfo, _percentile
+from kube_resources.pods.commands import _get_pod_info, delete_pods
+
+POOL_LABEL = "kube-resources/warm-pool"
+STATE_LABEL = "kube-resources/warm-pool-state"
+
+
+def _is_ready(pod: V1Pod) -> bool:
+    return pod.metadata.deletion_timestamp is None and pod.status.phase == "Running" and any(
+        c.type == "Ready" and c.status == "True" for c in pod.status.conditions or []
+    )
+
+
+class WarmPool:
+    def __init__(
+            self,
+            name: str,
+            containers: List[ContainerInfo],
+            size: int,
+            namespace="default",
+            annotations: dict = None,
+            volumes: List[dict] = None,
+            restart_policy: str = None,
+            scheduler_name: str = None,
+            runtime_class_name: str = None,
+            idle_timeout: float = None,  # standby pods older than this are replaced, never when None
+            sync_interval: int = 10,
+            max_workers: int = 8,
+    ):
+        self.name = name
+        self.namespace = namespace
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.sync_interval = sync_interval
+        self._pod_kwargs = {
+            "containers": containers,
+            "annotations": annotations,
+            "volumes": volumes,
+            "restart_policy": restart_policy,
+            "scheduler_name": scheduler_name,
+            "runtime_class_name": runtime_class_name,
+        }
+        self._selector = f"{POOL_LABEL}={name},{STATE_LABEL}=standby"
+        self._pods: Dict[str, V1Pod] = {}
+        self._creating = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._max_workers = max_workers
+        self._executor = None
+        self._watch = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._latencies = deque(maxlen=10000)
+        self._stats = {
+            "claims": 0, "hits": 0, "misses": 0, "created": 0, "collected": 0, "conflicts": 0, "errors": 0
+        }
+        self._error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=f"warm-pool-{self.name}")
+        self._thread = threading.Thread(target=self._run, name=f"warm-pool-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, delete=True, timeout: float = None):
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if delete:
+            delete_pods(self._selector, self.namespace)
+
+    def resize(self, size: int):
+        with self._lock:
+            self.size = size
+        self._reconcile()
+
+    def _run(self):
+        resource_version = None
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    response = api.list_namespaced_pod(self.namespace, label_selector=self._selector)
+                    with self._available:
+                        self._pods = {p.metadata.name: p for p in response.items}
+                        self._available.notify_all()
+                    resource_version = response.metadata.resource_version
+                    self._reconcile()
+                self._watch = watch.Watch()
+                for event in self._watch.stream(
+                        api.list_namespaced_pod,
+                        self.namespace,
+                        label_selector=self._selector,
+                        resource_version=resource_version,
+                        timeout_seconds=self.sync_interval,
+                ):
+                    pod = event["object"]
+                    resource_version = pod.metadata.resource_version
+                    with self._available:
+                        # A claimed pod leaves the selector, depending on the server it shows up as MODIFIED or DELETED
+                        if event["type"] == "DELETED" or (pod.metadata.labels or {}).get(STATE_LABEL) != "standby":
+                            self._pods.pop(pod.metadata.name, None)
+                        else:
+                            self._pods[pod.metadata.name] = pod
+                        self._available.notify_all()
+                    self._reconcile()
+                self._reconcile()
+            except ApiException as e:
+                if e.status != 410:
+                    self._record_error(e)
+                    self._stopped.wait(1)
+                resource_version = None
+            except Exception as e:
+                # Connection and protocol errors must not end the refill thread, back off and resync instead
+                self._record_error(e)
+                self._stopped.wait(1)
+                resource_version = None
+
+    def _record_error(self, error: Exception):
+        with self._lock:
+            self._stats["errors"] += 1
+            self._error = error
+
+    def _check(self, future):
+        # Failures of background creates and deletes would otherwise stay inside their futures
+        if not future.cancelled() and future.exception() is not None:
+            self._record_error(future.exception())
+
+    def _reconcile(self):
+        # Before start() and after stop() there is no executor, resize() then only records the target size
+        executor = self._executor
+        if self._stopped.is_set() or executor is None:
+            return
+        now = time.time()
+        with self._lock:
+            live = [p for p in self._pods.values() if p.metadata.deletion_timestamp is None]
+            collect = [
+                p for p in live
+                if p.status.phase in ("Failed", "Succeeded") or (
+                    self.idle_timeout is not None and p.metadata.creation_timestamp is not None
+                    and now - p.metadata.creation_timestamp.timestamp() > self.idle_timeout
+                )
+            ]
+            collected = {p.metadata.name for p in collect}
+            healthy = [p for p in live if p.metadata.name not in collected]
+            # Shrink to the target size by dropping the newest pods, older ones have had longer to warm up
+            healthy.sort(
+                key=lambda p: p.metadata.creation_timestamp.timestamp() if p.metadata.creation_timestamp else now
+            )
+            collect += healthy[self.size:]
+            missing = self.size - min(len(healthy), self.size) - self._creating
+            self._creating += max(missing, 0)
+            for pod in collect:
+                self._pods.pop(pod.metadata.name, None)
+        for pod in collect:
+            executor.submit(self._delete, pod.metadata.name).add_done_callback(self._check)
+        for _ in range(max(missing, 0)):
+            executor.submit(self._create).add_done_callback(self._check)
+
+    def _create(self):
+        pod = construct_pod(
+            f"{self.name}-{uuid.uuid4().hex[:8]}",
+            self.namespace,
+            labels={POOL_LABEL: self.name, STATE_LABEL: "standby"},
+            **self._pod_kwargs,
+        )
+        try:
+            response = api.create_namespaced_pod(namespace=self.namespace, body=pod)
+            with self._lock:
+                self._stats["created"] += 1
+                # Count the pod right away so the next reconcile does not create it again before the watch sees it
+                self._pods.setdefault(response.metadata.name, response)
+        except ApiException as e:
+            self._record_error(e)
+        finally:
+            with self._lock:
+                self._creating -= 1
+
+    def _delete(self, name: str):
+        try:
+            api.delete_namespaced_pod(name=name, namespace=self.namespace)
+            with self._lock:
+                self._stats["collected"] += 1
+        except ApiException as e:
+            if e.status != 404:
+                raise
+
+    def _take(self, wait: float):
+        deadline = time.monotonic() + wait
+        with self._available:
+            while True:
+                ready = [p for p in self._pods.values() if _is_ready(p)]
+                if ready:
+                    pod = min(ready, key=lambda p: p.metadata.creation_timestamp.timestamp())
+                    return self._pods.pop(pod.metadata.name)
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return None
+                self._available.wait(left)
+
+    def claim(self, labels: dict, annotations: dict = None, wait: float = 0, cold_start=True):
+        start = time.perf_counter()
+        pod = self._take(wait)
+        while pod is not None:
+            # The resourceVersion precondition makes concurrent claims of the same pod fail with 409
+            body = {
+                "metadata": {
+                    "resourceVersion": pod.metadata.resource_version,
+                    "labels": {**labels, STATE_LABEL: "claimed"},
+                }
+            }
+            # A null in a merge patch would drop the annotations the pod already has
+            if annotations is not None:
+                body["metadata"]["annotations"] = annotations
+            try:
+                response = api.patch_namespaced_pod(name=pod.metadata.name, namespace=self.namespace, body=body)
+                self._record(start, hit=True)
+                self._reconcile()
+                return _get_pod_info(response)
+            except ApiException as e:
+                if e.status not in (404, 409):
+                    raise
+                with self._lock:
+                    self._stats["conflicts"] += 1
+            pod = self._take(0)
+        if not cold_start:
+            return None
+        pod = construct_pod(
+            f"{self.name}-{uuid.uuid4().hex[:8]}",
+            self.namespace,
+            labels={**labels, POOL_LABEL: self.name, STATE_LABEL: "claimed"},
+            **{**self._pod_kwargs, "annotations": {**(self._pod_kwargs["annotations"] or {}), **(annotations or {})}},
+        )
+        response = api.create_namespaced_pod(namespace=self.namespace, body=pod)
+        self._record(start, hit=False)
+        return _get_pod_info(response)
+
+    def _record(self, start: float, hit: bool):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+            self._stats["claims"] += 1
+            self._stats["hits" if hit else "misses"] += 1
+
+    def stats(self):
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                **self._stats,
+                "size": self.size,
+                "standby": sum(1 for p in self._pods.values() if _is_ready(p)),
+                "starting": self._creating + sum(1 for p in self._pods.values() if not _is_ready(p)),
+                "hit_rate": self._stats["hits"] / self._stats["claims"] if self._stats["claims"] else None,
+                "last_error": f"{type(self._error).__name__}: {self._error}" if self._error is not None else None,
+                "claim_latency": {
+                    "p50": _percentile(latencies, 0.5),
+                    "p95": _percentile(latencies, 0.95),
+                    "max": max(latencies, default=None),
+                },
+            }
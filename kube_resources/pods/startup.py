@@ -0,0 +1,98 @@
+from typing import List
+
+from kubernetes.client.models import V1Pod
+
+from kube_resources import core_api as api
+from kube_resources.events import get_events
+from kube_resources.utils import _percentile
+
+# Each stage runs from the first timestamp to the second. image_pull overlaps container_start, the kubelet pulls the
+# images of regular containers after the pod is initialized
+STAGES = {
+    "scheduling": ("created", "scheduled"),
+    "initialization": ("scheduled", "initialized"),
+    "image_pull": ("pulling", "pulled"),
+    "container_start": ("initialized", "containers_started"),
+    "readiness": ("containers_started", "ready"),
+    "total": ("created", "ready"),
+}
+
+
+def _condition_time(pod: V1Pod, condition_type: str):
+    for condition in pod.status.conditions or []:
+        if condition.type == condition_type and condition.status == "True":
+            return condition.last_transition_time
+    return None
+
+
+def _get_pod_timestamps(pod: V1Pod, events: List[dict]):
+    statuses = pod.status.container_statuses or []
+    started = [c.state.running.started_at for c in statuses if c.state and c.state.running]
+    pulling = [e["first_seen"] for e in events if e["reason"] == "Pulling" and e["first_seen"]]
+    pulled = [e["last_seen"] for e in events if e["reason"] == "Pulled" and e["last_seen"]]
+    return {
+        "created": pod.metadata.creation_timestamp,
+        "scheduled": _condition_time(pod, "PodScheduled"),
+        "initialized": _condition_time(pod, "Initialized"),
+        "pulling": min(pulling) if pulling else None,
+        "pulled": max(pulled) if pulled else None,
+        # Only once every container runs, a restarted container moves this forward
+        "containers_started": max(started) if statuses and len(started) == len(statuses) else None,
+        "ready": _condition_time(pod, "Ready"),
+    }
+
+
+def _get_pod_profile(pod: V1Pod, events: List[dict]):
+    timestamps = _get_pod_timestamps(pod, events)
+    stages = {}
+    for stage, (begin, end) in STAGES.items():
+        if timestamps[begin] is not None and timestamps[end] is not None:
+            stages[stage] = max((timestamps[end] - timestamps[begin]).total_seconds(), 0.0)
+        else:
+            stages[stage] = None
+    return {
+        "namespace": pod.metadata.namespace,
+        "name": pod.metadata.name,
+        "node": pod.spec.node_name,
+        "timestamps": {k: v.isoformat() if v else None for k, v in timestamps.items()},
+        "stages": stages,
+    }
+
+
+def _summarize(profiles: List[dict]):
+    summary = {}
+    for stage in STAGES:
+        values = [p["stages"][stage] for p in profiles if p["stages"][stage] is not None]
+        summary[stage] = {
+            "count": len(values),
+            "mean": sum(values) / len(values) if values else None,
+            "p50": _percentile(values, 0.5),
+            "p90": _percentile(values, 0.9),
+            "p99": _percentile(values, 0.99),
+            "max": max(values, default=None),
+        }
+    return summary
+
+
+def profile_pods(namespace="default", names: List[str] = None, label_selector: str = None, events=True):
+    # Condition timestamps have one second resolution, container start times and events are usually finer
+    pods = api.list_namespaced_pod(namespace, label_selector=label_selector).items
+    if names is not None:
+        names = set(names)
+        pods = [p for p in pods if p.metadata.name in names]
+    pod_events = {}
+    if events:
+        for event in get_events(namespace, involved_object_kind="Pod"):
+            if event["object"] is not None:
+                pod_events.setdefault(event["object"]["name"], []).append(event)
+    # Events of an earlier pod with the same name (StatefulSets) carry a different uid
+    profiles = [
+        _get_pod_profile(pod, [
+            e for e in pod_events.get(pod.metadata.name, []) if e["object"]["uid"] in (None, pod.metadata.uid)
+        ])
+        for pod in pods
+    ]
+    return {
+        "pods": sorted(profiles, key=lambda p: p["timestamps"]["created"] or ""),
+        "stages": _summarize(profiles),
+    }
@@ -0,0 +1,285 @@
+import functools
+import hashlib
+import os
+import posixpath
+import shlex
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from kubernetes import client
+from kubernetes.stream import ws_client
+from kubernetes.stream.stream import _websocket_request
+
+from kube_resources import core_api, thread_api
+from kube_resources.utils import _list_names
+
+CHUNK_SIZE = 1 << 20
+
+
+def _exec_request(configuration, _method, url, **kwargs):
+    # Same as kubernetes.stream.stream(binary=True, _preload_content=False) except that the client does not keep a
+    # copy of everything read from stdout, which would hold whole archives in memory
+    return ws_client.WSClient(
+        configuration,
+        ws_client.get_websocket_url(url, kwargs.get("query_params")),
+        kwargs.get("headers"),
+        capture_all=False,
+        binary=True,
+    )
+
+
+_exec_stream = functools.partial(_websocket_request, _exec_request, {"_preload_content": False})
+
+
+def _exec(name: str, namespace: str, command: List[str], container: str = None, stdin=False):
+    # stream() swaps the request method of the api client while connecting, so every thread uses its own client
+    api = thread_api(client.CoreV1Api)
+    return _exec_stream(
+        api.connect_get_namespaced_pod_exec,
+        name,
+        namespace,
+        command=command,
+        container=container,
+        stdin=stdin,
+        stdout=True,
+        stderr=True,
+        tty=False,
+    )
+
+
+def _finish(ws, timeout: float, command: str):
+    ws.run_forever(timeout=timeout)
+    if ws.is_open():
+        ws.close()
+        raise TimeoutError(f"{command} did not finish within {timeout}s")
+    stderr = ws.read_stderr(timeout=0) or b""
+    if ws.returncode != 0:
+        raise RuntimeError(f"{command} exited with {ws.returncode}: {stderr.decode(errors='replace').strip()}")
+
+
+class _ExecWriter:
+    # Write side of tarfile's stream mode, each block goes straight to the remote stdin
+    def __init__(self, ws):
+        self.ws = ws
+
+    def write(self, data):
+        self.ws.write_stdin(bytes(data))
+        # Drain incoming frames so stderr of a failing command does not back up the connection
+        self.ws.update(timeout=0)
+        return len(data)
+
+
+class _ExecReader:
+    # Read side of tarfile's stream mode, pulls stdout frames only as the archive is consumed
+    def __init__(self, ws, timeout: float):
+        self.ws = ws
+        self.timeout = timeout
+        self.buffer = bytearray()
+
+    def read(self, size=-1):
+        last = time.monotonic()
+        while size < 0 or len(self.buffer) < size:
+            data = self.ws.read_stdout(timeout=self.timeout)
+            if data:
+                self.buffer += data
+                last = time.monotonic()
+            elif not self.ws.is_open():
+                break
+            elif time.monotonic() - last > self.timeout:
+                raise TimeoutError(f"no data from pod for {self.timeout}s")
+        size = len(self.buffer) if size < 0 else size
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+class _HashingFile:
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.sha256.update(data)
+        return data
+
+
+def _walk(local_path: str):
+    yield local_path
+    if os.path.isdir(local_path) and not os.path.islink(local_path):
+        for root, dirs, files in os.walk(local_path):
+            for entry in sorted(dirs) + sorted(files):
+                yield os.path.join(root, entry)
+
+
+def _write_archive(tar: tarfile.TarFile, local_path: str):
+    checksums, size = {}, 0
+    base = os.path.dirname(os.path.abspath(local_path))
+    for path in _walk(local_path):
+        info = tar.gettarinfo(path, os.path.relpath(os.path.abspath(path), base).replace(os.sep, "/"))
+        if info.isreg():
+            with open(path, "rb") as f:
+                reader = _HashingFile(f)
+                tar.addfile(info, reader)
+            checksums[info.name] = reader.sha256.hexdigest()
+            size += info.size
+        else:
+            tar.addfile(info)
+    return checksums, size
+
+
+def _read_archive(tar: tarfile.TarFile, local_dir: str):
+    checksums, size = {}, 0
+    root = os.path.realpath(local_dir)
+    inside = lambda path: path == root or path.startswith(root + os.sep)
+    for member in tar:
+        target = os.path.realpath(os.path.join(root, member.name))
+        if not inside(target):
+            raise ValueError(f"Refusing to extract {member.name} outside of {local_dir}")
+        if member.isdir():
+            os.makedirs(target, exist_ok=True)
+        elif member.isreg():
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            sha256 = hashlib.sha256()
+            with tar.extractfile(member) as src, open(target, "wb") as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    dst.write(chunk)
+            os.chmod(target, member.mode & 0o777)
+            checksums[member.name] = sha256.hexdigest()
+            size += member.size
+        elif member.issym():
+            if not inside(os.path.realpath(os.path.join(os.path.dirname(target), member.linkname))):
+                raise ValueError(f"Refusing to create link {member.name} pointing outside of {local_dir}")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.lexists(target):
+                os.remove(target)
+            os.symlink(member.linkname, target)
+    return checksums, size
+
+
+def _remote_checksums(name: str, namespace: str, container: str, parent: str, base: str, timeout: float):
+    ws = _exec(
+        name,
+        namespace,
+        ["sh", "-c", f"cd {shlex.quote(parent)} && find {shlex.quote(base)} -type f -exec sha256sum {{}} +"],
+        container,
+    )
+    try:
+        output = _ExecReader(ws, timeout).read()
+        _finish(ws, timeout, "sha256sum")
+    finally:
+        ws.close()
+    checksums = {}
+    for line in output.decode().splitlines():
+        digest, path = line.split(None, 1)
+        checksums[path.lstrip("*")] = digest
+    return checksums
+
+
+def _get_transfer_info(name: str, namespace: str, start: float, status: str, checksums=None, size=0, message=None):
+    return {
+        "kind": "Pod",
+        "namespace": namespace,
+        "name": name,
+        "status": status,
+        "files": len(checksums or {}),
+        "bytes": size,
+        "seconds": time.monotonic() - start,
+        "message": message,
+    }
+
+
+def _verify(name, namespace, container, remote_parent, base, checksums, size, start, timeout):
+    remote = _remote_checksums(name, namespace, container, remote_parent, base, timeout)
+    mismatched = sorted(path for path, digest in checksums.items() if remote.get(path) != digest)
+    if mismatched:
+        return _get_transfer_info(
+            name, namespace, start, "checksum_mismatch", checksums, size, f"checksum mismatch: {', '.join(mismatched)}"
+        )
+    return _get_transfer_info(name, namespace, start, "copied", checksums, size)
+
+
+def copy_to_pod(
+        name: str,
+        local_path: str,
+        remote_dir: str,
+        namespace="default",
+        container: str = None,
+        verify=True,
+        timeout: float = 300,
+):
+    # local_path, a file or a directory, ends up at remote_dir/<basename of local_path>
+    start = time.monotonic()
+    ws = _exec(
+        name,
+        namespace,
+        ["sh", "-c", f"mkdir -p {shlex.quote(remote_dir)} && tar xmf - -C {shlex.quote(remote_dir)}"],
+        container,
+        stdin=True,
+    )
+    try:
+        with tarfile.open(fileobj=_ExecWriter(ws), mode="w|", bufsize=CHUNK_SIZE) as tar:
+            checksums, size = _write_archive(tar, local_path)
+        _finish(ws, timeout, "tar")
+    finally:
+        ws.close()
+    if not verify:
+        return _get_transfer_info(name, namespace, start, "copied", checksums, size)
+    base = os.path.basename(os.path.abspath(local_path))
+    return _verify(name, namespace, container, remote_dir, base, checksums, size, start, timeout)
+
+
+def copy_from_pod(
+        name: str,
+        remote_path: str,
+        local_dir: str,
+        namespace="default",
+        container: str = None,
+        verify=True,
+        timeout: float = 300,
+):
+    # remote_path, a file or a directory, ends up at local_dir/<basename of remote_path>
+    start = time.monotonic()
+    remote_path = remote_path.rstrip("/")
+    parent, base = posixpath.dirname(remote_path) or "/", posixpath.basename(remote_path)
+    ws = _exec(name, namespace, ["tar", "cf", "-", "-C", parent, base], container)
+    os.makedirs(local_dir, exist_ok=True)
+    try:
+        with tarfile.open(fileobj=_ExecReader(ws, timeout), mode="r|", bufsize=CHUNK_SIZE) as tar:
+            checksums, size = _read_archive(tar, local_dir)
+        _finish(ws, timeout, "tar")
+    finally:
+        ws.close()
+    if not verify:
+        return _get_transfer_info(name, namespace, start, "copied", checksums, size)
+    return _verify(name, namespace, container, parent, base, checksums, size, start, timeout)
+
+
+def copy_to_pods(
+        local_path: str,
+        remote_dir: str,
+        names: List[str] = None,
+        label_selector: str = None,
+        namespace="default",
+        container: str = None,
+        verify=True,
+        timeout: float = 300,
+        max_workers: int = 8,
+):
+    assert names or label_selector, "names or label_selector is required"
+    if names is None:
+        names, _ = _list_names(core_api.list_namespaced_pod, namespace, label_selector=label_selector)
+    names = sorted(names)
+
+    def copy(name):
+        start = time.monotonic()
+        try:
+            return copy_to_pod(name, local_path, remote_dir, namespace, container, verify, timeout)
+        except Exception as e:
+            return _get_transfer_info(name, namespace, start, "failed", message=str(e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(copy, names))
@@ -4,5 +4,7 @@ from .commands import (
     get_service,
     update_service,
     delete_service,
-    get_endpoints
+    delete_services,
+    get_endpoints,
+    ServiceView
 )
@@ -1,22 +1,61 @@
 from kubernetes.client.models import V1Service, V1Endpoints
 
-from kube_resources.utils import construct_service
+from kube_resources.utils import construct_service, _delete_collection
 from kube_resources import core_api as api
+from kube_resources.cache import cached, invalidate
+from kube_resources.views import ResourceView
+
+
+class ServiceView(ResourceView):
+    __slots__ = ()
+    _fields = (
+        "namespace", "name", "port", "target_port", "node_port", "port_name", "type", "cluster_ip", "protocol",
+        "selector",
+    )
+
+    @property
+    def namespace(self):
+        return self._obj.metadata.namespace
+
+    @property
+    def name(self):
+        return self._obj.metadata.name
+
+    @property
+    def port(self):
+        return self._obj.spec.ports[0].port
+
+    @property
+    def target_port(self):
+        return self._obj.spec.ports[0].target_port
+
+    @property
+    def node_port(self):
+        return self._obj.spec.ports[0].node_port
+
+    @property
+    def port_name(self):
+        return self._obj.spec.ports[0].name
+
+    @property
+    def type(self):
+        return self._obj.spec.type
+
+    @property
+    def cluster_ip(self):
+        return self._obj.spec.cluster_ip
+
+    @property
+    def protocol(self):
+        return self._obj.spec.ports[0].protocol
+
+    @property
+    def selector(self):
+        return self._obj.spec.selector
 
 
 def _get_service_info(service: V1Service):
-    return {
-        "namespace": service.metadata.namespace,
-        "name": service.metadata.name,
-        "port": service.spec.ports[0].port,
-        "target_port": service.spec.ports[0].target_port,
-        "node_port": service.spec.ports[0].node_port,
-        "port_name": service.spec.ports[0].name,
-        "type": service.spec.type,
-        "cluster_ip": service.spec.cluster_ip,
-        "protocol": service.spec.ports[0].protocol,
-        "selector": service.spec.selector
-    }
+    return ServiceView(service).to_dict()
 
 
 def create_service(
@@ -45,25 +84,30 @@ def create_service(
         cluster_ip=cluster_ip,
     )
     response = api.create_namespaced_service(namespace=namespace, body=service)
+    invalidate("Service", namespace, response.metadata.name)
     return get_service(response.metadata.name, namespace)
 
 
-def get_services(namespace="default"):
+def get_services(namespace="default", lazy=False):
     if namespace == "all":
         response = api.list_service_for_all_namespaces(watch=False)
     else:
         response = api.list_namespaced_service(namespace, watch=False)
     return list(
         map(
-            lambda s: _get_service_info(s),
+            ServiceView if lazy else _get_service_info,
             response.items
         )
     )
 
 
 def get_service(name: str, namespace="default"):
-    response = api.read_namespaced_service(name=name, namespace=namespace)
-    return _get_service_info(response)
+    return cached(
+        "Service",
+        namespace,
+        name,
+        lambda: _get_service_info(api.read_namespaced_service(name=name, namespace=namespace))
+    )
 
 
 def get_endpoints(name: str, port: int, namespace="default"):
@@ -101,9 +145,34 @@ def update_service(
         response = api.patch_namespaced_service(name=name, namespace=namespace, body=service)
     else:
         response = api.replace_namespaced_service(name=name, namespace=namespace, body=service)
+    invalidate("Service", namespace, name)
     return get_service(response.metadata.name, namespace)
 
 
 def delete_service(name, namespace="default"):
     response = api.delete_namespaced_service(name=name, namespace=namespace)
+    invalidate("Service", namespace, name)
     return {"status": response.status}
+
+
+def delete_services(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    result = _delete_collection(
+        api.delete_collection_namespaced_service,
+        api.list_namespaced_service,
+        namespace,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+    # Only after the delete, a concurrent read would otherwise cache the objects again
+    invalidate("Service", namespace)
+    return result
@@ -0,0 +1,154 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from kubernetes.client.rest import ApiException
+from kserve.constants import constants
+
+from kube_resources import core_api, apps_api, autoscaling_api, custom_api
+
+INFERENCE_SERVICE_LABEL = "serving.kserve.io/inferenceservice"
+
+Ref = Tuple[str, str]
+
+
+def _list_custom(group: str, version: str, plural: str, namespace: str):
+    try:
+        response = custom_api.list_namespaced_custom_object(group, version, namespace, plural)
+    except ApiException as e:
+        if e.status != 404:  # CRD not installed
+            raise
+        return [], None
+    return response["items"], response["metadata"].get("resourceVersion")
+
+
+def _list(list_func, namespace: str):
+    response = list_func(namespace, watch=False)
+    return response.items, response.metadata.resource_version
+
+
+class Topology:
+    def __init__(self, namespace: str, listed: Dict[str, tuple]):
+        self.namespace = namespace
+        self.resource_versions = {kind: resource_version for kind, (_, resource_version) in listed.items()}
+        self.pods = {p.metadata.name: p for p in listed["Pod"][0]}
+        self.services = {s.metadata.name: s for s in listed["Service"][0]}
+        self.endpoints = {e.metadata.name: e for e in listed["Endpoints"][0]}
+        self.deployments = {d.metadata.name: d for d in listed["Deployment"][0]}
+        self.replica_sets = {r.metadata.name: r for r in listed["ReplicaSet"][0]}
+        self.hpas = {h.metadata.name: h for h in listed["HorizontalPodAutoscaler"][0]}
+        self.vpas = {v["metadata"]["name"]: v for v in listed["VerticalPodAutoscaler"][0]}
+        self.inference_services = {i["metadata"]["name"]: i for i in listed["InferenceService"][0]}
+
+        self._labels = {}  # (key, value) -> pod names
+        self._children = {}  # (kind, name) -> [(kind, name)]
+        self._owners = {}  # (kind, name) -> (kind, name) of the controller
+        self._autoscalers = {}  # target (kind, name) -> [(kind, name)]
+        for name, pod in self.pods.items():
+            for label in (pod.metadata.labels or {}).items():
+                self._labels.setdefault(label, set()).add(name)
+        for kind, objects in (("Pod", self.pods), ("ReplicaSet", self.replica_sets), ("Deployment", self.deployments)):
+            for name, obj in objects.items():
+                for reference in obj.metadata.owner_references or []:
+                    self._children.setdefault((reference.kind, reference.name), []).append((kind, name))
+                    if reference.controller:
+                        self._owners[(kind, name)] = (reference.kind, reference.name)
+        for name, hpa in self.hpas.items():
+            target = (hpa.spec.scale_target_ref.kind, hpa.spec.scale_target_ref.name)
+            self._autoscalers.setdefault(target, []).append(("HorizontalPodAutoscaler", name))
+        for name, vpa in self.vpas.items():
+            target_ref = vpa["spec"].get("targetRef") or {}
+            target = (target_ref.get("kind"), target_ref.get("name"))
+            self._autoscalers.setdefault(target, []).append(("VerticalPodAutoscaler", name))
+
+    def pods_for_selector(self, selector: dict) -> List[str]:
+        if not selector:
+            return []
+        sets = sorted((self._labels.get(label, set()) for label in selector.items()), key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+    def pods_for_service(self, name: str) -> List[str]:
+        return self.pods_for_selector(self.services[name].spec.selector)
+
+    def endpoint_pods(self, name: str) -> List[str]:
+        endpoints = self.endpoints.get(name)
+        pods = set()
+        for subset in (endpoints.subsets or []) if endpoints else []:
+            for address in subset.addresses or []:
+                if address.target_ref and address.target_ref.kind == "Pod":
+                    pods.add(address.target_ref.name)
+        return sorted(pods)
+
+    def services_for_pod(self, name: str) -> List[str]:
+        labels = self.pods[name].metadata.labels or {}
+        return sorted(
+            service_name for service_name, service in self.services.items()
+            if service.spec.selector and all(labels.get(k) == v for k, v in service.spec.selector.items())
+        )
+
+    def autoscalers_for(self, kind: str, name: str) -> List[Ref]:
+        return list(self._autoscalers.get((kind, name), []))
+
+    def children_of(self, kind: str, name: str) -> List[Ref]:
+        return list(self._children.get((kind, name), []))
+
+    def owner_of(self, kind: str, name: str) -> Ref:
+        return self._owners.get((kind, name))
+
+    def pods_of(self, kind: str, name: str) -> List[str]:
+        if kind == "InferenceService":
+            # Serverless InferenceServices own their pods through Knative, the label is the common link
+            return sorted(self._labels.get((INFERENCE_SERVICE_LABEL, name), set()))
+        pods, pending = set(), [(kind, name)]
+        while pending:
+            for child in self._children.get(pending.pop(), []):
+                if child[0] == "Pod":
+                    pods.add(child[1])
+                else:
+                    pending.append(child)
+        return sorted(pods)
+
+    def to_dict(self) -> dict:
+        return {
+            "namespace": self.namespace,
+            "resource_versions": dict(self.resource_versions),
+            "services": {
+                name: {"pods": self.pods_for_service(name), "endpoints": self.endpoint_pods(name)}
+                for name in self.services
+            },
+            "deployments": {
+                name: {
+                    "replica_sets": [n for k, n in self.children_of("Deployment", name) if k == "ReplicaSet"],
+                    "pods": self.pods_of("Deployment", name),
+                    "autoscalers": self.autoscalers_for("Deployment", name),
+                }
+                for name in self.deployments
+            },
+            "inference_services": {
+                name: {
+                    "deployments": [n for k, n in self.children_of("InferenceService", name) if k == "Deployment"],
+                    "pods": self.pods_of("InferenceService", name),
+                    "autoscalers": self.autoscalers_for("InferenceService", name),
+                }
+                for name in self.inference_services
+            },
+        }
+
+
+def get_topology(namespace="default", max_workers=8) -> Topology:
+    calls = {
+        "Pod": lambda: _list(core_api.list_namespaced_pod, namespace),
+        "Service": lambda: _list(core_api.list_namespaced_service, namespace),
+        "Endpoints": lambda: _list(core_api.list_namespaced_endpoints, namespace),
+        "Deployment": lambda: _list(apps_api.list_namespaced_deployment, namespace),
+        "ReplicaSet": lambda: _list(apps_api.list_namespaced_replica_set, namespace),
+        "HorizontalPodAutoscaler": lambda: _list(autoscaling_api.list_namespaced_horizontal_pod_autoscaler, namespace),
+        "VerticalPodAutoscaler": lambda: _list_custom(
+            "autoscaling.k8s.io", "v1", "verticalpodautoscalers", namespace
+        ),
+        "InferenceService": lambda: _list_custom(
+            constants.KSERVE_GROUP, constants.KSERVE_V1BETA1_VERSION, constants.KSERVE_PLURAL_INFERENCESERVICE, namespace
+        ),
+    }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {kind: executor.submit(call) for kind, call in calls.items()}
+    return Topology(namespace, {kind: future.result() for kind, future in futures.items()})
@@ -1,17 +1,35 @@
+import math
+import time
 from typing import List, TypedDict, Optional
 
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
 from kubernetes.client import (
     V1Pod, V1EnvVar, V1EnvVarSource, V1ConfigMapKeySelector, V1ResourceRequirements, V1ObjectMeta, V1PodSpec,
     V1Container, V1ContainerPort, V1Deployment, V1DeploymentSpec, V1LabelSelector, V1PodTemplateSpec, V1Service,
     V1ServiceSpec, V1ServicePort, V1HorizontalPodAutoscaler, V1HorizontalPodAutoscalerSpec,
     V1CrossVersionObjectReference, V1ConfigMap, V1Volume, V1VolumeMount, V1ConfigMapVolumeSource,
-    V1NFSVolumeSource, V1EmptyDirVolumeSource, V1Probe, V1ExecAction, V1HTTPGetAction, V1HostPathVolumeSource
+    V1NFSVolumeSource, V1EmptyDirVolumeSource, V1Probe, V1ExecAction, V1HTTPGetAction, V1HostPathVolumeSource,
+    V2HorizontalPodAutoscaler, V2HorizontalPodAutoscalerSpec, V2CrossVersionObjectReference, V2MetricSpec,
+    V2MetricTarget, V2MetricIdentifier, V2ResourceMetricSource, V2ContainerResourceMetricSource, V2PodsMetricSource,
+    V2ObjectMetricSource, V2ExternalMetricSource, V2HorizontalPodAutoscalerBehavior, V2HPAScalingRules,
+    V2HPAScalingPolicy, V1PersistentVolumeClaim, V1PersistentVolumeClaimSpec, V1VolumeResourceRequirements,
+    V1TypedLocalObjectReference, V1PersistentVolumeClaimVolumeSource, V1SecretVolumeSource, V1CSIVolumeSource,
+    V1LocalObjectReference, V1EphemeralVolumeSource, V1PersistentVolumeClaimTemplate, V1Job, V1JobSpec,
+    V1DaemonSet, V1DaemonSetSpec, V1Toleration, V1Affinity, V1NodeAffinity, V1NodeSelector, V1NodeSelectorTerm,
+    V1NodeSelectorRequirement
 )
 from kserve import (
     V1beta1InferenceService, V1beta1InferenceServiceSpec, V1beta1PredictorSpec, V1beta1TransformerSpec, V1beta1Batcher
 )
 from kserve.constants import constants
 
+from kube_resources.validation import (
+    validate_pod_inputs, validate_deployment_inputs, validate_daemon_set_inputs, validate_job_inputs,
+    validate_service_inputs, validate_hpa_inputs, validate_pvc_inputs, validate_configmap_inputs,
+    validate_inference_service_inputs,
+)
+
 
 class ContainerInfo(TypedDict):
     name: str
@@ -40,9 +58,8 @@ def _construct_container(container_info: ContainerInfo) -> V1Container:
         container_kwargs.update({"command": [container_info["command"]]})
     if container_info.get("args"):
         container_kwargs.update({"args": container_info["args"]})
-    if container_info.get("env_vars") is None:
-        container_info["env_vars"] = {}
-    container_info["env_vars"] = list(map(
+    # Build the env list separately, the caller's ContainerInfo may be reused for other pods
+    env_vars = list(map(
         lambda t: V1EnvVar(
             t[0],
             (
@@ -50,7 +67,7 @@ def _construct_container(container_info: ContainerInfo) -> V1Container:
                     config_map_key_ref=V1ConfigMapKeySelector(name=x["name"], key=x["key"])
                 )
             )(t[1])
-        ), container_info["env_vars"].items()
+        ), (container_info.get("env_vars") or {}).items()
     ))
     limits = {}
     requests = {}
@@ -66,8 +83,8 @@ def _construct_container(container_info: ContainerInfo) -> V1Container:
         requests.update(cpu=container_info["request_cpu"])
     if requests or limits:
         container_kwargs.update(resources=V1ResourceRequirements(limits=limits or None, requests=requests or None))
-    if container_info["env_vars"]:
-        container_kwargs.update(env=container_info["env_vars"])
+    if env_vars:
+        container_kwargs.update(env=env_vars)
 
     mounts = []
     if container_info.get("volume_mounts"):
@@ -88,14 +105,12 @@ def _construct_container(container_info: ContainerInfo) -> V1Container:
         elif rp.get("http_get"):
             rp_kwargs["http_get"] = V1HTTPGetAction(path=rp["http_get"].get("path"), port=rp["http_get"]["port"])
         else:
-            pass  # Todo: Add other types of probes
+            raise ValueError(f"Unsupported readiness probe for container {container_info['name']}, use exec or http_get")
         container_kwargs.update(readiness_probe=V1Probe(**rp_kwargs))
     return V1Container(**container_kwargs)
 
 
 def _construct_volume(config: dict):
-    # Fixme: currently only allowing ConfigMap, NFS, HostPath, and emptyDir Volume types
-
     if config.get("config_map"):
         v = V1Volume(
             name=config["name"],
@@ -106,20 +121,94 @@ def _construct_volume(config: dict):
             name=config["name"],
             nfs=V1NFSVolumeSource(**config["nfs"])
         )
-    elif config.get("empty_dir"):
+    elif "empty_dir" in config:
+        # medium "Memory" gives a tmpfs, size_limit caps it (or the disk usage) e.g. "2Gi"
+        empty_dir = config["empty_dir"] or {}
         v = V1Volume(
             name=config["name"],
-            empty_dir=V1EmptyDirVolumeSource()
+            empty_dir=V1EmptyDirVolumeSource(medium=empty_dir.get("medium"), size_limit=empty_dir.get("size_limit"))
         )
     elif config.get("host_path"):
         v = V1Volume(
             name=config["name"],
             host_path=V1HostPathVolumeSource(**config["host_path"])
         )
+    elif config.get("persistent_volume_claim"):
+        v = V1Volume(
+            name=config["name"],
+            persistent_volume_claim=V1PersistentVolumeClaimVolumeSource(**config["persistent_volume_claim"])
+        )
+    elif config.get("secret"):
+        v = V1Volume(
+            name=config["name"],
+            secret=V1SecretVolumeSource(**config["secret"])
+        )
+    elif config.get("csi"):
+        csi = dict(config["csi"])
+        if csi.get("node_publish_secret_ref"):
+            csi["node_publish_secret_ref"] = V1LocalObjectReference(name=csi["node_publish_secret_ref"])
+        v = V1Volume(
+            name=config["name"],
+            csi=V1CSIVolumeSource(**csi)
+        )
+    elif config.get("ephemeral"):
+        ephemeral = config["ephemeral"]
+        v = V1Volume(
+            name=config["name"],
+            ephemeral=V1EphemeralVolumeSource(
+                volume_claim_template=V1PersistentVolumeClaimTemplate(
+                    spec=_construct_pvc_spec(
+                        ephemeral["size"],
+                        ephemeral.get("access_modes") or ["ReadWriteOnce"],
+                        ephemeral.get("storage_class_name"),
+                    )
+                )
+            )
+        )
     else:
-        v = None
+        raise ValueError(f"Unsupported type for volume {config.get('name')}")
     return v
 
+
+def _construct_pvc_spec(
+        size: str,
+        access_modes: List[str],
+        storage_class_name: str = None,
+        volume_mode: str = None,
+        data_source: dict = None,
+) -> V1PersistentVolumeClaimSpec:
+    return V1PersistentVolumeClaimSpec(
+        access_modes=list(access_modes),
+        resources=V1VolumeResourceRequirements(requests={"storage": size}),
+        storage_class_name=storage_class_name,
+        volume_mode=volume_mode,
+        data_source=V1TypedLocalObjectReference(
+            api_group=data_source.get("api_group"), kind=data_source["kind"], name=data_source["name"]
+        ) if data_source else None
+    )
+
+
+def construct_pvc(
+        name: str,
+        namespace: str,
+        size: str,
+        access_modes: List[str] = ("ReadWriteOnce",),
+        storage_class_name: str = None,
+        labels: dict = None,
+        annotations: dict = None,
+        volume_mode: str = None,
+        data_source: dict = None,
+) -> V1PersistentVolumeClaim:
+    validate_pvc_inputs(name, namespace, size, access_modes, labels, annotations)
+    pvc = V1PersistentVolumeClaim(
+        api_version="v1",
+        kind="PersistentVolumeClaim",
+        metadata=V1ObjectMeta(name=name, namespace=namespace, labels=labels, annotations=annotations),
+        spec=_construct_pvc_spec(size, access_modes, storage_class_name, volume_mode, data_source)
+    )
+    return pvc
+
+
 def construct_pod(
         name: str,
         namespace: str,
@@ -132,6 +221,33 @@ def construct_pod(
         scheduler_name: str = None,
         runtime_class_name: str = None,
 ) -> V1Pod:
+    validate_pod_inputs(name, namespace, containers, labels, annotations, volumes, restart_policy)
+    return _construct_pod(
+        name,
+        namespace,
+        containers,
+        labels=labels,
+        annotations=annotations,
+        volumes=volumes,
+        restart_policy=restart_policy,
+        scheduler_name=scheduler_name,
+        runtime_class_name=runtime_class_name,
+    )
+
+
+def _construct_pod(
+        name: str,
+        namespace: str,
+        containers: List[ContainerInfo],
+        *,
+        labels: dict = None,
+        annotations: dict = None,
+        volumes: List[dict] = None,
+        restart_policy: str = None,
+        scheduler_name: str = None,
+        runtime_class_name: str = None,
+) -> V1Pod:
+    # Unvalidated, for the workload constructors that already validated the whole spec
     if labels is None:
         labels = {}
     pod = V1Pod(
@@ -162,7 +278,8 @@ def construct_deployment(
         scheduler_name: str = None,
         runtime_class_name: str = None,
 ) -> V1Deployment:
-    pod = construct_pod(
+    validate_deployment_inputs(name, namespace, containers, replicas, labels, annotations, volumes, restart_policy)
+    pod = _construct_pod(
         name,
         namespace,
         containers,
@@ -177,7 +294,7 @@ def construct_deployment(
     deployment = V1Deployment(
         api_version="apps/v1",
         kind="Deployment",
-        metadata=V1ObjectMeta(name=name, namespace=namespace),
+        metadata=V1ObjectMeta(name=name, namespace=namespace, labels=pod.metadata.labels),
         spec=V1DeploymentSpec(
             replicas=replicas,
             selector=V1LabelSelector(match_labels=pod.metadata.labels),
@@ -190,6 +307,126 @@ def construct_deployment(
     return deployment
 
 
+def construct_daemon_set(
+        name: str,
+        namespace: str,
+        containers: List[ContainerInfo],
+        *,
+        init_containers: List[ContainerInfo] = None,
+        labels: dict = None,
+        annotations: dict = None,
+        volumes: List[dict] = None,
+        node_selector: dict = None,
+        node_names: List[str] = None,
+        tolerations: List[dict] = None,
+        termination_grace_period_seconds: int = None,
+) -> V1DaemonSet:
+    validate_daemon_set_inputs(name, namespace, containers, init_containers, labels, annotations, volumes, tolerations)
+    labels = labels or {"app": name}
+    affinity = None
+    if node_names:
+        # matchFields on metadata.name is the only node affinity DaemonSets honour for pinning exact nodes
+        affinity = V1Affinity(node_affinity=V1NodeAffinity(
+            required_during_scheduling_ignored_during_execution=V1NodeSelector(node_selector_terms=[
+                V1NodeSelectorTerm(match_fields=[
+                    V1NodeSelectorRequirement(key="metadata.name", operator="In", values=sorted(node_names))
+                ])
+            ])
+        ))
+    daemon_set = V1DaemonSet(
+        api_version="apps/v1",
+        kind="DaemonSet",
+        metadata=V1ObjectMeta(name=name, namespace=namespace, labels=labels),
+        spec=V1DaemonSetSpec(
+            selector=V1LabelSelector(match_labels=labels),
+            template=V1PodTemplateSpec(
+                metadata=V1ObjectMeta(labels=labels, annotations=annotations),
+                spec=V1PodSpec(
+                    containers=[_construct_container(ci) for ci in containers],
+                    init_containers=[_construct_container(ci) for ci in init_containers] if init_containers else None,
+                    volumes=[_construct_volume(v) for v in volumes] if volumes else None,
+                    node_selector=node_selector,
+                    affinity=affinity,
+                    tolerations=[V1Toleration(**t) for t in tolerations] if tolerations else None,
+                    termination_grace_period_seconds=termination_grace_period_seconds,
+                )
+            )
+        )
+    )
+    return daemon_set
+
+
+def construct_job(
+        name: str,
+        namespace: str,
+        containers: List[ContainerInfo],
+        *,
+        completions: int = None,
+        parallelism: int = None,
+        completion_mode: str = None,
+        backoff_limit: int = None,
+        backoff_limit_per_index: int = None,
+        max_failed_indexes: int = None,
+        ttl_seconds_after_finished: int = None,
+        active_deadline_seconds: int = None,
+        labels: dict = None,
+        annotations: dict = None,
+        volumes: List[dict] = None,
+        restart_policy: str = "Never",
+        scheduler_name: str = None,
+        runtime_class_name: str = None,
+) -> V1Job:
+    validate_job_inputs(
+        name,
+        namespace,
+        containers,
+        labels,
+        annotations,
+        volumes,
+        restart_policy,
+        completions=completions,
+        parallelism=parallelism,
+        completion_mode=completion_mode,
+        backoff_limit=backoff_limit,
+        backoff_limit_per_index=backoff_limit_per_index,
+        max_failed_indexes=max_failed_indexes,
+        ttl_seconds_after_finished=ttl_seconds_after_finished,
+        active_deadline_seconds=active_deadline_seconds,
+    )
+    pod = _construct_pod(
+        name,
+        namespace,
+        containers,
+        labels=labels,
+        annotations=annotations,
+        volumes=volumes,
+        restart_policy=restart_policy,
+        scheduler_name=scheduler_name,
+        runtime_class_name=runtime_class_name,
+    )
+
+    job = V1Job(
+        api_version="batch/v1",
+        kind="Job",
+        metadata=V1ObjectMeta(name=name, namespace=namespace, labels=labels),
+        spec=V1JobSpec(
+            completions=completions,
+            parallelism=parallelism,
+            completion_mode=completion_mode,
+            backoff_limit=backoff_limit,
+            backoff_limit_per_index=backoff_limit_per_index,
+            max_failed_indexes=max_failed_indexes,
+            ttl_seconds_after_finished=ttl_seconds_after_finished,
+            active_deadline_seconds=active_deadline_seconds,
+            template=V1PodTemplateSpec(
+                metadata=V1ObjectMeta(labels=pod.metadata.labels, annotations=pod.metadata.annotations),
+                spec=pod.spec
+            )
+        )
+    )
+    return job
+
+
 def construct_service(
         name: str,
         namespace: str,
@@ -202,6 +439,7 @@ def construct_service(
         protocol: str = "TCP",
         cluster_ip: str = None,
 ) -> V1Service:
+    validate_service_inputs(name, namespace, target_port, selector, port, node_port, port_name, expose_type, protocol)
     service = V1Service(
         api_version="v1",
         kind="Service",
@@ -229,12 +467,16 @@ def construct_hpa(
         max_replicas: int,
         target_api_version: str,
         target_kind: str,
-        target_name: str
+        target_name: str,
+        labels: dict = None,
 ) -> V1HorizontalPodAutoscaler:
+    validate_hpa_inputs(
+        name, namespace, min_replicas, max_replicas, target_name, target_kind, target_cpu_utilization, labels
+    )
     hpa = V1HorizontalPodAutoscaler(
         api_version="autoscaling/v1",
         kind="HorizontalPodAutoscaler",
-        metadata=V1ObjectMeta(name=name, namespace=namespace),
+        metadata=V1ObjectMeta(name=name, namespace=namespace, labels=labels),
         spec=V1HorizontalPodAutoscalerSpec(
             min_replicas=min_replicas,
             max_replicas=max_replicas,
@@ -249,9 +491,130 @@ def construct_hpa(
     return hpa
 
 
+class MetricInfo(TypedDict):
+    type: str
+    name: str
+    target_type: Optional[str]
+    target_value: object
+    container: Optional[str]
+    selector: Optional[dict]
+    described_object: Optional[dict]
+
+
+class ScalingRulesInfo(TypedDict):
+    stabilization_window_seconds: Optional[int]
+    select_policy: Optional[str]
+    policies: Optional[List[dict]]
+
+
+_DEFAULT_TARGET_TYPES = {
+    "Resource": "Utilization", "ContainerResource": "Utilization", "Pods": "AverageValue", "Object": "Value",
+    "External": "Value",
+}
+
+
+def _construct_metric(metric_info: MetricInfo) -> V2MetricSpec:
+    metric_type = metric_info["type"]
+    if metric_type not in _DEFAULT_TARGET_TYPES:
+        raise ValueError(f"Unsupported metric type {metric_type}")
+    target_type = metric_info.get("target_type") or _DEFAULT_TARGET_TYPES[metric_type]
+    target_value = metric_info["target_value"]
+    if target_type == "Utilization":
+        target = V2MetricTarget(type=target_type, average_utilization=int(target_value))
+    elif target_type == "AverageValue":
+        target = V2MetricTarget(type=target_type, average_value=str(target_value))
+    elif target_type == "Value":
+        target = V2MetricTarget(type=target_type, value=str(target_value))
+    else:
+        raise ValueError(f"Unsupported metric target type {target_type}")
+    identifier = V2MetricIdentifier(
+        name=metric_info["name"],
+        selector=V1LabelSelector(match_labels=metric_info["selector"]) if metric_info.get("selector") else None
+    )
+    if metric_type == "Resource":
+        return V2MetricSpec(type=metric_type, resource=V2ResourceMetricSource(name=metric_info["name"], target=target))
+    if metric_type == "ContainerResource":
+        return V2MetricSpec(
+            type=metric_type,
+            container_resource=V2ContainerResourceMetricSource(
+                container=metric_info["container"], name=metric_info["name"], target=target
+            )
+        )
+    if metric_type == "Pods":
+        return V2MetricSpec(type=metric_type, pods=V2PodsMetricSource(metric=identifier, target=target))
+    if metric_type == "Object":
+        described_object = metric_info["described_object"]
+        return V2MetricSpec(
+            type=metric_type,
+            object=V2ObjectMetricSource(
+                described_object=V2CrossVersionObjectReference(
+                    api_version=described_object.get("api_version"),
+                    kind=described_object["kind"],
+                    name=described_object["name"]
+                ),
+                metric=identifier,
+                target=target
+            )
+        )
+    return V2MetricSpec(type=metric_type, external=V2ExternalMetricSource(metric=identifier, target=target))
+
+
+def _construct_scaling_rules(rules: ScalingRulesInfo) -> Optional[V2HPAScalingRules]:
+    if rules is None:
+        return None
+    return V2HPAScalingRules(
+        stabilization_window_seconds=rules.get("stabilization_window_seconds"),
+        select_policy=rules.get("select_policy"),
+        policies=[
+            V2HPAScalingPolicy(type=p["type"], value=p["value"], period_seconds=p["period_seconds"])
+            for p in rules.get("policies") or []
+        ] or None
+    )
+
+
+def construct_hpa_v2(
+        name: str,
+        namespace: str,
+        metrics: List[MetricInfo],
+        min_replicas: int,
+        max_replicas: int,
+        target_api_version: str,
+        target_kind: str,
+        target_name: str,
+        scale_up: ScalingRulesInfo = None,
+        scale_down: ScalingRulesInfo = None,
+        labels: dict = None,
+) -> V2HorizontalPodAutoscaler:
+    validate_hpa_inputs(name, namespace, min_replicas, max_replicas, target_name, target_kind, labels=labels)
+    behavior = None
+    if scale_up is not None or scale_down is not None:
+        behavior = V2HorizontalPodAutoscalerBehavior(
+            scale_up=_construct_scaling_rules(scale_up), scale_down=_construct_scaling_rules(scale_down)
+        )
+    hpa = V2HorizontalPodAutoscaler(
+        api_version="autoscaling/v2",
+        kind="HorizontalPodAutoscaler",
+        metadata=V1ObjectMeta(name=name, namespace=namespace, labels=labels),
+        spec=V2HorizontalPodAutoscalerSpec(
+            min_replicas=min_replicas,
+            max_replicas=max_replicas,
+            scale_target_ref=V2CrossVersionObjectReference(
+                api_version=target_api_version,
+                kind=target_kind,
+                name=target_name
+            ),
+            metrics=list(map(_construct_metric, metrics)),
+            behavior=behavior
+        )
+    )
+    return hpa
+
+
 def construct_configmap(name: str, namespace: str, data: dict, binary_data=None) -> V1ConfigMap:
+    validate_configmap_inputs(name, namespace, data, binary_data)
     cm = V1ConfigMap(
         api_version="v1",
+        kind="ConfigMap",
         metadata=V1ObjectMeta(namespace=namespace, name=name),
         data=data,
         binary_data=binary_data
@@ -279,6 +642,16 @@ def construct_inference_service(
 ) -> V1beta1InferenceService:
     assert predictor_container is not None or transformer_container is not None, "Specify predictor_container and/or" \
                                                                          " transformer_container"
+    validate_inference_service_inputs(inference_service_name, namespace, labels, {
+        "predictor": (
+            predictor_container, predictor_volumes, predictor_restart_policy, predictor_min_replicas,
+            predictor_max_replicas
+        ),
+        "transformer": (
+            transformer_container, transformer_volumes, transformer_restart_policy, transformer_min_replicas,
+            transformer_max_replicas
+        ),
+    })
 
     if predictor_container:
         predictor_spec = V1beta1PredictorSpec(
@@ -312,3 +685,102 @@ def construct_inference_service(
             transformer=transformer_spec
         )
     )
+
+
+def _percentile(values: List[float], q: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _label_selector_string(selector: V1LabelSelector) -> str:
+    # Both matchLabels and matchExpressions, in the label selector syntax of list calls
+    terms = [f"{k}={v}" for k, v in (selector.match_labels or {}).items()]
+    for e in selector.match_expressions or []:
+        if e.operator == "In":
+            terms.append(f"{e.key} in ({','.join(e.values or [])})")
+        elif e.operator == "NotIn":
+            terms.append(f"{e.key} notin ({','.join(e.values or [])})")
+        elif e.operator == "Exists":
+            terms.append(e.key)
+        elif e.operator == "DoesNotExist":
+            terms.append(f"!{e.key}")
+        else:
+            raise ValueError(f"Unknown label selector operator {e.operator}")
+    return ",".join(terms)
+
+
+def _list_names(list_func, *args, **kwargs):
+    response = list_func(*args, **kwargs)
+    if isinstance(response, dict):
+        return {i["metadata"]["name"] for i in response["items"]}, response["metadata"]["resourceVersion"]
+    return {i.metadata.name for i in response.items}, response.metadata.resource_version
+
+
+def _wait_for_deletion(list_func, *args, names, resource_version, timeout: float = None, **kwargs) -> List[str]:
+    remaining = set(names)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    w = watch.Watch()
+    while remaining:
+        watch_timeout = 60
+        if deadline is not None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            watch_timeout = min(watch_timeout, math.ceil(left))
+        try:
+            for event in w.stream(
+                    list_func, *args, resource_version=resource_version, timeout_seconds=watch_timeout, **kwargs
+            ):
+                obj = event["object"]
+                if isinstance(obj, dict):
+                    name, resource_version = obj["metadata"]["name"], obj["metadata"]["resourceVersion"]
+                else:
+                    name, resource_version = obj.metadata.name, obj.metadata.resource_version
+                if event["type"] == "DELETED":
+                    remaining.discard(name)
+                    if not remaining:
+                        w.stop()
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            # Watch window expired, fall back to a fresh list to resync
+            current, resource_version = _list_names(list_func, *args, **kwargs)
+            remaining &= current
+    return sorted(remaining)
+
+
+def _delete_collection(
+        delete_func,
+        list_func,
+        *args,
+        label_selector: str,
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+) -> dict:
+    assert label_selector, "Specify a label_selector, refusing to delete every object in the namespace"
+    if wait:
+        names, resource_version = _list_names(list_func, *args, label_selector=label_selector)
+    response = delete_func(
+        *args,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+    )
+    result = {"status": response.get("status") if isinstance(response, dict) else response.status}
+    if wait:
+        result.update(
+            deleted=sorted(names),
+            remaining=_wait_for_deletion(
+                list_func,
+                *args,
+                names=names,
+                resource_version=resource_version,
+                timeout=timeout,
+                label_selector=label_selector
+            )
+        )
+    return result
@@ -0,0 +1,483 @@
+import re
+from typing import List
+
+from kubernetes.client import (
+    V1VolumeMount, V1ConfigMapVolumeSource, V1NFSVolumeSource, V1HostPathVolumeSource,
+    V1PersistentVolumeClaimVolumeSource, V1SecretVolumeSource, V1CSIVolumeSource, V1Toleration
+)
+from kubernetes.client.rest import ApiException
+from kubernetes.utils import parse_quantity
+
+from kube_resources import core_api, apps_api, autoscaling_api, autoscaling_v2_api, batch_api, custom_api
+from kube_resources.parallel import thread_map
+
+# The same patterns the API server validates with, compiled once so a whole reconfiguration is checked locally
+# before its first request
+_DNS_LABEL = re.compile(r"^[a-z0-9]([-a-z0-9]{0,61}[a-z0-9])?$")
+_DNS_1035_LABEL = re.compile(r"^[a-z]([-a-z0-9]{0,61}[a-z0-9])?$")
+_DNS_SUBDOMAIN = re.compile(r"^(?=.{1,253}$)[a-z0-9]([-a-z0-9]*[a-z0-9])?(\.[a-z0-9]([-a-z0-9]*[a-z0-9])?)*$")
+_QUALIFIED_NAME = re.compile(r"^([A-Za-z0-9][-A-Za-z0-9_.]{0,61})?[A-Za-z0-9]$")
+_LABEL_VALUE = re.compile(r"^(([A-Za-z0-9][-A-Za-z0-9_.]{0,61})?[A-Za-z0-9])?$")
+_QUANTITY = re.compile(r"^(\d+\.?\d*|\.\d+)([eE][+-]?\d+|[KMGTPE]i|[numkMGTPE])?$")
+_ENV_NAME = re.compile(r"^[-._a-zA-Z][-._a-zA-Z0-9]*$")
+_PORT_NAME = re.compile(r"^(?=.{1,15}$)(?=.*[a-z])[a-z0-9]([a-z0-9]|-(?=[a-z0-9]))*$")
+_CONFIGMAP_KEY = re.compile(r"^[-._a-zA-Z0-9]{1,253}$")
+_IMAGE = re.compile(r"^[A-Za-z0-9][\w.\-/:@]*[\w]$|^[A-Za-z0-9]$")
+
+_PULL_POLICIES = ("Always", "IfNotPresent", "Never")
+_RESTART_POLICIES = ("Always", "OnFailure", "Never")
+_QUANTITY_KEYS = ("request_mem", "request_cpu", "limit_mem", "limit_cpu", "limit_gpu")
+_PROBE_KEYS = {"initial_delay_seconds", "period_seconds", "timeout_seconds", "success_threshold", "exec", "http_get"}
+_PROBE_HANDLERS = ("exec", "http_get")
+_CONTAINER_KEYS = {
+    "name", "image", "image_pull_policy", "container_ports", "command", "args", "env_vars", "volume_mounts",
+    "readiness_probe", *_QUANTITY_KEYS,
+}
+_MOUNT_KEYS = set(V1VolumeMount.openapi_types)
+_TOLERATION_KEYS = set(V1Toleration.openapi_types)
+# Volume type -> keys its source accepts, anything else would be a TypeError in _construct_volume
+_VOLUME_SOURCES = {
+    "config_map": set(V1ConfigMapVolumeSource.openapi_types),
+    "nfs": set(V1NFSVolumeSource.openapi_types),
+    "empty_dir": {"medium", "size_limit"},
+    "host_path": set(V1HostPathVolumeSource.openapi_types),
+    "persistent_volume_claim": set(V1PersistentVolumeClaimVolumeSource.openapi_types),
+    "secret": set(V1SecretVolumeSource.openapi_types),
+    "csi": set(V1CSIVolumeSource.openapi_types),
+    "ephemeral": {"size", "access_modes", "storage_class_name"},
+}
+_ACCESS_MODES = ("ReadWriteOnce", "ReadOnlyMany", "ReadWriteMany", "ReadWriteOncePod")
+
+
+class ValidationError(ValueError):
+    # Carries every problem found, not only the first, so one run reports all mistakes of a spec
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _raise(errors: List[str]):
+    if errors:
+        raise ValidationError(errors)
+
+
+def _check_name(errors: List[str], path: str, name, pattern=_DNS_SUBDOMAIN):
+    if not isinstance(name, str) or not pattern.match(name):
+        errors.append(f"{path}: invalid name {name!r}")
+
+
+def _check_quantity(errors: List[str], path: str, value):
+    if not _QUANTITY.match(str(value)):
+        errors.append(f"{path}: invalid quantity {value!r}")
+        return None
+    return parse_quantity(value)
+
+
+def _check_int(errors: List[str], path: str, value, minimum=0, maximum=None):
+    if value is None:
+        return
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum or (maximum is not None and value > maximum):
+        bounds = f"{minimum}..{maximum}" if maximum is not None else f">= {minimum}"
+        errors.append(f"{path}: expected an integer {bounds}, got {value!r}")
+
+
+def _check_port(errors: List[str], path: str, port, named=False):
+    if named and isinstance(port, str):
+        if not _PORT_NAME.match(port):
+            errors.append(f"{path}: invalid port name {port!r}")
+    elif port is None:
+        errors.append(f"{path}: port is required")
+    else:
+        _check_int(errors, path, port, 1, 65535)
+
+
+def _check_keys(errors: List[str], path: str, obj, allowed, what: str):
+    if not isinstance(obj, dict):
+        errors.append(f"{path}: expected a dict, got {type(obj).__name__}")
+        return False
+    unknown = sorted(set(obj) - set(allowed))
+    if unknown:
+        errors.append(f"{path}: unknown {what} {', '.join(unknown)}")
+    return True
+
+
+def _check_metadata(errors: List[str], path: str, labels: dict = None, annotations: dict = None):
+    for key, value in (labels or {}).items():
+        if not _check_qualified_key(errors, f"{path}.labels", key):
+            continue
+        if not isinstance(value, str) or not _LABEL_VALUE.match(value):
+            errors.append(f"{path}.labels[{key}]: invalid label value {value!r}")
+    for key, value in (annotations or {}).items():
+        if _check_qualified_key(errors, f"{path}.annotations", key) and not isinstance(value, str):
+            errors.append(f"{path}.annotations[{key}]: annotation values must be strings, got {type(value).__name__}")
+
+
+def _check_qualified_key(errors: List[str], path: str, key):
+    prefix, _, name = key.rpartition("/") if isinstance(key, str) else ("", "", None)
+    if name is None or not _QUALIFIED_NAME.match(name) or (prefix and not _DNS_SUBDOMAIN.match(prefix)):
+        errors.append(f"{path}: invalid key {key!r}")
+        return False
+    return True
+
+
+def _check_probe(errors: List[str], path: str, probe):
+    if not _check_keys(errors, path, probe, _PROBE_KEYS, "probe fields"):
+        return
+    handlers = [h for h in _PROBE_HANDLERS if probe.get(h)]
+    if len(handlers) != 1:
+        errors.append(f"{path}: exactly one of {', '.join(_PROBE_HANDLERS)} is required")
+    for key in ("initial_delay_seconds", "period_seconds", "timeout_seconds", "success_threshold"):
+        _check_int(errors, f"{path}.{key}", probe.get(key), 0 if key == "initial_delay_seconds" else 1)
+    if probe.get("exec") and (not isinstance(probe["exec"], list) or not all(isinstance(c, str) for c in probe["exec"])):
+        errors.append(f"{path}.exec: expected a list of strings")
+    http_get = probe.get("http_get")
+    if http_get and _check_keys(errors, f"{path}.http_get", http_get, ("path", "port"), "http_get fields"):
+        _check_port(errors, f"{path}.http_get.port", http_get.get("port"), named=True)
+        if http_get.get("path") is not None and not str(http_get["path"]).startswith("/"):
+            errors.append(f"{path}.http_get.path: must start with '/'")
+
+
+def _check_container(errors: List[str], path: str, container_info, volume_names=None):
+    if not _check_keys(errors, path, container_info, _CONTAINER_KEYS, "container fields"):
+        return
+    _check_name(errors, f"{path}.name", container_info.get("name"), _DNS_LABEL)
+    image = container_info.get("image")
+    if not isinstance(image, str) or not _IMAGE.match(image):
+        errors.append(f"{path}.image: invalid image {image!r}")
+    if container_info.get("image_pull_policy") not in (None, *_PULL_POLICIES):
+        errors.append(f"{path}.image_pull_policy: expected one of {', '.join(_PULL_POLICIES)}")
+    quantities = {}
+    for key in _QUANTITY_KEYS:
+        if container_info.get(key):
+            quantities[key] = _check_quantity(errors, f"{path}.{key}", container_info[key])
+    for resource in ("mem", "cpu"):
+        request, limit = quantities.get(f"request_{resource}"), quantities.get(f"limit_{resource}")
+        if request is not None and limit is not None and request > limit:
+            errors.append(f"{path}.request_{resource}: must be less than or equal to limit_{resource}")
+    for i, port in enumerate(container_info.get("container_ports") or []):
+        _check_port(errors, f"{path}.container_ports[{i}]", port)
+    if container_info.get("command") is not None and not isinstance(container_info["command"], str):
+        errors.append(f"{path}.command: expected a string, the executable; put its arguments in args")
+    args = container_info.get("args")
+    if args is not None and (not isinstance(args, list) or not all(isinstance(a, str) for a in args)):
+        errors.append(f"{path}.args: expected a list of strings")
+    env_vars = container_info.get("env_vars") or {}
+    if not isinstance(env_vars, dict):
+        errors.append(f"{path}.env_vars: expected a dict")
+        env_vars = {}
+    for key, value in env_vars.items():
+        if not isinstance(key, str) or not _ENV_NAME.match(key):
+            errors.append(f"{path}.env_vars: invalid name {key!r}")
+        elif isinstance(value, dict) and _check_keys(errors, f"{path}.env_vars[{key}]", value, ("name", "key"), "fields"):
+            if not value.get("name") or not value.get("key"):
+                errors.append(f"{path}.env_vars[{key}]: ConfigMap references need name and key")
+    for i, mount in enumerate(container_info.get("volume_mounts") or []):
+        mount_path = f"{path}.volume_mounts[{i}]"
+        if not _check_keys(errors, mount_path, mount, _MOUNT_KEYS, "volume mount fields"):
+            continue
+        if not mount.get("name") or not mount.get("mount_path"):
+            errors.append(f"{mount_path}: name and mount_path are required")
+        elif volume_names is not None and mount["name"] not in volume_names:
+            errors.append(f"{mount_path}: no volume named {mount['name']!r}")
+    if container_info.get("readiness_probe"):
+        _check_probe(errors, f"{path}.readiness_probe", container_info["readiness_probe"])
+
+
+def _check_volume(errors: List[str], path: str, config):
+    allowed = {"name", *_VOLUME_SOURCES}
+    if not _check_keys(errors, path, config, allowed, "volume fields"):
+        return
+    _check_name(errors, f"{path}.name", config.get("name"), _DNS_LABEL)
+    # Same precedence as _construct_volume, empty_dir may be given as None
+    sources = [t for t in _VOLUME_SOURCES if config.get(t) or (t == "empty_dir" and t in config)]
+    if len(sources) != 1:
+        errors.append(f"{path}: exactly one of {', '.join(_VOLUME_SOURCES)} is required")
+        return
+    source_type = sources[0]
+    source = config[source_type] or {}
+    source_path = f"{path}.{source_type}"
+    if not _check_keys(errors, source_path, source, _VOLUME_SOURCES[source_type], f"{source_type} fields"):
+        return
+    if source_type == "empty_dir":
+        if source.get("medium") not in (None, "", "Memory") and not str(source["medium"]).startswith("HugePages"):
+            errors.append(f"{source_path}.medium: expected Memory, HugePages or none")
+        if source.get("size_limit") is not None:
+            _check_quantity(errors, f"{source_path}.size_limit", source["size_limit"])
+    elif source_type == "ephemeral":
+        if source.get("size") is None:
+            errors.append(f"{source_path}.size: required")
+        else:
+            _check_quantity(errors, f"{source_path}.size", source["size"])
+        _check_access_modes(errors, f"{source_path}.access_modes", source.get("access_modes"))
+    elif source_type == "persistent_volume_claim":
+        _check_name(errors, f"{source_path}.claim_name", source.get("claim_name"))
+    elif source_type == "csi":
+        if not source.get("driver"):
+            errors.append(f"{source_path}.driver: required")
+        if source.get("node_publish_secret_ref") is not None and not isinstance(source["node_publish_secret_ref"], str):
+            errors.append(f"{source_path}.node_publish_secret_ref: expected the secret name")
+    elif source_type in ("nfs", "host_path") and not source.get("path"):
+        errors.append(f"{source_path}.path: required")
+
+
+def _check_access_modes(errors: List[str], path: str, access_modes):
+    for mode in access_modes or []:
+        if mode not in _ACCESS_MODES:
+            errors.append(f"{path}: unknown access mode {mode!r}")
+
+
+def _check_pod_spec(
+        errors: List[str], path: str, containers, volumes=None, restart_policy=None, restart_policies=_RESTART_POLICIES,
+        init_containers=None
+):
+    if not containers:
+        errors.append(f"{path}.containers: at least one container is required")
+    volume_names = set()
+    for i, volume in enumerate(volumes or []):
+        _check_volume(errors, f"{path}.volumes[{i}]", volume)
+        name = volume.get("name") if isinstance(volume, dict) else None
+        if name in volume_names:
+            errors.append(f"{path}.volumes[{i}]: duplicate volume name {name!r}")
+        volume_names.add(name)
+    # Init containers share the name space of regular containers
+    container_names = set()
+    for field, items in (("init_containers", init_containers), ("containers", containers)):
+        for i, container_info in enumerate(items or []):
+            _check_container(errors, f"{path}.{field}[{i}]", container_info, volume_names)
+            name = container_info.get("name") if isinstance(container_info, dict) else None
+            if name in container_names:
+                errors.append(f"{path}.{field}[{i}]: duplicate container name {name!r}")
+            container_names.add(name)
+    if restart_policy is not None and restart_policy not in restart_policies:
+        errors.append(f"{path}.restart_policy: expected one of {', '.join(restart_policies)}")
+
+
+def validate_containers(containers: List[dict], volumes: List[dict] = None):
+    errors = []
+    _check_pod_spec(errors, "spec", containers, volumes)
+    _raise(errors)
+
+
+def validate_volumes(volumes: List[dict]):
+    errors = []
+    for i, volume in enumerate(volumes):
+        _check_volume(errors, f"volumes[{i}]", volume)
+    _raise(errors)
+
+
+def _validate_pod(
+        kind: str, name: str, namespace: str, containers, labels=None, annotations=None, volumes=None,
+        restart_policy=None, restart_policies=_RESTART_POLICIES, name_pattern=_DNS_SUBDOMAIN
+):
+    errors = []
+    _check_name(errors, f"{kind}.name", name, name_pattern)
+    _check_name(errors, f"{kind}.namespace", namespace, _DNS_LABEL)
+    _check_metadata(errors, f"{kind}.metadata", labels, annotations)
+    _check_pod_spec(errors, f"{kind}.spec", containers, volumes, restart_policy, restart_policies)
+    return errors
+
+
+def validate_pod_inputs(name: str, namespace: str, containers, labels, annotations, volumes, restart_policy):
+    _raise(_validate_pod("pod", name, namespace, containers, labels, annotations, volumes, restart_policy))
+
+
+def validate_deployment_inputs(
+        name: str, namespace: str, containers, replicas, labels, annotations, volumes, restart_policy
+):
+    errors = _validate_pod(
+        "deployment", name, namespace, containers, labels, annotations, volumes, restart_policy, ("Always",)
+    )
+    _check_int(errors, "deployment.replicas", replicas)
+    _raise(errors)
+
+
+def validate_daemon_set_inputs(
+        name: str, namespace: str, containers, init_containers, labels, annotations, volumes, tolerations
+):
+    errors = []
+    _check_name(errors, "daemon_set.name", name)
+    _check_name(errors, "daemon_set.namespace", namespace, _DNS_LABEL)
+    _check_metadata(errors, "daemon_set.metadata", labels, annotations)
+    _check_pod_spec(errors, "daemon_set.spec", containers, volumes, init_containers=init_containers)
+    for i, toleration in enumerate(tolerations or []):
+        path = f"daemon_set.spec.tolerations[{i}]"
+        if _check_keys(errors, path, toleration, _TOLERATION_KEYS, "toleration fields"):
+            if toleration.get("operator") not in (None, "Exists", "Equal"):
+                errors.append(f"{path}.operator: expected Exists or Equal")
+            if toleration.get("effect") not in (None, "", "NoSchedule", "PreferNoSchedule", "NoExecute"):
+                errors.append(f"{path}.effect: expected NoSchedule, PreferNoSchedule or NoExecute")
+    _raise(errors)
+
+
+def validate_job_inputs(
+        name: str, namespace: str, containers, labels, annotations, volumes, restart_policy, *, completions,
+        parallelism, completion_mode, backoff_limit, backoff_limit_per_index, max_failed_indexes,
+        ttl_seconds_after_finished, active_deadline_seconds
+):
+    # Job names end up in the job-name label of every pod, so they are limited to 63 characters
+    errors = _validate_pod(
+        "job", name, namespace, containers, labels, annotations, volumes, restart_policy, ("Never", "OnFailure"),
+        _DNS_LABEL
+    )
+    _check_int(errors, "job.completions", completions)
+    _check_int(errors, "job.parallelism", parallelism)
+    _check_int(errors, "job.backoff_limit", backoff_limit)
+    _check_int(errors, "job.backoff_limit_per_index", backoff_limit_per_index)
+    _check_int(errors, "job.max_failed_indexes", max_failed_indexes)
+    _check_int(errors, "job.ttl_seconds_after_finished", ttl_seconds_after_finished)
+    _check_int(errors, "job.active_deadline_seconds", active_deadline_seconds, 1)
+    if completion_mode not in (None, "NonIndexed", "Indexed"):
+        errors.append("job.completion_mode: expected NonIndexed or Indexed")
+    if completion_mode == "Indexed" and completions is None:
+        errors.append("job.completions: required for Indexed jobs")
+    if backoff_limit_per_index is not None and completion_mode != "Indexed":
+        errors.append("job.backoff_limit_per_index: only supported for Indexed jobs")
+    if max_failed_indexes is not None and backoff_limit_per_index is None:
+        errors.append("job.max_failed_indexes: requires backoff_limit_per_index")
+    if backoff_limit_per_index is not None and restart_policy != "Never":
+        errors.append("job.restart_policy: must be Never with backoff_limit_per_index")
+    _raise(errors)
+
+
+def validate_service_inputs(
+        name: str, namespace: str, target_port, selector, port, node_port, port_name, expose_type, protocol
+):
+    errors = []
+    _check_name(errors, "service.name", name, _DNS_1035_LABEL)
+    _check_name(errors, "service.namespace", namespace, _DNS_LABEL)
+    _check_metadata(errors, "service.spec.selector", selector)
+    _check_port(errors, "service.target_port", target_port, named=True)
+    if port is not None:
+        _check_port(errors, "service.port", port)
+    else:
+        errors.append("service.port: required")
+    if node_port is not None:
+        _check_port(errors, "service.node_port", node_port)
+        if expose_type not in ("NodePort", "LoadBalancer"):
+            errors.append("service.node_port: only allowed for NodePort and LoadBalancer services")
+    if port_name is not None and not _DNS_LABEL.match(str(port_name)):
+        errors.append(f"service.port_name: invalid name {port_name!r}")
+    if expose_type not in (None, "ClusterIP", "NodePort", "LoadBalancer", "ExternalName"):
+        errors.append("service.expose_type: expected ClusterIP, NodePort, LoadBalancer or ExternalName")
+    if protocol not in (None, "TCP", "UDP", "SCTP"):
+        errors.append("service.protocol: expected TCP, UDP or SCTP")
+    _raise(errors)
+
+
+def validate_hpa_inputs(
+        name: str, namespace: str, min_replicas, max_replicas, target_name, target_kind, target_cpu_utilization=None,
+        labels=None
+):
+    errors = []
+    _check_name(errors, "hpa.name", name)
+    _check_name(errors, "hpa.namespace", namespace, _DNS_LABEL)
+    _check_metadata(errors, "hpa.metadata", labels)
+    _check_name(errors, "hpa.target_name", target_name)
+    if not target_kind:
+        errors.append("hpa.target_kind: required")
+    _check_int(errors, "hpa.min_replicas", min_replicas)
+    _check_int(errors, "hpa.max_replicas", max_replicas, 1)
+    if isinstance(min_replicas, int) and isinstance(max_replicas, int) and min_replicas > max_replicas:
+        errors.append("hpa.min_replicas: must be less than or equal to max_replicas")
+    _check_int(errors, "hpa.target_cpu_utilization", target_cpu_utilization, 1)
+    _raise(errors)
+
+
+def validate_pvc_inputs(name: str, namespace: str, size, access_modes, labels, annotations):
+    errors = []
+    _check_name(errors, "pvc.name", name)
+    _check_name(errors, "pvc.namespace", namespace, _DNS_LABEL)
+    _check_metadata(errors, "pvc.metadata", labels, annotations)
+    _check_quantity(errors, "pvc.size", size)
+    if not access_modes:
+        errors.append("pvc.access_modes: at least one access mode is required")
+    _check_access_modes(errors, "pvc.access_modes", access_modes)
+    _raise(errors)
+
+
+def validate_configmap_inputs(name: str, namespace: str, data, binary_data):
+    errors = []
+    _check_name(errors, "configmap.name", name)
+    _check_name(errors, "configmap.namespace", namespace, _DNS_LABEL)
+    for field, values in (("data", data), ("binary_data", binary_data)):
+        for key in values or {}:
+            if not isinstance(key, str) or not _CONFIGMAP_KEY.match(key):
+                errors.append(f"configmap.{field}: invalid key {key!r}")
+        if field == "data" and any(not isinstance(v, str) for v in (values or {}).values()):
+            errors.append("configmap.data: values must be strings, use binary_data for bytes")
+    _raise(errors)
+
+
+def validate_inference_service_inputs(name: str, namespace: str, labels, components: dict):
+    # components maps predictor/transformer to (container, volumes, restart_policy, min_replicas, max_replicas)
+    errors = []
+    _check_name(errors, "inference_service.name", name, _DNS_1035_LABEL)
+    _check_name(errors, "inference_service.namespace", namespace, _DNS_LABEL)
+    _check_metadata(errors, "inference_service.metadata", labels)
+    for component, (container, volumes, restart_policy, min_replicas, max_replicas) in components.items():
+        if container is None:
+            continue
+        path = f"inference_service.{component}"
+        _check_pod_spec(errors, path, [container], volumes, restart_policy)
+        _check_int(errors, f"{path}.min_replicas", min_replicas)
+        _check_int(errors, f"{path}.max_replicas", max_replicas)
+        if isinstance(min_replicas, int) and isinstance(max_replicas, int) and 0 < max_replicas < min_replicas:
+            errors.append(f"{path}.min_replicas: must be less than or equal to max_replicas")
+    _raise(errors)
+
+
+# (apiVersion, kind) -> (api, resource as in create_namespaced_<resource>)
+_NATIVE_APIS = {
+    ("v1", "Pod"): (core_api, "pod"),
+    ("v1", "Service"): (core_api, "service"),
+    ("v1", "ConfigMap"): (core_api, "config_map"),
+    ("v1", "PersistentVolumeClaim"): (core_api, "persistent_volume_claim"),
+    ("apps/v1", "Deployment"): (apps_api, "deployment"),
+    ("apps/v1", "DaemonSet"): (apps_api, "daemon_set"),
+    ("batch/v1", "Job"): (batch_api, "job"),
+    ("autoscaling/v1", "HorizontalPodAutoscaler"): (autoscaling_api, "horizontal_pod_autoscaler"),
+    ("autoscaling/v2", "HorizontalPodAutoscaler"): (autoscaling_v2_api, "horizontal_pod_autoscaler"),
+}
+_CUSTOM_PLURALS = {"InferenceService": "inferenceservices", "VerticalPodAutoscaler": "verticalpodautoscalers"}
+
+
+def _object_meta(obj):
+    if isinstance(obj, dict):
+        metadata = obj.get("metadata") or {}
+        return obj.get("apiVersion"), obj.get("kind"), metadata.get("namespace"), metadata.get("name")
+    return obj.api_version, obj.kind, obj.metadata.namespace, obj.metadata.name
+
+
+def _server_dry_run(obj, namespace: str = None):
+    api_version, kind, obj_namespace, name = _object_meta(obj)
+    namespace = obj_namespace or namespace or "default"
+    result = {"kind": kind, "namespace": namespace, "name": name, "operation": "create", "status": "valid", "message": None}
+    if (api_version, kind) in _NATIVE_APIS:
+        api, resource = _NATIVE_APIS[(api_version, kind)]
+        create = lambda: getattr(api, f"create_namespaced_{resource}")(namespace, obj, dry_run="All")
+        patch = lambda: getattr(api, f"patch_namespaced_{resource}")(name, namespace, obj, dry_run="All")
+    elif kind in _CUSTOM_PLURALS and api_version and "/" in api_version:
+        group, version = api_version.split("/")
+        args = (group, version, namespace, _CUSTOM_PLURALS[kind])
+        create = lambda: custom_api.create_namespaced_custom_object(*args, obj, dry_run="All")
+        patch = lambda: custom_api.patch_namespaced_custom_object(*args, name, obj, dry_run="All")
+    else:
+        return {**result, "status": "error", "message": f"dry run of {api_version} {kind} is not supported"}
+    try:
+        try:
+            create()
+        except ApiException as e:
+            if e.status != 409:
+                raise
+            # Already there, check the change a reconfiguration would make instead
+            result["operation"] = "patch"
+            patch()
+    except ApiException as e:
+        result.update(status="invalid" if e.status in (400, 422) else "error", message=e.body or e.reason)
+    return result
+
+
+def server_dry_run(objects: List, namespace: str = None, max_workers: int = 8) -> List[dict]:
+    # Objects as returned by the construct_* helpers or construct_many. Nothing is persisted: every request carries
+    # dryRun=All, so admission webhooks, quotas and schema checks run without side effects
+    return thread_map(lambda obj: _server_dry_run(obj, namespace), objects, max_workers=max_workers)
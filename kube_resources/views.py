@@ -0,0 +1,34 @@
+class ResourceView:
+    # Wraps one API object and computes each info field on access; to_dict() gives the classic info dict
+    __slots__ = ("_obj",)
+    _fields = ()
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    @property
+    def raw(self):
+        return self._obj
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+    def keys(self):
+        return list(self._fields)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._obj.metadata.namespace}/{self._obj.metadata.name})"
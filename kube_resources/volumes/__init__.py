@@ -0,0 +1,11 @@
+from .commands import (
+    create_pvc,
+    get_pvcs,
+    get_pvc,
+    delete_pvc,
+    delete_pvcs,
+    create_model_cache,
+    model_cache_volume,
+    model_cache_mount,
+    populate_model_cache
+)
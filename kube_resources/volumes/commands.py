@@ -1 +1,214 @@
+import math
+import time
+from typing import List
+
+from kubernetes import watch
+from kubernetes.client.models import V1PersistentVolumeClaim
+from kubernetes.client.rest import ApiException
+
 from kube_resources import core_api as api
+from kube_resources.utils import construct_pvc, construct_pod, ContainerInfo, _delete_collection, _wait_for_deletion
+
+POPULATED_ANNOTATION = "kube-resources/model-cache-populated"
+
+
+def _get_pvc_info(pvc: V1PersistentVolumeClaim):
+    return {
+        "kind": "PersistentVolumeClaim",
+        "namespace": pvc.metadata.namespace,
+        "name": pvc.metadata.name,
+        "labels": pvc.metadata.labels,
+        "annotations": pvc.metadata.annotations,
+        "access_modes": pvc.spec.access_modes,
+        "storage_class_name": pvc.spec.storage_class_name,
+        "volume_name": pvc.spec.volume_name,
+        "requested": (pvc.spec.resources.requests or {}).get("storage") if pvc.spec.resources else None,
+        "status": {
+            "phase": pvc.status.phase,
+            "capacity": (pvc.status.capacity or {}).get("storage"),
+        } if pvc.status else None
+    }
+
+
+def create_pvc(
+        name: str,
+        size: str,
+        access_modes: List[str] = ("ReadWriteOnce",),
+        storage_class_name: str = None,
+        labels: dict = None,
+        annotations: dict = None,
+        volume_mode: str = None,
+        data_source: dict = None,
+        namespace="default"
+):
+    pvc = construct_pvc(
+        name=name,
+        namespace=namespace,
+        size=size,
+        access_modes=access_modes,
+        storage_class_name=storage_class_name,
+        labels=labels,
+        annotations=annotations,
+        volume_mode=volume_mode,
+        data_source=data_source,
+    )
+    response = api.create_namespaced_persistent_volume_claim(namespace=namespace, body=pvc)
+    return _get_pvc_info(response)
+
+
+def get_pvcs(namespace="default", label_selector: str = None):
+    if namespace == "all":
+        response = api.list_persistent_volume_claim_for_all_namespaces(label_selector=label_selector)
+    else:
+        response = api.list_namespaced_persistent_volume_claim(namespace, label_selector=label_selector)
+    return list(map(_get_pvc_info, response.items))
+
+
+def get_pvc(name: str, namespace="default"):
+    response = api.read_namespaced_persistent_volume_claim(name=name, namespace=namespace)
+    return _get_pvc_info(response)
+
+
+def delete_pvc(name: str, namespace="default"):
+    response = api.delete_namespaced_persistent_volume_claim(name=name, namespace=namespace)
+    return {"status": response.status}
+
+
+def delete_pvcs(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    return _delete_collection(
+        api.delete_collection_namespaced_persistent_volume_claim,
+        api.list_namespaced_persistent_volume_claim,
+        namespace,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+
+
+def create_model_cache(
+        name: str,
+        size: str,
+        storage_class_name: str = None,
+        access_modes: List[str] = ("ReadWriteOnce",),
+        labels: dict = None,
+        namespace="default"
+):
+    # ReadWriteOnce only mounts on one node at a time. Replicas spread over nodes need storage that supports adding
+    # ReadOnlyMany (or ReadWriteMany), which callers opt in to through access_modes
+    return create_pvc(
+        name, size, access_modes, storage_class_name=storage_class_name, labels=labels, namespace=namespace
+    )
+
+
+def model_cache_volume(claim_name: str, volume_name="model-cache") -> dict:
+    return {"name": volume_name, "persistent_volume_claim": {"claim_name": claim_name, "read_only": True}}
+
+
+def model_cache_mount(mount_path: str, volume_name="model-cache") -> dict:
+    return {"name": volume_name, "mount_path": mount_path, "read_only": True}
+
+
+def _wait_for_pod_completion(name: str, namespace: str, timeout: float) -> str:
+    deadline = time.monotonic() + timeout
+    w = watch.Watch()
+    resource_version = None
+    while time.monotonic() < deadline:
+        if resource_version is None:
+            pod = api.read_namespaced_pod(name=name, namespace=namespace)
+            if pod.status.phase in ("Succeeded", "Failed"):
+                return pod.status.phase
+            resource_version = pod.metadata.resource_version
+        try:
+            for event in w.stream(
+                    api.list_namespaced_pod,
+                    namespace,
+                    field_selector=f"metadata.name={name}",
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, math.ceil(deadline - time.monotonic())),
+            ):
+                pod = event["object"]
+                resource_version = pod.metadata.resource_version
+                if event["type"] == "DELETED":
+                    return "Deleted"
+                if pod.status.phase in ("Succeeded", "Failed"):
+                    w.stop()
+                    return pod.status.phase
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            resource_version = None
+    return "Timeout"
+
+
+def _delete_leftover_pod(name: str, namespace: str, timeout: float):
+    # The pod of a failed run is kept for its logs and would make the retry fail with 409
+    try:
+        pod = api.read_namespaced_pod(name=name, namespace=namespace)
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        return
+    api.delete_namespaced_pod(name=name, namespace=namespace, grace_period_seconds=0)
+    remaining = _wait_for_deletion(
+        api.list_namespaced_pod,
+        namespace,
+        names=[name],
+        resource_version=pod.metadata.resource_version,
+        timeout=timeout,
+        field_selector=f"metadata.name={name}",
+    )
+    if remaining:
+        raise RuntimeError(f"Pod {namespace}/{name} of a previous run is still terminating")
+
+
+def populate_model_cache(
+        claim_name: str,
+        containers: List[ContainerInfo],
+        mount_path="/models",
+        namespace="default",
+        timeout: float = 3600,
+        force=False,
+):
+    # Runs the given containers once with the cache mounted writable at mount_path, e.g. a model downloader, and
+    # marks the claim as populated so later calls return right away
+    pvc = api.read_namespaced_persistent_volume_claim(name=claim_name, namespace=namespace)
+    if not force and (pvc.metadata.annotations or {}).get(POPULATED_ANNOTATION):
+        return _get_pvc_info(pvc)
+    volume_name = "model-cache"
+    pod = construct_pod(
+        f"{claim_name}-populate",
+        namespace,
+        [
+            {
+                **container,
+                "volume_mounts": (container.get("volume_mounts") or []) + [
+                    {"name": volume_name, "mount_path": mount_path}
+                ]
+            }
+            for container in containers
+        ],
+        volumes=[{"name": volume_name, "persistent_volume_claim": {"claim_name": claim_name}}],
+        restart_policy="Never",
+    )
+    _delete_leftover_pod(pod.metadata.name, namespace, timeout)
+    api.create_namespaced_pod(namespace=namespace, body=pod)
+    phase = _wait_for_pod_completion(pod.metadata.name, namespace, timeout)
+    if phase != "Succeeded":
+        # The failed pod is kept for its logs
+        raise RuntimeError(f"Populating {namespace}/{claim_name} ended with {phase}, see pod {pod.metadata.name}")
+    api.delete_namespaced_pod(name=pod.metadata.name, namespace=namespace)
+    response = api.patch_namespaced_persistent_volume_claim(
+        name=claim_name,
+        namespace=namespace,
+        body={"metadata": {"annotations": {POPULATED_ANNOTATION: time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}}},
+    )
+    return _get_pvc_info(response)
@@ -1 +1,12 @@
-from .commands import create_vpa, get_vpa, delete_vpa
+from .commands import (
+    create_vpa,
+    get_vpa,
+    get_vpas,
+    update_vpa,
+    patch_vpa,
+    set_vpa_update_mode,
+    delete_vpa,
+    delete_vpas,
+    get_vpa_recommendations,
+    apply_vpa_recommendations
+)
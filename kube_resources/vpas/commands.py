@@ -1,40 +1,58 @@
-from kube_resources import vpa_api
+from typing import List
+
+from kubernetes.utils import parse_quantity
+
+from kube_resources import vpa_api, custom_api, apps_api
+from kube_resources.utils import _delete_collection, _label_selector_string
+from kube_resources.pods import resize_pods
+
+VPA_GROUP = "autoscaling.k8s.io"
+VPA_VERSION = "v1"
+VPA_PLURAL = "verticalpodautoscalers"
+
+
+def _get_container_policy_info(policy: dict):
+    return {
+        "container_name": policy.get("containerName"),
+        "mode": policy.get("mode"),
+        "min_allowed": policy.get("minAllowed"),
+        "max_allowed": policy.get("maxAllowed"),
+        "controlled_resources": policy.get("controlledResources"),
+    }
 
 
 def _get_vpa_info(vpa: dict):
+    policies = ((vpa["spec"].get("resourcePolicy") or {}).get("containerPolicies")) or []
     return {
         "kind": "VerticalPodAutoscaler",
         "namespace": vpa["metadata"]["namespace"],
         "name": vpa["metadata"]["name"],
-        "min_allowed": vpa["spec"]["resourcePolicy"]["containerPolicies"][0]["minAllowed"],
-        "max_allowed": vpa["spec"]["resourcePolicy"]["containerPolicies"][0]["maxAllowed"],
+        "labels": vpa["metadata"].get("labels"),
+        "min_allowed": policies[0].get("minAllowed") if policies else None,
+        "max_allowed": policies[0].get("maxAllowed") if policies else None,
+        "container_policies": list(map(_get_container_policy_info, policies)),
         "target": {
             "api_version": vpa["spec"]["targetRef"]["apiVersion"],
             "kind": vpa["spec"]["targetRef"]["kind"],
             "name": vpa["spec"]["targetRef"]["name"],
         },
-        "update_mode": vpa["spec"]["updatePolicy"]["updateMode"],
+        "update_mode": (vpa["spec"].get("updatePolicy") or {}).get("updateMode", "Auto"),
         "status": {
-            "recommendation": vpa["status"]["recommendation"]
+            "recommendation": vpa["status"].get("recommendation")
         } if vpa.get("status") else None
     }
-    
 
-def create_vpa(
-    name: str,
-    target_api_version: str,
-    target_kind: str,
-    target_name: str,
-    target_container_name: str,
-    min_allowed: dict = None,
-    max_allowed: dict = None,
-    controlled_resources: list = None,
-    update_mode="Auto",
-    namespace="default"
+
+def _construct_container_policy(
+        target_container_name: str,
+        min_allowed: dict = None,
+        max_allowed: dict = None,
+        controlled_resources: list = None,
 ):
-    policies = None
-    if max_allowed or min_allowed:
-        policies = {"containerName": f"{target_container_name}"}
+    if not (max_allowed or min_allowed or controlled_resources):
+        return None
+    # "*" is the VPA wildcard, the policy then applies to every container without a policy of its own
+    policies = {"containerName": target_container_name if target_container_name is not None else "*"}
     if max_allowed:
         policies["maxAllowed"] = {}
         if max_allowed.get("cpu"):
@@ -49,13 +67,31 @@ def create_vpa(
             policies["minAllowed"]["memory"] = min_allowed["memory"]
     if controlled_resources:
         policies["controlledResources"] = controlled_resources
-    
+    return policies
+
+
+def create_vpa(
+    name: str,
+    target_api_version: str,
+    target_kind: str,
+    target_name: str,
+    target_container_name: str,
+    min_allowed: dict = None,
+    max_allowed: dict = None,
+    controlled_resources: list = None,
+    update_mode="Auto",
+    namespace="default",
+    labels: dict = None,
+):
+    policies = _construct_container_policy(target_container_name, min_allowed, max_allowed, controlled_resources)
+
     body = {
         "apiVersion": "autoscaling.k8s.io/v1",
         "kind": "VerticalPodAutoscaler",
         "metadata": {
             "name": f"{name}",
-            "namespace": f"{namespace}"
+            "namespace": f"{namespace}",
+            "labels": labels,
         },
         "spec": {
             "targetRef": {
@@ -107,4 +143,157 @@ def delete_vpa(name: str, namespace="default"):
         header_params=None,
         # response_type='V1Status',
         auth_settings=['BearerToken'],
-    )
\ No newline at end of file
+    )
+
+
+def delete_vpas(
+        label_selector: str,
+        namespace="default",
+        propagation_policy: str = None,
+        grace_period_seconds: int = None,
+        wait=False,
+        timeout: float = None,
+):
+    return _delete_collection(
+        custom_api.delete_collection_namespaced_custom_object,
+        custom_api.list_namespaced_custom_object,
+        VPA_GROUP,
+        VPA_VERSION,
+        namespace,
+        VPA_PLURAL,
+        label_selector=label_selector,
+        propagation_policy=propagation_policy,
+        grace_period_seconds=grace_period_seconds,
+        wait=wait,
+        timeout=timeout,
+    )
+
+
+def _list_vpas(namespace="default", label_selector: str = None) -> List[dict]:
+    if namespace == "all":
+        response = custom_api.list_cluster_custom_object(
+            VPA_GROUP, VPA_VERSION, VPA_PLURAL, label_selector=label_selector
+        )
+    else:
+        response = custom_api.list_namespaced_custom_object(
+            VPA_GROUP, VPA_VERSION, namespace, VPA_PLURAL, label_selector=label_selector
+        )
+    return response["items"]
+
+
+def get_vpas(namespace="default", label_selector: str = None):
+    return list(map(_get_vpa_info, _list_vpas(namespace, label_selector)))
+
+
+def patch_vpa(name: str, body: dict, namespace="default"):
+    custom_api.patch_namespaced_custom_object(VPA_GROUP, VPA_VERSION, namespace, VPA_PLURAL, name, body)
+    return get_vpa(name, namespace)
+
+
+def set_vpa_update_mode(name: str, update_mode: str, namespace="default"):
+    return patch_vpa(name, {"spec": {"updatePolicy": {"updateMode": update_mode}}}, namespace)
+
+
+def update_vpa(
+        name: str,
+        target_container_name: str = None,
+        min_allowed: dict = None,
+        max_allowed: dict = None,
+        controlled_resources: list = None,
+        update_mode: str = None,
+        namespace="default"
+):
+    spec = {}
+    if update_mode:
+        spec["updatePolicy"] = {"updateMode": update_mode}
+    policy = _construct_container_policy(target_container_name, min_allowed, max_allowed, controlled_resources)
+    if policy:
+        # Merge patches replace lists, so rebuild containerPolicies with the one container's policy swapped in
+        vpa = custom_api.get_namespaced_custom_object(VPA_GROUP, VPA_VERSION, namespace, VPA_PLURAL, name)
+        policies = [
+            p for p in ((vpa["spec"].get("resourcePolicy") or {}).get("containerPolicies") or [])
+            if p.get("containerName") != policy["containerName"]
+        ]
+        spec["resourcePolicy"] = {"containerPolicies": policies + [policy]}
+    if not spec:
+        return get_vpa(name, namespace)
+    return patch_vpa(name, {"spec": spec}, namespace)
+
+
+_BOUNDS = {"target": "target", "lower": "lowerBound", "upper": "upperBound", "uncapped_target": "uncappedTarget"}
+
+
+def _parse(quantity):
+    return float(parse_quantity(quantity)) if quantity is not None else None
+
+
+def get_vpa_recommendations(namespace="default", label_selector: str = None):
+    columns = {
+        "namespace": [], "vpa": [], "target_kind": [], "target_name": [], "container": [],
+        **{f"{bound}_{resource}": [] for bound in _BOUNDS for resource in ("cpu", "memory")}
+    }
+    for vpa in _list_vpas(namespace, label_selector):
+        recommendation = (vpa.get("status") or {}).get("recommendation") or {}
+        for container in recommendation.get("containerRecommendations") or []:
+            columns["namespace"].append(vpa["metadata"]["namespace"])
+            columns["vpa"].append(vpa["metadata"]["name"])
+            columns["target_kind"].append(vpa["spec"]["targetRef"]["kind"])
+            columns["target_name"].append(vpa["spec"]["targetRef"]["name"])
+            columns["container"].append(container["containerName"])
+            for bound, key in _BOUNDS.items():
+                values = container.get(key) or {}
+                columns[f"{bound}_cpu"].append(_parse(values.get("cpu")))
+                columns[f"{bound}_memory"].append(_parse(values.get("memory")))
+    return columns
+
+
+_SCALABLE_KINDS = {
+    "Deployment": apps_api.read_namespaced_deployment,
+    "StatefulSet": apps_api.read_namespaced_stateful_set,
+    "ReplicaSet": apps_api.read_namespaced_replica_set,
+    "DaemonSet": apps_api.read_namespaced_daemon_set,
+}
+
+
+def apply_vpa_recommendations(
+        namespace="default",
+        label_selector: str = None,
+        bound="target",
+        wait=True,
+        timeout: float = 60,
+        max_workers: int = None,
+):
+    # Requests only, limits stay as they are; the server rejects resizes that would push a request above its limit
+    results = []
+    for vpa in _list_vpas(namespace, label_selector):
+        info = {"namespace": vpa["metadata"]["namespace"], "name": vpa["metadata"]["name"], "pods": []}
+        results.append(info)
+        recommendation = (vpa.get("status") or {}).get("recommendation") or {}
+        resources = {}
+        for container in recommendation.get("containerRecommendations") or []:
+            values = container.get(_BOUNDS[bound]) or {}
+            requests = {}
+            if values.get("cpu"):
+                requests["request_cpu"] = values["cpu"]
+            if values.get("memory"):
+                requests["request_mem"] = values["memory"]
+            if requests:
+                resources[container["containerName"]] = requests
+        target_ref = vpa["spec"]["targetRef"]
+        if not resources or target_ref["kind"] not in _SCALABLE_KINDS:
+            continue
+        target = _SCALABLE_KINDS[target_ref["kind"]](name=target_ref["name"], namespace=info["namespace"])
+        selector = _label_selector_string(target.spec.selector)
+        if not selector:
+            # An empty selector would resize every pod in the namespace
+            info["message"] = f"{target_ref['kind']} {target_ref['name']} has an empty selector"
+            continue
+        info["pods"] = resize_pods(
+            resources,
+            label_selector=selector,
+            namespace=info["namespace"],
+            wait=wait,
+            timeout=timeout,
+            max_workers=max_workers,
+        )
+    return results